@@ -0,0 +1,421 @@
+"""
+연차 시간 환산 코어 (Streamlit 비의존)
+- WSH(주당 연차시간) 변경 이력 → 1년 미만 월 단위 발생 / 1년 이상 연차년도 정액 배분
+- pandas 는 DataFrame 을 만드는 함수에서만 import (CLI 스칼라 경로의 시작 시간 단축)
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# =========================
+# 🔧 유틸 함수 (목적/주석 명확히)
+# =========================
+def eom(d: date) -> date:
+    """주어진 날짜 d가 속한 달의 '말일'을 반환."""
+    return date(d.year, d.month, monthrange(d.year, d.month)[1])
+
+def add_months(d: date, months: int) -> date:
+    """d + relativedelta(months=months) 와 동일 (말일 넘치면 말일로). relativedelta 보다 빠름."""
+    y, m = divmod(d.month - 1 + months, 12)
+    y += d.year
+    return date(y, m + 1, min(d.day, monthrange(y, m + 1)[1]))
+
+def full_years(later: date, earlier: date) -> int:
+    """relativedelta(later, earlier).years 와 동일한 만 연수."""
+    months = (later.year - earlier.year) * 12 + (later.month - earlier.month)
+    if later >= earlier and later < add_months(earlier, months):
+        months -= 1
+    elif later < earlier and later > add_months(earlier, months):
+        months += 1
+    return int(months / 12)
+
+def days_between_inclusive(a: date, b: date) -> int:
+    """양 끝 포함 일수. (a==b면 1일)"""
+    return (b - a).days + 1
+
+def normalize_changes(anchor: date, changes: list[tuple[date, float]], default_wsh: float):
+    """
+    [WSH 타임라인 정규화]
+    - changes: [(효력일, WSH)]  → '효력일 당일부터' 해당 WSH 적용
+    - anchor 이전 구간의 WSH가 비어 있으면 (anchor, default_wsh) 삽입
+    - 효력일 오름차순 정렬
+    """
+    arr = []
+    for d, w in changes:
+        if isinstance(d, datetime):
+            d = d.date()
+        arr.append((d, float(w)))
+    arr.sort(key=lambda x: x[0])
+    if not arr or arr[0][0] > anchor:
+        arr = [(anchor, default_wsh)] + arr
+    return arr
+
+class WshTimeline:
+    """
+    [WSH 타임라인 인덱스]
+    - 정렬된 (효력일, WSH) 목록을 효력일 서수 배열로 보관
+    - 구간 분할: bisect 두 번 + 구간 안 변경점 수만큼 (전체 목록 선형 탐색 없음)
+    - 같은 효력일이 여러 번 나오면 마지막 값 적용 (split_by_changes 와 동일)
+    """
+
+    def __init__(self, changes: list[tuple[date, float]]):
+        self.dates: list[int] = []
+        self.wsh: list[float] = []
+        for d, w in changes:
+            o = d.toordinal()
+            if self.dates and self.dates[-1] == o:
+                self.wsh[-1] = w
+            else:
+                self.dates.append(o)
+                self.wsh.append(w)
+
+    @classmethod
+    def from_changes(cls, anchor: date, changes: list[tuple[date, float]], default_wsh: float):
+        """normalize_changes 후 인덱스 생성."""
+        return cls(normalize_changes(anchor, changes, default_wsh))
+
+    def _index_at(self, ordinal: int) -> int:
+        """ordinal 시점에 적용 중인 변경점 위치. 없으면 ValueError."""
+        i = bisect_right(self.dates, ordinal) - 1
+        if i < 0:
+            raise ValueError("시작 시점의 WSH가 정의되지 않았습니다. 입력을 확인하세요.")
+        return i
+
+    def segments(self, start: date, end: date) -> list[tuple[date, date, float]]:
+        """split_by_changes 와 같은 결과: [(seg_start, seg_end, wsh), ...]."""
+        if start > end:
+            return []
+        t0 = perf_counter() if metrics.ENABLED else 0.0
+        i = self._index_at(start.toordinal())
+        j = bisect_right(self.dates, end.toordinal())
+        segs = []
+        cur_start, cur_wsh = start, self.wsh[i]
+        for k in range(i + 1, j):
+            eff = date.fromordinal(self.dates[k])
+            segs.append((cur_start, eff - timedelta(days=1), cur_wsh))
+            cur_start, cur_wsh = eff, self.wsh[k]
+        segs.append((cur_start, end, cur_wsh))
+        if t0:
+            metrics.observe("accrual_segments", perf_counter() - t0, len(segs))
+        return segs
+
+
+def split_by_changes(start: date, end: date, changes: list[tuple[date, float]]):
+    """
+    [WSH 구간 분할]
+    - 입력 구간 [start, end]을 WSH 변경점(효력일)을 경계로 쪼개,
+      WSH가 일정한 세그먼트들의 리스트를 반환.
+    - 반환: [(seg_start, seg_end, wsh), ...]
+    - 같은 변경표로 여러 구간을 나눌 때는 WshTimeline 을 한 번 만들어 재사용
+    """
+    return WshTimeline(changes).segments(start, end)
+
+def human_readable(segs: list[tuple[date, date, float]]) -> str:
+    """세그먼트 리스트를 사람이 보기 좋은 문자열로."""
+    return " | ".join([f"{s}~{e} (WSH={w})" for s, e, w in segs])
+
+def statutory_days(service_years: int) -> int:
+    """
+    [1년 이상 연차일수 매핑(간단화)]
+    - 1년차: 15일
+    - 이후 2년에 1일씩 가산, 최대 25일
+    (1→15, 2→15, 3→16, 4→16, …, 21→25, 22→25)
+    """
+    if service_years <= 0:
+        return 0
+    inc = (service_years - 1) // 2
+    return min(15 + inc, 25)
+
+def award_row(award_date: date, ref_start: date, ref_end: date,
+              segs: list[tuple[date, date, float]]) -> dict:
+    """1년 미만 부여 1건 (참조 구간 [ref_start, ref_end] 의 세그먼트 → 가중 평균 WSH)."""
+    month_days = days_between_inclusive(ref_start, ref_end)
+
+    # 가중 평균 WSH
+    weighted_wsh = 0.0
+    for s, e, w in segs:
+        frac = days_between_inclusive(s, e) / month_days
+        weighted_wsh += frac * w
+
+    return {
+        "award_date": award_date,
+        "ref_start": ref_start,
+        "ref_end": ref_end,
+        "ref_window": f"{ref_start} ~ {ref_end}",
+        "month_days": month_days,
+        "avg_wsh": weighted_wsh,
+        "accrual_days": 1.0,
+        "accrual_hours": weighted_wsh,
+        "splits": human_readable(segs)
+    }
+
+def segment_row(s: date, e: date, w: float, N: int, total_days_in_year: int) -> dict:
+    """1년 이상 세그먼트 1건 (연차년도 일수 대비 비율로 N일 배분)."""
+    seg_days = days_between_inclusive(s, e)
+    ratio = seg_days / total_days_in_year
+    alloc_days = N * ratio
+    return {
+        "start": s, "end": e,
+        "seg_days": seg_days,
+        "seg_ratio": ratio,
+        "alloc_days": alloc_days,
+        "wsh": w,
+        "alloc_hours": alloc_days * w
+    }
+
+def under_1y_rows(join_dt: date, end_limit: date, timeline: WshTimeline) -> list[dict]:
+    """accrual_under_1y_monthly 의 부여 행 목록 (DataFrame 생성 전)."""
+    # 1년 종료일(입사 1년 전날)까지만 계산
+    one_year_end = add_months(join_dt, 12) - timedelta(days=1)
+    period_end = min(end_limit, one_year_end)
+
+    rows = []
+    ref_start = join_dt
+    for n in range(1, 12):  # 최대 11회
+        award_date = add_months(join_dt, n)
+        if award_date > period_end:
+            break
+        ref_end = award_date - timedelta(days=1)
+        rows.append(award_row(award_date, ref_start, ref_end, timeline.segments(ref_start, ref_end)))
+        ref_start = award_date  # 다음 참조 구간 시작 = 이번 부여일
+    return rows
+
+def over_1y_rows(prev_anniv: date, target_anniv: date, N: int,
+                  timeline: WshTimeline) -> tuple[list[dict], float]:
+    """accrual_over_1y 의 세그먼트 행 목록과 시간 합계 (DataFrame 생성 전)."""
+    segs = timeline.segments(prev_anniv, target_anniv - timedelta(days=1))
+
+    total_days_in_year = days_between_inclusive(prev_anniv, target_anniv - timedelta(days=1))
+    rows, total_hours = [], 0.0
+    for s, e, w in segs:
+        row = segment_row(s, e, w, N, total_days_in_year)
+        rows.append(row)
+        total_hours += row["alloc_hours"]
+    return rows, total_hours
+
+# =========================
+# 🧮 1) 1년 미만 — “입사일 기준 매월 같은 날” 방식
+# =========================
+def accrual_under_1y_monthly(join_dt: date, end_limit: date,
+                             changes: list[tuple[date, float]], default_wsh: float):
+    """
+    [1년 미만 · 월 단위 발생]
+    - 입사일 기준으로 매월 같은 '일(day)'에 1일 발생 (최대 11회)
+      예) 7/15 입사 → 8/15, 9/15, 10/15 … (최대 11번)
+    - 각 부여일 award_date 의 '직전 한 달'을 참조:
+        ref_start = award_date - 1개월
+        ref_end   = award_date - 1일
+      이 기간에 WSH가 바뀌면 일수비율 가중 평균.
+    - 연차시간 = 1일 × 평균 WSH
+    """
+    import pandas as pd
+
+    timeline = WshTimeline.from_changes(join_dt, changes, default_wsh)
+    rows = under_1y_rows(join_dt, end_limit, timeline)
+
+    df = pd.DataFrame(rows)
+    totals = {
+        "days_total": df["accrual_days"].sum() if not df.empty else 0.0,
+        "hours_total": df["accrual_hours"].sum() if not df.empty else 0.0
+    }
+    return df, totals
+
+# =========================
+# 🧮 2) 1년 이상 — 연차년도 정액(표) × WSH 비율 배분
+# =========================
+def accrual_over_1y(join_dt: date, target_anniv: date,
+                    changes: list[tuple[date, float]], default_wsh: float):
+    """
+    [1년 이상]
+    - 연차년도: [작년 기념일, 이번 기념일 - 1일]
+    - 표상 연차일수 N을 1년 구간에서 WSH 변화 비율로 배분하여 시수 환산.
+    """
+    prev_anniv = add_months(target_anniv, -12)
+    service_years = full_years(target_anniv, join_dt)
+    N = statutory_days(service_years)
+
+    timeline = WshTimeline.from_changes(prev_anniv, changes, default_wsh)
+    rows, total_hours = over_1y_rows(prev_anniv, target_anniv, N, timeline)
+
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    totals = {"days_total": float(N), "hours_total": total_hours}
+    return service_years, N, df, totals, prev_anniv, target_anniv
+
+
+# =========================
+# 🏢 3) 전 직원 일괄 계산
+# =========================
+def _to_dates(col: pd.Series) -> list:
+    """날짜 컬럼 → datetime.date 리스트 (비어 있으면 None)."""
+    import pandas as pd
+    return [None if pd.isna(v) else v.date() for v in pd.to_datetime(col)]
+
+def _changes_by_employee(changes: pd.DataFrame) -> dict:
+    """
+    long format 변경표(employee_id, eff_date, wsh) → {employee_id: [(효력일, WSH), ...]}
+    - 직원별 DataFrame 을 만들지 않고, 정렬 후 경계 위치로 잘라 리스트만 생성
+    - 같은 직원·같은 효력일은 입력 순서 유지 (마지막 값 적용)
+    """
+    if changes is None or changes.empty:
+        return {}
+    order = changes["employee_id"].argsort(kind="mergesort")
+    ids = changes["employee_id"].to_numpy()[order]
+    effs = _to_dates(changes["eff_date"].iloc[order])
+    wshs = changes["wsh"].to_numpy(float)[order].tolist()
+
+    grouped, start = {}, 0
+    for i in range(1, len(ids) + 1):
+        if i == len(ids) or ids[i] != ids[start]:
+            grouped[ids[start]] = list(zip(effs[start:i], wshs[start:i]))
+            start = i
+    return grouped
+
+def employee_rows(join_dt: date, default_wsh: float, end_limit: date | None, target_anniv: date | None,
+                  changes: list[tuple[date, float]]):
+    """
+    직원 1명의 일괄 계산 행 (DataFrame 생성 전)
+    - 반환: (1년 미만 부여 행, (service_years, N, prev_anniv, target_anniv) 또는 None, 1년 이상 세그먼트 행)
+    - end_limit / target_anniv 가 None 이면 해당 계산 생략
+    """
+    awards, seg_key, segs = [], None, []
+    if end_limit is not None:
+        timeline = WshTimeline.from_changes(join_dt, changes, default_wsh)
+        awards = under_1y_rows(join_dt, end_limit, timeline)
+    if target_anniv is not None:
+        prev_anniv = add_months(target_anniv, -12)
+        service_years = full_years(target_anniv, join_dt)
+        N = statutory_days(service_years)
+        timeline = WshTimeline.from_changes(prev_anniv, changes, default_wsh)
+        segs, _ = over_1y_rows(prev_anniv, target_anniv, N, timeline)
+        seg_key = (service_years, N, prev_anniv, target_anniv)
+    return awards, seg_key, segs
+
+def accrual_workforce(employees: pd.DataFrame, changes: pd.DataFrame | None = None):
+    """
+    [전 직원 일괄 연차 계산]
+    - employees: employee_id, join_dt, default_wsh
+        + end_limit    (1년 미만 계산 종료일, 비어 있으면 생략)
+        + target_anniv (1년 이상 정산 기념일, 비어 있으면 생략)
+    - changes: long format WSH 변경표 (employee_id, eff_date, wsh)
+    - 반환: (awards, segments)
+        awards   = 1년 미만 부여 행 (accrual_under_1y_monthly 컬럼 + employee_id)
+        segments = 1년 이상 세그먼트 행 (accrual_over_1y 컬럼 + employee_id, service_years, N, prev_anniv, target_anniv)
+      직원 순서대로 이어 붙인 컬럼 단위 결과. DataFrame 은 마지막에 한 번만 생성.
+    """
+    import pandas as pd
+
+    by_emp = _changes_by_employee(changes)
+    n = len(employees)
+    emp_ids = employees["employee_id"].tolist()
+    joins = _to_dates(employees["join_dt"])
+    default_wshs = employees["default_wsh"].astype(float).tolist()
+    end_limits = _to_dates(employees["end_limit"]) if "end_limit" in employees else [None] * n
+    annivs = _to_dates(employees["target_anniv"]) if "target_anniv" in employees else [None] * n
+
+    award_rows, award_emps = [], []
+    seg_rows, seg_keys = [], []
+    for emp, join_dt, dw, end_limit, target in zip(emp_ids, joins, default_wshs, end_limits, annivs):
+        awards, seg_key, segs = employee_rows(join_dt, dw, end_limit, target, by_emp.get(emp, []))
+        award_rows.extend(awards)
+        award_emps.extend([emp] * len(awards))
+        seg_rows.extend(segs)
+        if segs:
+            seg_keys.extend([(emp, *seg_key)] * len(segs))
+
+    awards = pd.DataFrame(award_rows)
+    awards.insert(0, "employee_id", award_emps)
+    segments = pd.DataFrame(seg_rows)
+    keys = pd.DataFrame(seg_keys, columns=["employee_id", "service_years", "N", "prev_anniv", "target_anniv"])
+    return awards, pd.concat([keys, segments], axis=1)
+
+
+# =========================
+# 🔭 4) 미래 기념일 연차 부채 전망
+# =========================
+def next_anniversary_index(join_dt: date, as_of: date) -> int:
+    """as_of 보다 뒤인 첫 기념일의 연차 (add_months(join_dt, 12 × n) > as_of 인 최소 n ≥ 1)."""
+    n = max(1, as_of.year - join_dt.year)
+    while n > 1 and add_months(join_dt, 12 * (n - 1)) > as_of:
+        n -= 1
+    while add_months(join_dt, 12 * n) <= as_of:
+        n += 1
+    return n
+
+def projection_rows(join_dt: date, default_wsh: float, changes: list[tuple[date, float]],
+                    first_n: int, years: int) -> list[tuple]:
+    """
+    직원 1명의 연차년도별 전망 (accrual_over_1y 를 기념일마다 부른 것과 같은 값)
+    - 반환: [(year, service_years, N, prev_anniv, target_anniv, hours), ...]
+    - 전 구간 [첫 연차년도 시작, 마지막 기념일 - 1일] 을 한 번만 분할하고,
+      세그먼트 포인터를 앞으로만 옮기며 연차년도 경계에서 자름 (연도 수 + 세그먼트 수에 선형)
+    """
+    targets = [add_months(join_dt, 12 * (first_n + k)) for k in range(years)]
+    prevs = [add_months(t, -12) for t in targets]
+    timeline = WshTimeline.from_changes(prevs[0], changes, default_wsh)
+    segs = timeline.segments(prevs[0], targets[-1] - timedelta(days=1))
+
+    rows, i = [], 0
+    for k, (prev_anniv, target_anniv) in enumerate(zip(prevs, targets)):
+        year_end = target_anniv - timedelta(days=1)
+        service_years = full_years(target_anniv, join_dt)
+        N = statutory_days(service_years)
+        total_days_in_year = days_between_inclusive(prev_anniv, year_end)
+        while i > 0 and segs[i][0] > prev_anniv:  # 말일 보정으로 연차년도가 하루 겹치는 경우
+            i -= 1
+        while segs[i][1] < prev_anniv:
+            i += 1
+        hours, j = 0.0, i
+        while j < len(segs) and segs[j][0] <= year_end:
+            s, e, w = segs[j]
+            hours += segment_row(max(s, prev_anniv), min(e, year_end), w, N, total_days_in_year)["alloc_hours"]
+            j += 1
+        rows.append((k + 1, service_years, N, prev_anniv, target_anniv, hours))
+        i = max(i, j - 1)  # 마지막 세그먼트는 다음 연차년도로 이어질 수 있음
+    return rows
+
+def liability_projection(employees: pd.DataFrame, changes: pd.DataFrame | None = None,
+                         years: int = 5, as_of: date | None = None):
+    """
+    [연차 부채 전망]
+    - employees: employee_id, join_dt, default_wsh
+    - changes: long format WSH 변경표 (employee_id, eff_date, wsh). 마지막 변경 이후는 그 WSH 가 계속된다고 봄
+    - as_of 이후 첫 기념일부터 years 개 기념일마다 1년 이상 연차(accrual_over_1y)의 시간 합계
+    - 반환: (detail, summary)
+        detail  = 직원 × 연차년도 행: employee_id, year, service_years, N, prev_anniv, target_anniv, liability_hours
+        summary = 기념일 연도별 합계: anniv_year, employees, liability_days, liability_hours
+    """
+    import pandas as pd
+
+    if years < 1:
+        raise ValueError("전망 연수는 1 이상이어야 합니다.")
+    as_of = as_of or date.today()
+    by_emp = _changes_by_employee(changes)
+    emp_ids = employees["employee_id"].tolist()
+    joins = _to_dates(employees["join_dt"])
+    default_wshs = employees["default_wsh"].astype(float).tolist()
+
+    rows, row_emps = [], []
+    for emp, join_dt, dw in zip(emp_ids, joins, default_wshs):
+        first_n = next_anniversary_index(join_dt, as_of)
+        rows.extend(projection_rows(join_dt, dw, by_emp.get(emp, []), first_n, years))
+        row_emps.extend([emp] * years)
+
+    detail = pd.DataFrame(rows, columns=["year", "service_years", "N", "prev_anniv", "target_anniv",
+                                         "liability_hours"])
+    detail.insert(0, "employee_id", row_emps)
+    summary = (detail.assign(anniv_year=[d.year for d in detail["target_anniv"]])
+               .groupby("anniv_year", as_index=False)
+               .agg(employees=("employee_id", "nunique"), liability_days=("N", "sum"),
+                    liability_hours=("liability_hours", "sum")))
+    return detail, summary
@@ -0,0 +1,400 @@
+"""
+일괄 급여 계산 (명부 단위)
+- 명부(CSV / Parquet / DataFrame) 전체를 한 번에 월급 계산
+- payroll.py 스칼라 계산과 같은 연산 순서를 NumPy 배열로 수행 → 결과 동일
+- 귀속 월(pay_month) 컬럼이 있으면 행을 규칙표(rules.py)의 규칙별로 묶어 묶음마다 계산,
+  없으면 이번 달 규칙 하나로
+- 휴무 요일(off_days) 컬럼이 있는 행은 귀속 월 달력 기준 월 시간 (monthcal.py)
+"""
+from datetime import date, time
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from monthcal import calendar_profile, parse_off_days
+from rules import DEFAULT_RULES, RULES, RuleSet, RuleTable, month_array, month_index
+from windows import night_minutes, shift_minutes
+from payroll import monthly_hours, shift_profile, solve_base_wage
+
+# 명부 컬럼 기본값 (없으면 채움). start / end / gwage 는 필수.
+ROSTER_DEFAULTS = {
+    "break_min": 60,
+    "days_wk": 5,
+    "meal": 0,
+    "car": 0,
+    "is_5p": True,
+    "ceil_on": True,
+    "opt_basic": False,
+    "opt_holiday": False,
+    "opt_ot": False,
+    "opt_night": False,
+}
+REQUIRED_COLUMNS = ("start", "end", "gwage")
+REVERSE_REQUIRED_COLUMNS = ("start", "end", "salary")
+FLAG_COLUMNS = ("is_5p", "ceil_on", "opt_basic", "opt_holiday", "opt_ot", "opt_night")
+# 명부 컬럼 형식 (청크 / 파일마다 추론이 달라지지 않도록 고정, 없는 컬럼은 무시)
+# 시각 · 귀속 월 · 휴무 요일 · 옵션은 원문 그대로(문자열 "56" 이 숫자가 되지 않게), 금액은 정수(빈 값 허용)
+ROSTER_DTYPES = {
+    "start": object, "end": object, "pay_month": object, "off_days": object,
+    "break_min": "float64", "days_wk": "float64", "monthly_off": "float64",
+    "gwage": "Int64", "salary": "Int64", "meal": "Int64", "car": "Int64",
+    **{c: object for c in FLAG_COLUMNS},
+}
+RESULT_COLUMNS = ["monthly_base", "monthly_holiday", "monthly_ot", "monthly_night",
+                  "denom_hours", "normal_wage", "base_pay", "holi_pay",
+                  "overtime_pay", "night_pay", "total"]
+
+_TRUE_STRINGS = {"true", "1", "y", "yes", "올림"}
+
+
+# ---------------------------
+# 명부 읽기 / 정리
+# ---------------------------
+def load_roster(src) -> pd.DataFrame:
+    """
+    명부 로드: DataFrame 그대로, 경로면 확장자(.csv / .parquet)로 판별.
+    - CSV 는 ROSTER_DTYPES 로 읽음 (off_days "06" 이 숫자 6 이 되지 않게, stream.py 청크와 같은 형식)
+    """
+    if isinstance(src, pd.DataFrame):
+        return src.copy()
+    path = str(src)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=ROSTER_DTYPES)
+
+def _flag(col: pd.Series) -> np.ndarray:
+    """
+    bool 컬럼 정리. CSV 에서 문자열("True"/"올림" 등)로 들어와도 처리.
+    - 빈 값(NaN)은 컬럼 기본값(ROSTER_DEFAULTS, 예: is_5p → True)
+    """
+    default = bool(ROSTER_DEFAULTS.get(col.name, False))
+    if col.dtype == object:
+        return col.map(lambda v: default if pd.isna(v) else str(v).strip().lower() in _TRUE_STRINGS).to_numpy(bool)
+    return col.fillna(default).to_numpy(bool)
+
+def _hm(col: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """시각 컬럼 → (시, 분) 정수 배열. "HH:MM" 문자열 또는 datetime.time (고유값만 파싱)."""
+    codes, uniq = pd.factorize(col)
+    if (codes < 0).any():
+        raise ValueError(f"출퇴근 시각이 비어 있는 행이 있습니다: {col.index[codes < 0].tolist()[:10]}")
+    hm = np.array([
+        (t.hour, t.minute) if isinstance(t, time) else [int(x) for x in str(t).split(":")[:2]]
+        for t in uniq
+    ], dtype=np.int64).reshape(-1, 2)
+    return hm[codes, 0], hm[codes, 1]
+
+def prepare_roster(roster: pd.DataFrame, required=REQUIRED_COLUMNS,
+                   rules: RuleSet = DEFAULT_RULES) -> pd.DataFrame:
+    """필수 컬럼 확인 + 기본값 채움. monthly_off 가 있으면 주 근로일로 환산(월휴무)."""
+    missing = [c for c in required if c not in roster.columns]
+    if missing:
+        raise ValueError(f"명부에 필수 컬럼이 없습니다: {missing}")
+    df = roster.copy()
+    for c, v in ROSTER_DEFAULTS.items():
+        if c not in df.columns:
+            df[c] = v
+        elif c not in FLAG_COLUMNS:
+            df[c] = df[c].fillna(v)
+    if "monthly_off" in df.columns:
+        off = df["monthly_off"].to_numpy(float)
+        has_off = ~np.isnan(off)
+        days = np.maximum(0.0, np.minimum(7.0, 7.0 - off / rules.weeks_per_month))
+        df["days_wk"] = np.where(has_off, days, df["days_wk"].to_numpy(float))
+    return df
+
+
+# ---------------------------
+# 배열 유틸 (payroll.py 스칼라 함수와 1:1 대응)
+# ---------------------------
+def hours_between_arr(sh, sm, eh, em) -> np.ndarray:
+    """hours_between 배열판."""
+    s = sh + sm / 60
+    e = eh + em / 60
+    e = np.where(e <= s, e + 24, e)
+    return np.maximum(0.0, e - s)
+
+def night_hours_arr(sh, sm, eh, em) -> np.ndarray:
+    """night_hours_simple 배열판."""
+    return night_minutes(*shift_minutes(sh, sm, eh, em)) / 60
+
+def ceil_if_arr(x: np.ndarray, flag: np.ndarray) -> np.ndarray:
+    """ceil_if 배열판 (행별 옵션)."""
+    return np.where(flag, np.ceil(x), x)
+
+def won_ceil_arr(x: np.ndarray) -> np.ndarray:
+    """won_ceil 배열판."""
+    return np.ceil(x - 1e-12).astype(np.int64)
+
+def ceil_ones_arr(n: np.ndarray) -> np.ndarray:
+    """ceil_ones 배열판."""
+    return (np.ceil(n / 10.0) * 10).astype(np.int64)
+
+
+# ---------------------------
+# 계산
+# ---------------------------
+def monthly_hours_arr(sh, sm, eh, em, break_min, days_wk, ceil_on, rules: RuleSet = DEFAULT_RULES):
+    """monthly_hours 배열판 → (base, holiday, ot, night)."""
+    wpm, week_cap = rules.weeks_per_month, rules.max_weekly_hours
+    break_h = break_min / 60
+    daily_span = hours_between_arr(sh, sm, eh, em)
+    daily_work = np.maximum(0.0, daily_span - break_h)
+    weekly_raw  = daily_work * days_wk
+    weekly_base = np.minimum(weekly_raw, week_cap)
+
+    monthly_base    = weekly_base * wpm
+    monthly_holiday = np.minimum((weekly_base / 5.0) * wpm, rules.max_monthly_holiday)
+    monthly_ot      = np.maximum(0.0, weekly_raw - week_cap) * wpm
+    monthly_night   = night_hours_arr(sh, sm, eh, em) * days_wk * wpm
+
+    return (ceil_if_arr(monthly_base,    ceil_on),
+            ceil_if_arr(monthly_holiday, ceil_on),
+            ceil_if_arr(monthly_ot,      ceil_on),
+            ceil_if_arr(monthly_night,   ceil_on))
+
+def calc_pay_arr(gwage, base, holiday, ot, night, meal, car, is_5p,
+                 opt_basic, opt_holiday, opt_ot, opt_night, rules: RuleSet = DEFAULT_RULES) -> dict:
+    """calc_pay 배열판 → 항목별 배열 dict."""
+    denom_hours = base + holiday
+    ot_factor    = np.where(is_5p, rules.ot_factor, 1.0)
+    night_factor = np.where(is_5p, rules.night_factor, 0.0)
+
+    base_pay = won_ceil_arr(gwage * base)
+    holi_pay = won_ceil_arr(gwage * holiday)
+    base_pay = np.where(opt_basic,   ceil_ones_arr(base_pay), base_pay)
+    holi_pay = np.where(opt_holiday, ceil_ones_arr(holi_pay), holi_pay)
+
+    normal_wage = won_ceil_arr((base_pay + holi_pay + meal + car) / denom_hours)
+
+    overtime_pay = won_ceil_arr(normal_wage * ot * ot_factor)
+    night_pay    = won_ceil_arr(normal_wage * night * night_factor)
+    overtime_pay = np.where(opt_ot,    ceil_ones_arr(overtime_pay), overtime_pay)
+    night_pay    = np.where(opt_night, ceil_ones_arr(night_pay),    night_pay)
+
+    total = base_pay + holi_pay + overtime_pay + night_pay + meal + car
+    return {
+        "denom_hours": denom_hours,
+        "normal_wage": normal_wage,
+        "base_pay": base_pay,
+        "holi_pay": holi_pay,
+        "overtime_pay": overtime_pay,
+        "night_pay": night_pay,
+        "total": total,
+    }
+
+def _off_days_codes(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """off_days → (factorize 코드, 고유값). 빈 값 · 공백 문자열(JSON 의 "")은 코드 -1."""
+    codes, uniq = pd.factorize(df["off_days"])
+    blank = np.array([isinstance(v, str) and not v.strip() for v in uniq] + [True])
+    return np.where(blank[codes], -1, codes), uniq
+
+def _calendar_keys(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    달력 기준 월휴무 키 → (귀속 월 번호, 휴무 요일 "56") 배열
+    - off_days 가 비어 있는 행(또는 컬럼 없음)은 (-1, "") → 기존 주 근로일 환산 (있으면 monthly_off 보다 우선)
+    - 귀속 월은 pay_month, 없으면 이번 달
+    """
+    n = len(df)
+    if "off_days" not in df.columns:
+        return np.full(n, -1, dtype=np.int64), np.full(n, "", dtype=object)
+    codes, uniq = _off_days_codes(df)
+    labels = np.array(["".join(map(str, parse_off_days(str(int(v)) if isinstance(v, float) else str(v))))
+                       for v in uniq] + [""], dtype=object)  # CSV 의 56 → 56.0 (빈 값 섞이면 float)
+    off = labels[codes]  # codes -1 (빈 값) → 마지막 ""
+    has = codes >= 0
+    if "pay_month" in df.columns:
+        months = np.full(n, -1, dtype=np.int64)
+        if has.any():
+            months[has] = month_array(df["pay_month"].to_numpy(object)[has])
+    else:
+        months = np.full(n, month_index(date.today()), dtype=np.int64)
+    return np.where(has, months, -1), off
+
+def _roster_hours(df: pd.DataFrame, rules: RuleSet = DEFAULT_RULES):
+    """
+    정리된 명부 → 월 시간 배열 (base, holiday, ot, night). 분모 0 행이 있으면 ValueError.
+    - 근무 패턴(출근, 퇴근, 휴게, 주 근로일, 올림)별로 shift_profile 을 한 번씩만 호출해 펼침
+    - off_days 가 있는 행은 (근무 패턴, 귀속 월, 휴무 요일)별로 monthcal.calendar_profile
+    """
+    sh, sm = _hm(df["start"])
+    eh, em = _hm(df["end"])
+    ym, off = _calendar_keys(df)
+    keys = pd.MultiIndex.from_arrays([sh, sm, eh, em, df["break_min"].to_numpy(float),
+                                      np.where(ym < 0, df["days_wk"].to_numpy(float), 0.0),  # 달력 행은 근로일 무관
+                                      _flag(df["ceil_on"]), ym, off])
+    inverse, uniq = keys.factorize()
+    profiles = np.array([
+        shift_profile(time(int(a), int(b)), time(int(c), int(d)), float(brk), float(days), bool(ceil_on), rules)
+        if m < 0 else
+        calendar_profile(time(int(a), int(b)), time(int(c), int(d)), float(brk), int(m) // 12, int(m) % 12 + 1,
+                         tuple(int(x) for x in o), bool(ceil_on), rules)
+        for a, b, c, d, brk, days, ceil_on, m, o in uniq
+    ], dtype=float).reshape(len(uniq), 4)
+    base, holiday, ot, night = profiles[inverse].T
+
+    bad = (base + holiday) <= 0
+    if bad.any():
+        rows = df.index[bad].tolist()[:10]
+        raise ValueError(f"분모 시간(기본근로+주휴)이 0인 행이 있습니다: {rows}")
+    return base, holiday, ot, night
+
+def _pay_kwargs(df: pd.DataFrame) -> dict:
+    """calc_pay_arr 의 수당/옵션 인자."""
+    return dict(
+        meal=df["meal"].to_numpy(np.int64), car=df["car"].to_numpy(np.int64),
+        is_5p=_flag(df["is_5p"]),
+        opt_basic=_flag(df["opt_basic"]), opt_holiday=_flag(df["opt_holiday"]),
+        opt_ot=_flag(df["opt_ot"]), opt_night=_flag(df["opt_night"]),
+    )
+
+def _attach(df: pd.DataFrame, hours, pay: dict) -> pd.DataFrame:
+    """월 시간 / 급여 항목 컬럼 추가."""
+    df["monthly_base"], df["monthly_holiday"], df["monthly_ot"], df["monthly_night"] = hours
+    for c, v in pay.items():
+        df[c] = v
+    return df
+
+def by_rules(df: pd.DataFrame, func, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [규칙별 묶음 계산]
+    - pay_month 컬럼이 있으면 규칙표(기본 rules.RULES)에서 행별 규칙을 찾아 같은 규칙끼리 func(묶음, RuleSet)
+    - 결과는 입력 행 순서로 (묶음이 하나면 나누지 않고 그대로)
+    """
+    table = rules if rules is not None else RULES
+    groups = table.groups(df["pay_month"] if "pay_month" in df.columns else None, len(df))
+    if len(groups) == 1:
+        return func(df, groups[0][0])
+    parts = [func(df.iloc[pos], rs) for rs, pos in groups]
+    order = np.argsort(np.concatenate([pos for _, pos in groups]), kind="stable")
+    return pd.concat(parts).iloc[order]
+
+def _calc_group(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    df = prepare_roster(df, rules=rules)
+    hours = _roster_hours(df, rules)
+    pay = calc_pay_arr(df["gwage"].to_numpy(np.int64), *hours, **_pay_kwargs(df), rules=rules)
+    return _attach(df, hours, pay)
+
+def calc_roster(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [명부 일괄 월급 계산]
+    - 입력: start, end("HH:MM"), gwage + 선택 컬럼(ROSTER_DEFAULTS, monthly_off, off_days, pay_month)
+    - rules: 규칙표 (없으면 rules.RULES)
+    - 반환: 입력 컬럼 + RESULT_COLUMNS
+    """
+    return by_rules(load_roster(roster), _calc_group, rules)
+
+
+# ---------------------------
+# 기준시급 역산 (배열)
+# ---------------------------
+def search_wage_arr(salary: np.ndarray, hi: np.ndarray, totals, on_grow=None) -> np.ndarray:
+    """
+    [행별 동시 탐색] totals(기준시급 배열) ≤ 월급 인 가장 큰 기준시급 배열
+    - totals: 기준시급 → 총액 배열 (부동소수 calc_pay_arr / 정수 calc_pay_exact_arr 등 금액 함수)
+    - hi(초기 상한)에서 총액이 월급 이하인 행만 2배씩 키운 뒤(지수 탐색) [0, hi) 이분 탐색
+    - on_grow: hi 를 키울 때마다 새 hi 로 호출 (정수 모드의 int64 범위 확인)
+    """
+    # 구간: lo 는 월급 이하(또는 0), hi 는 월급 초과
+    lo = np.zeros(len(salary), dtype=np.int64)
+    over = totals(hi) > salary
+    while not over.all():
+        hi = np.where(over, hi, hi * 2)
+        if on_grow is not None:
+            on_grow(hi)
+        over = totals(hi) > salary
+
+    while True:
+        active = (hi - lo) > 1
+        if not active.any():
+            break
+        mid = (lo + hi) // 2
+        ok = totals(mid) <= salary
+        lo = np.where(active & ok, mid, lo)
+        hi = np.where(active & ~ok, mid, hi)
+    return lo
+
+def solve_base_wage_arr(salary, base, holiday, ot, night, meal, car, is_5p,
+                        opt_basic, opt_holiday, opt_ot, opt_night, rules: RuleSet = DEFAULT_RULES):
+    """
+    [solve_base_wage 배열판]
+    - 행마다 총액 ≤ 월급 인 가장 큰 기준시급을 동시에 이분 탐색 (반복 ≈ log2(월급))
+    - 기준시급 0원으로도 월급을 넘는 행은 0원 (스칼라와 동일)
+    - 반환: (기준시급 배열, calc_pay_arr 결과 dict)
+    """
+    t0 = perf_counter() if metrics.ENABLED else 0.0
+    opts = dict(meal=meal, car=car, is_5p=is_5p, opt_basic=opt_basic,
+                opt_holiday=opt_holiday, opt_ot=opt_ot, opt_night=opt_night, rules=rules)
+
+    def totals(g):
+        return calc_pay_arr(g, base, holiday, ot, night, **opts)["total"]
+
+    lo = search_wage_arr(salary, np.floor(salary / (base + holiday)).astype(np.int64) + 2, totals)
+    if t0:
+        metrics.observe("search_arr", perf_counter() - t0, len(salary))
+    return lo, calc_pay_arr(lo, base, holiday, ot, night, **opts)
+
+def _reverse_group(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    df = prepare_roster(df, REVERSE_REQUIRED_COLUMNS, rules)
+    salary = df["salary"].to_numpy(np.int64)
+    kw = _pay_kwargs(df)
+    bad = (kw["meal"] + kw["car"]) > salary
+    if bad.any():
+        rows = df.index[bad].tolist()[:10]
+        raise ValueError(f"고정수당(식대+차량)이 월급여보다 큰 행이 있습니다: {rows}")
+
+    hours = _roster_hours(df, rules)
+    gwage, pay = solve_base_wage_arr(salary, *hours, **kw, rules=rules)
+    df["gwage"] = gwage
+    return _attach(df, hours, pay)
+
+def reverse_roster(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [명부 일괄 시급 역산]
+    - 입력: start, end("HH:MM"), salary(월 급여) + 선택 컬럼(ROSTER_DEFAULTS, monthly_off, off_days, pay_month)
+    - rules: 규칙표 (없으면 rules.RULES)
+    - 반환: 입력 컬럼 + gwage(역산 기준시급) + RESULT_COLUMNS
+    """
+    return by_rules(load_roster(roster), _reverse_group, rules)
+
+def check_reverse_against_scalar(roster, sample: int | None = None, seed: int = 0,
+                                 rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [역산 동등성 검사]
+    - reverse_roster 결과를 payroll.solve_base_wage(스칼라) 결과와 행별 비교
+    - 월 시간은 _roster_hours 와 같은 분기: off_days 행은 monthcal.calendar_profile, 나머지는 monthly_hours
+      (행마다 귀속 월의 RuleSet, rules: 규칙표 · 없으면 rules.RULES)
+    - sample 지정 시 무작위 표본만 검사
+    - 반환: 불일치 행 (비어 있으면 전부 일치)
+    """
+    table = rules if rules is not None else RULES
+    out = reverse_roster(roster, table)
+    rows = out if sample is None or sample >= len(out) else out.sample(sample, random_state=seed)
+    cols = ["gwage", "normal_wage", "total", "base_pay", "holi_pay", "overtime_pay", "night_pay"]
+
+    sh, sm = _hm(rows["start"])
+    eh, em = _hm(rows["end"])
+    ym, off = _calendar_keys(rows)
+    flags = {c: _flag(rows[c]) for c in FLAG_COLUMNS}
+    months = rows["pay_month"].tolist() if "pay_month" in rows.columns else [None] * len(rows)
+    expected = []
+    for i in range(len(rows)):
+        r = rows.iloc[i]
+        rs = table.for_month(months[i])
+        start_t, end_t = time(int(sh[i]), int(sm[i])), time(int(eh[i]), int(em[i]))
+        if ym[i] < 0:
+            hours = monthly_hours(start_t, end_t, r["break_min"], r["days_wk"], flags["ceil_on"][i], rs)
+        else:
+            hours = calendar_profile(start_t, end_t, float(r["break_min"]), int(ym[i]) // 12, int(ym[i]) % 12 + 1,
+                                     tuple(int(x) for x in off[i]), bool(flags["ceil_on"][i]), rs)
+        bw, pay = solve_base_wage(
+            int(r["salary"]), hours, int(r["meal"]), int(r["car"]), flags["is_5p"][i],
+            flags["opt_basic"][i], flags["opt_holiday"][i], flags["opt_ot"][i], flags["opt_night"][i], rs,
+        )
+        expected.append((bw, pay.normal_wage, pay.total, pay.base_pay,
+                         pay.holi_pay, pay.overtime_pay, pay.night_pay))
+
+    expected = pd.DataFrame(expected, columns=cols, index=rows.index)
+    diff = (expected != rows[cols]).any(axis=1)
+    return rows.loc[diff, cols].join(expected.loc[diff], rsuffix="_scalar")
@@ -0,0 +1,294 @@
+"""
+벤치마크 (계산 핫패스 속도 측정)
+
+    python -m bench                                  # 전체 실행 → bench_results.json
+    python -m bench --only reverse accrual           # 이름에 reverse / accrual 이 들어간 항목만
+    python -m bench --save-baseline                  # 결과를 기준선(bench_baseline.json)으로 저장
+    python -m bench --baseline bench_baseline.json --threshold 0.15   # 기준선 대비 15% 이상 느려지면 실패
+
+- 합성 명부: 주간/야간(자정 넘김) 근무, 큰 고정수당, 긴 WSH 변경 이력
+- 네 페이지(월급 / 시급 역산 / 월휴무 / 연차 2종)의 스칼라 경로와 일괄(batch) 경로를 각각 측정
+- 항목별 repeat 회 실행 중 최솟값(best)으로 비교 (기준선은 같은 머신에서 만든 것을 사용)
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+from datetime import date, time, timedelta
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from accrual import (accrual_over_1y, accrual_under_1y_monthly, accrual_workforce, liability_projection,
+                     normalize_changes, split_by_changes)
+from batch import calc_roster, reverse_roster
+from compliance import scan_roster
+from exact import calc_roster_exact, reverse_roster_exact
+from payroll import calc_pay, offday_days_wk, shift_profile, solve_base_wage
+
+DEFAULT_RESULTS = "bench_results.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.10  # 기준선 대비 허용 증가율
+DEFAULT_REPEAT = 5
+
+# 규모 (--scale 로 일괄 조정)
+SCALAR_ROWS = 2_000
+BATCH_ROWS = 50_000
+ACCRUAL_EMPLOYEES = 2_000
+WSH_HISTORY = 120  # 직원당 WSH 변경 횟수 (긴 이력)
+PROJECTION_YEARS = 10  # 연차 부채 전망 연수
+
+
+# =========================
+# 🧪 합성 데이터
+# =========================
+def make_roster(n: int, seed: int = 0, overnight: float = 0.3, big_allowance: float = 0.2) -> pd.DataFrame:
+    """
+    [합성 명부] start, end, break_min, days_wk, gwage, meal, car, is_5p, ceil_on, opt_*
+    - overnight 비율만큼 자정 넘김 근무(18~23시 출근 → 다음날 퇴근)
+    - big_allowance 비율만큼 고정수당 50만~150만원
+    - 휴게시간은 항상 체류시간보다 짧게 (분모 시간 > 0)
+    """
+    rng = np.random.default_rng(seed)
+    night = rng.random(n) < overnight
+    sh = np.where(night, rng.integers(18, 24, n), rng.integers(5, 15, n))
+    sm = rng.choice([0, 15, 30, 45], n)
+    span_min = rng.integers(4 * 60, 14 * 60, n) // 15 * 15
+    end_min = (sh * 60 + sm + span_min) % (24 * 60)
+    big = rng.random(n) < big_allowance
+    return pd.DataFrame({
+        "start": [f"{h:02d}:{m:02d}" for h, m in zip(sh, sm)],
+        "end": [f"{m // 60:02d}:{m % 60:02d}" for m in end_min],
+        "break_min": np.minimum(rng.choice([0, 30, 60, 90], n), span_min - 60),
+        "days_wk": rng.choice([1, 2, 3, 4, 5, 5, 5, 6, 7, 4.5, 5.5], n),
+        "gwage": rng.integers(10_030, 30_000, n),
+        "meal": np.where(big, rng.integers(5, 16, n) * 100_000, rng.choice([0, 100_000, 200_000], n)),
+        "car": np.where(big, rng.integers(0, 6, n) * 100_000, rng.choice([0, 200_000], n)),
+        "is_5p": rng.random(n) < 0.8,
+        "ceil_on": rng.random(n) < 0.7,
+        "opt_basic": rng.random(n) < 0.3,
+        "opt_holiday": rng.random(n) < 0.3,
+        "opt_ot": rng.random(n) < 0.3,
+        "opt_night": rng.random(n) < 0.3,
+    })
+
+def make_reverse_roster(n: int, seed: int = 0, **kw) -> pd.DataFrame:
+    """역산용 명부: gwage 대신 salary (고정수당 + 200만~800만원)."""
+    df = make_roster(n, seed, **kw).drop(columns="gwage")
+    rng = np.random.default_rng(seed + 1)
+    df["salary"] = df["meal"] + df["car"] + rng.integers(200, 800, n) * 10_000
+    return df
+
+def make_offday_roster(n: int, seed: int = 0, **kw) -> pd.DataFrame:
+    """월휴무 명부: days_wk 대신 monthly_off (4~13일, 0.5일 단위)."""
+    df = make_roster(n, seed, **kw).drop(columns="days_wk")
+    rng = np.random.default_rng(seed + 2)
+    df["monthly_off"] = rng.integers(8, 27, n) / 2
+    return df
+
+def make_wsh_history(n_employees: int, n_changes: int = WSH_HISTORY, seed: int = 0):
+    """
+    [합성 WSH 이력] → (employees, changes)
+    - employees: employee_id, join_dt, default_wsh, end_limit, target_anniv (입사 1~20년차)
+    - changes: employee_id, eff_date, wsh (직원당 n_changes 건, 입사 후 기념일까지 고르게)
+    """
+    rng = random.Random(seed)
+    emps, rows = [], []
+    for i in range(n_employees):
+        join_dt = date(2005, 1, 1) + timedelta(days=rng.randrange(0, 365 * 18))
+        years = rng.randint(1, 20)
+        target = date(join_dt.year + years, join_dt.month, min(join_dt.day, 28))
+        emps.append({"employee_id": i, "join_dt": join_dt, "default_wsh": rng.choice([2.0, 3.0, 4.0, 8.0]),
+                     "end_limit": join_dt + timedelta(days=364), "target_anniv": target})
+        span = (target - join_dt).days
+        for _ in range(n_changes):
+            rows.append({"employee_id": i, "eff_date": join_dt + timedelta(days=rng.randrange(1, span)),
+                         "wsh": rng.choice([1.6, 2.4, 3.0, 4.0, 6.0, 8.0])})
+    return pd.DataFrame(emps), pd.DataFrame(rows)
+
+
+# =========================
+# ⏱️ 측정 항목
+# =========================
+def _hm(text: str) -> time:
+    h, m = text.split(":")
+    return time(int(h), int(m))
+
+def _pay_rows(df: pd.DataFrame, days_col: str = "days_wk") -> list[tuple]:
+    """스칼라 경로 입력: (start, end, break, days, ceil, gwage/salary, meal, car, 옵션 dict)."""
+    out = []
+    for r in df.itertuples(index=False):
+        opts = dict(is_5p=bool(r.is_5p), opt_basic=bool(r.opt_basic), opt_holiday=bool(r.opt_holiday),
+                    opt_ot=bool(r.opt_ot), opt_night=bool(r.opt_night))
+        out.append((_hm(r.start), _hm(r.end), float(r.break_min), float(getattr(r, days_col)),
+                    bool(r.ceil_on), int(getattr(r, "salary", getattr(r, "gwage", 0))),
+                    int(r.meal), int(r.car), opts))
+    return out
+
+def _pay_scalar(rows):
+    shift_profile.cache_clear()
+    for s, e, b, d, c, g, meal, car, opts in rows:
+        calc_pay(g, shift_profile(s, e, b, d, c), meal, car, **opts)
+
+def _reverse_scalar(rows):
+    shift_profile.cache_clear()
+    for s, e, b, d, c, salary, meal, car, opts in rows:
+        solve_base_wage(salary, shift_profile(s, e, b, d, c), meal, car, **opts)
+
+def _offday_scalar(rows):
+    shift_profile.cache_clear()
+    for s, e, b, off, c, g, meal, car, opts in rows:
+        _, days_wk = offday_days_wk(off)
+        calc_pay(g, shift_profile(s, e, b, days_wk, c), meal, car, **opts)
+
+def _employee_args(employees: pd.DataFrame, changes: pd.DataFrame) -> list[tuple]:
+    by_emp = {k: list(zip(g["eff_date"], g["wsh"])) for k, g in changes.groupby("employee_id")}
+    return [(r.join_dt, r.end_limit, r.target_anniv, by_emp.get(r.employee_id, []), r.default_wsh)
+            for r in employees.itertuples(index=False)]
+
+def _under_scalar(args):
+    for join_dt, end_limit, _, changes, dw in args:
+        accrual_under_1y_monthly(join_dt, end_limit, changes, dw)
+
+def _over_scalar(args):
+    for join_dt, _, target, changes, dw in args:
+        accrual_over_1y(join_dt, target, changes, dw)
+
+def _split_scalar(args):
+    for join_dt, _, target, changes, dw in args:
+        split_by_changes(join_dt, target, normalize_changes(join_dt, changes, dw))
+
+def build_cases(scale: float = 1.0) -> dict:
+    """
+    [측정 항목] 이름 → (행 수, 인자 없는 실행 함수)
+    입력 생성은 여기서 끝내고, 측정은 실행 함수만
+    """
+    ns = max(1, int(SCALAR_ROWS * scale))
+    nb = max(1, int(BATCH_ROWS * scale))
+    ne = max(1, int(ACCRUAL_EMPLOYEES * scale))
+
+    pay_s, pay_b = make_roster(ns, 1), make_roster(nb, 1)
+    rev_s, rev_b = make_reverse_roster(ns, 2), make_reverse_roster(nb, 2)
+    off_s, off_b = make_offday_roster(ns, 3), make_offday_roster(nb, 3)
+    low_b = off_b.assign(gwage=off_b["gwage"] - 2_000)  # 일부 행 최저시급 미달
+    cal_b = off_b.assign(off_days=np.array(["토일", "일", "월화"])[np.arange(nb) % 3],  # 달력 기준 월휴무
+                         pay_month=np.array(["2026-01", "2026-02", "2026-03"])[np.arange(nb) % 3])
+    employees, changes = make_wsh_history(ne, seed=4)
+    pay_rows, rev_rows, off_rows = _pay_rows(pay_s), _pay_rows(rev_s), _pay_rows(off_s, "monthly_off")
+    emp_args = _employee_args(employees, changes)
+    under_emps = employees.drop(columns="target_anniv")
+    over_emps = employees.drop(columns="end_limit")
+
+    return {
+        "pay.scalar": (ns, lambda: _pay_scalar(pay_rows)),
+        "pay.batch": (nb, lambda: calc_roster(pay_b)),
+        "reverse.scalar": (ns, lambda: _reverse_scalar(rev_rows)),
+        "reverse.batch": (nb, lambda: reverse_roster(rev_b)),
+        "offday.scalar": (ns, lambda: _offday_scalar(off_rows)),
+        "offday.batch": (nb, lambda: calc_roster(off_b)),
+        "pay_exact.batch": (nb, lambda: calc_roster_exact(pay_b)),
+        "reverse_exact.batch": (nb, lambda: reverse_roster_exact(rev_b)),
+        "offday_exact.batch": (nb, lambda: calc_roster_exact(off_b)),
+        "offday_calendar.batch": (nb, lambda: calc_roster(cal_b)),
+        "compliance.batch": (nb, lambda: scan_roster(low_b)),
+        "accrual_under.scalar": (ne, lambda: _under_scalar(emp_args)),
+        "accrual_under.batch": (ne, lambda: accrual_workforce(under_emps, changes)),
+        "accrual_over.scalar": (ne, lambda: _over_scalar(emp_args)),
+        "accrual_over.batch": (ne, lambda: accrual_workforce(over_emps, changes)),
+        "accrual_projection.batch": (ne * PROJECTION_YEARS,
+                                     lambda: liability_projection(employees, changes, PROJECTION_YEARS, date(2025, 1, 1))),
+        "split_by_changes.scalar": (ne, lambda: _split_scalar(emp_args)),
+    }
+
+def time_case(fn, repeat: int = DEFAULT_REPEAT) -> list[float]:
+    """fn 을 repeat 회 실행한 소요시간(초) 목록."""
+    out = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        fn()
+        out.append(perf_counter() - t0)
+    return out
+
+
+# =========================
+# 📊 실행 / 비교
+# =========================
+def run_benchmarks(only: list[str] | None = None, repeat: int = DEFAULT_REPEAT,
+                   scale: float = 1.0, verbose: bool = False) -> dict:
+    """
+    [벤치마크 실행]
+    - only: 이름에 이 문자열 중 하나가 들어간 항목만 (None 이면 전체)
+    - 반환: {"meta": 환경, "results": {항목: {rows, best_s, median_s, per_row_us}}}
+    """
+    results = {}
+    for name, (rows, fn) in build_cases(scale).items():
+        if only and not any(k in name for k in only):
+            continue
+        times = time_case(fn, repeat)
+        best = min(times)
+        results[name] = {"rows": rows, "best_s": best, "median_s": statistics.median(times),
+                         "per_row_us": best / rows * 1e6}
+        if verbose:
+            print(f"{name:26s} {rows:>7d} rows  best {best * 1000:9.1f} ms  "
+                  f"{best / rows * 1e6:8.2f} µs/row", file=sys.stderr)
+    meta = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+            "repeat": repeat, "scale": scale}
+    return {"meta": meta, "results": results}
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    [기준선 비교] 두 벤치마크 결과의 공통 항목별 best_s 비율
+    - ratio = 현재 / 기준선, ratio > 1 + threshold 면 regression
+    - 규모(rows)가 다르면 행당 시간(per_row_us)으로 비교
+    """
+    out = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        key = "best_s" if cur["rows"] == base["rows"] else "per_row_us"
+        ratio = cur[key] / base[key] if base[key] else float("inf")
+        out.append({"name": name, "baseline": base[key], "current": cur[key], "metric": key,
+                    "ratio": ratio, "regression": ratio > 1 + threshold})
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="계산 핫패스 벤치마크")
+    parser.add_argument("--only", nargs="*", help="이름에 포함된 문자열로 항목 선택")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--scale", type=float, default=1.0, help="데이터 규모 배율")
+    parser.add_argument("--out", default=DEFAULT_RESULTS, help="결과 JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준선 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="허용 증가율 (0.10 = 10%% 느려질 때까지 허용)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.only, args.repeat, args.scale, verbose=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {args.baseline}", file=sys.stderr)
+        return
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"기준선 없음: {args.baseline} (--save-baseline 으로 생성)", file=sys.stderr)
+        return
+    rows = compare(current, baseline, args.threshold)
+    for r in rows:
+        mark = "REGRESSION" if r["regression"] else "ok"
+        print(f"{r['name']:26s} x{r['ratio']:.2f}  {mark}", file=sys.stderr)
+    if any(r["regression"] for r in rows):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+헤드리스 CLI (Streamlit 없이 계산만)
+
+    python -m cli reverse --start 10:00 --end 23:00 --salary 5000000
+    python -m cli pay     --start 10:00 --end 23:00 --gwage 10030 --meal 100000 --car 200000
+    python -m cli offday  --start 10:00 --end 23:00 --gwage 10030 --monthly-off 6
+    python -m cli offday  --start 10:00 --end 23:00 --gwage 10030 --off-days 토일 --pay-month 2026-03
+    python -m cli leave under --join 2024-07-15 --wsh 3 --change 2024-10-01:2.4
+    python -m cli leave over  --join 2024-07-15 --wsh 3 --target 2025-09-12
+
+- 결과는 JSON 한 줄로 stdout 에 출력
+- --input/--output 을 주면 명부 일괄 계산 (stream.py, pandas 는 이때만 로드)
+- --timing: 모듈 로드 ~ 결과 출력까지 걸린 시간(ms)을 stderr 로 출력
+"""
+from time import perf_counter
+
+_t0 = perf_counter()
+
+import argparse
+import json
+import sys
+from datetime import date, time, timedelta
+
+from payroll import calc_pay, offday_days_wk, shift_profile, solve_base_wage
+from rules import rules_for
+
+ROUND_ITEMS = ("basic", "holiday", "ot", "night")
+
+
+def _hm(text: str) -> time:
+    """"HH:MM" → datetime.time."""
+    h, m = text.split(":")
+    return time(int(h), int(m))
+
+def _emit(result: dict, args):
+    print(json.dumps(result, ensure_ascii=False, default=str))
+    if args.timing:
+        print(f"elapsed_ms={(perf_counter() - _t0) * 1000:.1f}", file=sys.stderr)
+
+
+# =========================
+# 💵 급여 (시급 역산 / 월급 / 월휴무)
+# =========================
+def _pay_common(p: argparse.ArgumentParser):
+    p.add_argument("--start", default="10:00", help="출근 HH:MM")
+    p.add_argument("--end", default="23:00", help="퇴근 HH:MM")
+    p.add_argument("--break-min", type=float, default=60, help="휴게시간(분)")
+    p.add_argument("--meal", type=int, default=0, help="식대(고정수당)")
+    p.add_argument("--car", type=int, default=0, help="차량유지비(고정수당)")
+    p.add_argument("--not-5p", action="store_true", help="5인 미만 사업장 (연장 1.0배, 야간 0배)")
+    p.add_argument("--no-ceil", action="store_true", help="월 시간 올림 미적용")
+    p.add_argument("--pay-month", help="귀속 월 YYYY-MM (규칙표 조회, 기본: 이번 달)")
+    p.add_argument("--round", nargs="*", choices=ROUND_ITEMS, default=[],
+                   help="10원 단위 올림 항목")
+    p.add_argument("--input", help="명부 CSV/JSONL (일괄 계산)")
+    p.add_argument("--output", help="결과 CSV/JSONL/Parquet (일괄 계산)")
+    p.add_argument("--chunk-size", type=int, default=10_000)
+
+def _pay_options(args) -> dict:
+    return dict(is_5p=not args.not_5p,
+                opt_basic="basic" in args.round, opt_holiday="holiday" in args.round,
+                opt_ot="ot" in args.round, opt_night="night" in args.round,
+                rules=rules_for(args.pay_month))
+
+def _hours_dict(hrs) -> dict:
+    return {"monthly_base": hrs.base, "monthly_holiday": hrs.holiday,
+            "monthly_ot": hrs.ot, "monthly_night": hrs.night}
+
+def _run_batch(args, func_name: str):
+    """명부 일괄 계산 (pandas / numpy 는 여기서만 로드)."""
+    if not args.output:
+        raise SystemExit("--input 사용 시 --output 이 필요합니다.")
+    import batch
+    from stream import stream_roster
+    stats = stream_roster(args.input, args.output, func=getattr(batch, func_name),
+                          chunk_size=args.chunk_size)
+    _emit(stats, args)
+
+def cmd_reverse(args):
+    if args.input:
+        return _run_batch(args, "reverse_roster")
+    if args.meal + args.car > args.salary:
+        raise SystemExit("고정수당(식대+차량)이 월급여보다 큽니다. 입력값을 확인해주세요.")
+    opts = _pay_options(args)
+    hrs = shift_profile(_hm(args.start), _hm(args.end), args.break_min, args.days_wk, not args.no_ceil,
+                        opts["rules"])
+    bw, pay = solve_base_wage(args.salary, hrs, args.meal, args.car, **opts)
+    _emit({"gwage": bw, **pay._asdict(), **_hours_dict(hrs), "gap": args.salary - pay.total}, args)
+
+def cmd_pay(args):
+    if args.input:
+        return _run_batch(args, "calc_roster")
+    opts = _pay_options(args)
+    hrs = shift_profile(_hm(args.start), _hm(args.end), args.break_min, args.days_wk, not args.no_ceil,
+                        opts["rules"])
+    pay = calc_pay(args.gwage, hrs, args.meal, args.car, **opts)
+    _emit({"gwage": args.gwage, **pay._asdict(), **_hours_dict(hrs)}, args)
+
+def cmd_offday(args):
+    if args.input:
+        return _run_batch(args, "calc_roster")
+    opts = _pay_options(args)
+    if args.off_days is not None:  # 달력 기준: 귀속 월의 실제 요일
+        from monthcal import calendar_profile, month_days, parse_off_days, year_month
+        y, m = year_month(args.pay_month)
+        off = parse_off_days(args.off_days)
+        hrs = calendar_profile(_hm(args.start), _hm(args.end), args.break_min, y, m, off, not args.no_ceil,
+                               opts["rules"])
+        pay = calc_pay(args.gwage, hrs, args.meal, args.car, **opts)
+        workdays, monthly_off = month_days(y, m, off)
+        return _emit({"gwage": args.gwage, **pay._asdict(), **_hours_dict(hrs), "pay_month": f"{y}-{m:02d}",
+                      "workdays": workdays, "monthly_off": monthly_off}, args)
+    weekly_holidays, days_wk = offday_days_wk(args.monthly_off, opts["rules"])
+    hrs = shift_profile(_hm(args.start), _hm(args.end), args.break_min, days_wk, not args.no_ceil,
+                        opts["rules"])
+    pay = calc_pay(args.gwage, hrs, args.meal, args.car, **opts)
+    _emit({"gwage": args.gwage, **pay._asdict(), **_hours_dict(hrs),
+           "weekly_holidays": weekly_holidays, "days_wk": days_wk}, args)
+
+
+# =========================
+# 🍼 연차
+# =========================
+def _change(text: str) -> tuple[date, float]:
+    """"YYYY-MM-DD:WSH" → (효력일, WSH)."""
+    d, w = text.rsplit(":", 1)
+    return date.fromisoformat(d), float(w)
+
+def cmd_leave(args):
+    from accrual import (WshTimeline, under_1y_rows, over_1y_rows,
+                         add_months, full_years, statutory_days)
+
+    if args.mode == "batch":
+        if not args.employees:
+            raise SystemExit("batch 는 --employees 가 필요합니다.")
+        import pandas as pd
+        from accrual import accrual_workforce
+        employees = pd.read_csv(args.employees)
+        changes = pd.read_csv(args.changes) if args.changes else None
+        awards, segments = accrual_workforce(employees, changes)
+        awards.to_csv(args.awards, index=False)
+        segments.to_csv(args.segments, index=False)
+        return _emit({"awards": len(awards), "segments": len(segments)}, args)
+
+    if not args.join or (args.mode == "over" and not args.target):
+        raise SystemExit("--join (over 는 --target 도) 이 필요합니다.")
+    join_dt = date.fromisoformat(args.join)
+    changes = [_change(c) for c in args.change]
+    if args.mode == "under":
+        end_limit = (date.fromisoformat(args.end_limit) if args.end_limit
+                     else add_months(join_dt, 12) - timedelta(days=1))
+        rows = under_1y_rows(join_dt, end_limit, WshTimeline.from_changes(join_dt, changes, args.wsh))
+        return _emit({"rows": rows,
+                      "days_total": sum(r["accrual_days"] for r in rows),
+                      "hours_total": sum(r["accrual_hours"] for r in rows)}, args)
+
+    target = date.fromisoformat(args.target)
+    prev_anniv = add_months(target, -12)
+    service_years = full_years(target, join_dt)
+    N = statutory_days(service_years)
+    rows, total_hours = over_1y_rows(prev_anniv, target, N,
+                                      WshTimeline.from_changes(prev_anniv, changes, args.wsh))
+    _emit({"service_years": service_years, "N": N, "prev_anniv": prev_anniv,
+           "target_anniv": target, "rows": rows,
+           "days_total": float(N), "hours_total": total_hours}, args)
+
+
+# =========================
+# 🧭 인자
+# =========================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="급여 / 연차 계산 CLI")
+    parser.add_argument("--timing", action="store_true", help="소요시간(ms)을 stderr 로 출력")
+    sub = parser.add_subparsers(dest="page", required=True)
+
+    p = sub.add_parser("reverse", help="시급 역산")
+    _pay_common(p)
+    p.add_argument("--days-wk", type=float, default=5, help="주 근로일수")
+    p.add_argument("--salary", type=int, default=5_000_000, help="월 급여")
+    p.set_defaults(func=cmd_reverse)
+
+    p = sub.add_parser("pay", help="월급 계산")
+    _pay_common(p)
+    p.add_argument("--days-wk", type=float, default=5, help="주 근로일수")
+    p.add_argument("--gwage", type=int, default=10_030, help="기준시급")
+    p.set_defaults(func=cmd_pay)
+
+    p = sub.add_parser("offday", help="월휴무 월급 계산")
+    _pay_common(p)
+    p.add_argument("--monthly-off", type=float, default=6.0, help="월 휴무일(일)")
+    p.add_argument("--off-days", help="휴무 요일 (예: 토일). 주면 --pay-month 달력 기준으로 계산 (--monthly-off 무시)")
+    p.add_argument("--gwage", type=int, default=10_030, help="기준시급")
+    p.set_defaults(func=cmd_offday)
+
+    p = sub.add_parser("leave", help="연차 시간 환산")
+    p.add_argument("mode", choices=["under", "over", "batch"],
+                   help="under: 1년 미만 / over: 1년 이상 / batch: 전 직원 일괄")
+    p.add_argument("--join", help="입사일 YYYY-MM-DD")
+    p.add_argument("--wsh", type=float, default=3.0, help="입사 시 WSH")
+    p.add_argument("--change", action="append", default=[], help="WSH 변경 YYYY-MM-DD:WSH (반복 가능)")
+    p.add_argument("--end-limit", help="(under) 계산 종료일, 기본: 입사 1년 전날")
+    p.add_argument("--target", help="(over) 이번 기념일")
+    p.add_argument("--employees", help="(batch) 직원 CSV")
+    p.add_argument("--changes", help="(batch) WSH 변경표 CSV (employee_id, eff_date, wsh)")
+    p.add_argument("--awards", default="awards.csv", help="(batch) 1년 미만 결과 CSV")
+    p.add_argument("--segments", default="segments.csv", help="(batch) 1년 이상 결과 CSV")
+    p.set_defaults(func=cmd_leave)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+if __name__ == "__main__":
+    main()
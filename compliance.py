@@ -0,0 +1,122 @@
+"""
+최저임금 준수 점검 (명부 전체, 마감 전 게이트)
+
+    python -m compliance roster.csv --output violations.csv [--chunk-size 50000] [--strict]
+
+- 명부: 월급 계산(start, end, gwage) / 월휴무(+ monthly_off) 명부, 또는 시급 역산(salary) 명부
+  pay_month 가 있으면 귀속 월의 최저시급(rules.py 규칙표), 없으면 이번 달 최저시급
+- 행마다 기준시급 · 통상시급을 최저시급과 비교하고, 기준시급을 최저시급으로 올렸을 때의 항목별 금액과의 차이(미달액)를 계산
+    역산 명부는 역산 기준시급으로 비교하고, total 지급액은 salary
+- 계산은 batch 경로 그대로 (규칙별 묶음 → 근무 패턴별 shift_profile 1회 → 배열 연산), 재계산도 calc_pay_arr 한 번
+- CSV / JSONL 명부는 stream.py 로 청크마다 점검해 위반 행만 바로 기록 (메모리 상한 고정, 중단 시 이어서)
+- --strict: 위반이 한 건이라도 있으면 종료 코드 1 (급여 마감 게이트용)
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from batch import RESULT_COLUMNS, _calc_group, _pay_kwargs, _reverse_group, by_rules, calc_pay_arr, load_roster
+from rules import RuleSet, RuleTable
+from stream import DEFAULT_CHUNK_SIZE, stream_roster
+
+ID_COLUMNS = ("employee_id", "name", "pay_month")  # 있으면 보고서에 그대로
+HOUR_COLUMNS = RESULT_COLUMNS[:4]
+PAY_ITEMS = ("base_pay", "holi_pay", "overtime_pay", "night_pay", "total")
+CHECK_COLUMNS = ["gwage", "normal_wage", "min_wage", "gwage_shortfall", "normal_shortfall", "violation",
+                 *[f"{c}_{k}" for c in PAY_ITEMS for k in ("paid", "required", "shortfall")]]
+
+
+# ---------------------------
+# 점검
+# ---------------------------
+def _check_group(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    """같은 계산 규칙(귀속 월)의 행 묶음 → 행별 점검 결과 (위반 아닌 행 포함)."""
+    reverse = "gwage" not in df.columns
+    df = (_reverse_group if reverse else _calc_group)(df, rules)
+    gwage = df["gwage"].to_numpy(np.int64)
+    normal = df["normal_wage"].to_numpy(np.int64)
+    mw = rules.min_wage
+
+    hours = tuple(df[c].to_numpy(float) for c in HOUR_COLUMNS)
+    required = calc_pay_arr(np.maximum(gwage, mw), *hours, **_pay_kwargs(df), rules=rules)
+    paid = {c: df[c].to_numpy(np.int64) for c in PAY_ITEMS}
+    if reverse:
+        paid["total"] = df["salary"].to_numpy(np.int64)
+
+    out = {c: df[c].to_numpy() for c in ID_COLUMNS if c in df.columns}
+    out.update(gwage=gwage, normal_wage=normal, min_wage=np.full(len(df), mw, dtype=np.int64),
+               gwage_shortfall=np.maximum(0, mw - gwage), normal_shortfall=np.maximum(0, mw - normal),
+               violation=(gwage < mw) | (normal < mw))
+    for c in PAY_ITEMS:
+        out[f"{c}_paid"] = paid[c]
+        out[f"{c}_required"] = required[c]
+        out[f"{c}_shortfall"] = np.maximum(0, required[c] - paid[c])
+    return pd.DataFrame(out, index=df.index)
+
+def check_roster(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [행별 최저임금 점검]
+    - roster: 모듈 설명 참고 (DataFrame / .csv / .parquet)
+    - rules: 규칙표 (없으면 rules.RULES)
+    - 반환: ID_COLUMNS(있는 것) + CHECK_COLUMNS, 입력 행 순서
+        gwage_shortfall / normal_shortfall: 최저시급 - 기준시급 / 통상시급 (0 이상)
+        <항목>_paid / _required / _shortfall: 현재 금액, 최저시급 적용 금액, 미달액
+    """
+    return by_rules(load_roster(roster), _check_group, rules)
+
+def scan_roster(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """[위반 행만] check_roster 결과 중 기준시급 또는 통상시급이 최저시급 미만인 행 (violation 컬럼 제외)."""
+    report = check_roster(roster, rules)
+    return report.loc[report["violation"].to_numpy(bool)].drop(columns="violation")
+
+def scan_stream(src: str, dst: str, chunk_size: int = DEFAULT_CHUNK_SIZE, resume: bool = True,
+                rules: RuleTable | None = None) -> dict:
+    """
+    [스트리밍 점검] CSV / JSONL 명부를 청크마다 점검해 위반 행만 dst(CSV / JSONL / Parquet)에 기록
+    - 반환: stream_roster 결과 ("rows" = 기록된 위반 행 수)
+    """
+    return stream_roster(src, dst, func=lambda chunk: scan_roster(chunk, rules),
+                         chunk_size=chunk_size, resume=resume)
+
+def violation_summary(report: pd.DataFrame) -> pd.DataFrame:
+    """귀속 월별 위반 합계: violations, 항목별 미달액 합 (pay_month 가 없으면 한 줄)."""
+    cols = [f"{c}_shortfall" for c in PAY_ITEMS]
+    key = report["pay_month"] if "pay_month" in report.columns else pd.Series("", index=report.index)
+    return (report.groupby(key.rename("pay_month"), sort=True)
+            .agg(violations=("gwage", "size"), **{c: (c, "sum") for c in cols})
+            .reset_index())
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m compliance", description="최저임금 준수 점검 (위반 보고서)")
+    parser.add_argument("roster", help="명부 CSV / JSONL (스트리밍) 또는 Parquet")
+    parser.add_argument("--output", required=True, help="위반 보고서 CSV / JSONL / Parquet")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="스트리밍 청크 행 수")
+    parser.add_argument("--no-resume", action="store_true", help="체크포인트 무시하고 처음부터")
+    parser.add_argument("--strict", action="store_true", help="위반이 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    if str(args.roster).lower().endswith(".parquet"):
+        report = scan_roster(args.roster)
+        out = str(args.output).lower()
+        if out.endswith(".parquet"):
+            report.to_parquet(args.output, index=False)
+        elif out.endswith((".jsonl", ".ndjson")):
+            report.to_json(args.output, orient="records", lines=True, force_ascii=False)
+        else:
+            report.to_csv(args.output, index=False)
+        stats = {"rows": len(report)}
+    else:
+        stats = scan_stream(args.roster, args.output, args.chunk_size, resume=not args.no_resume)
+    print(json.dumps({"violations": stats["rows"], **{k: v for k, v in stats.items() if k != "rows"}}))
+    if args.strict and stats["rows"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
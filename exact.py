@@ -0,0 +1,512 @@
+"""
+정수 정확 계산 (부동소수 없음)
+- 시간: 분 단위 정수에서 출발해 월 시간을 "분자 / 분모" 정수 쌍으로 보관
+    월 환산 주 수 = wn/wd (기본 4.345 = 869/200) → 월 시간 분모 D = dd × 60 × wd × 5 (dd: 주 근로일 분모)
+    주 근로일 days_wk 는 0.01일 단위(dd = 100),
+    월휴무는 7 - 휴무일/4.345 = (6083 - 2·o)/869 (o: 휴무일 × 100, 기본 규칙에서 dd = 869)
+- 금액: 원 단위 정수, 올림은 정수 올림 나눗셈 (won_ceil 의 1e-12 보정 없음)
+- 계산 순서·규칙은 payroll.py 와 같고, 부동소수 반올림 오차만 없음
+- 달력 기준 월휴무(off_days) 행은 calendar_profile_exact (monthcal.calendar_profile 정수판)
+- 상수는 행의 RuleSet(rules.py)에서 Fraction(str(값)) 으로 분수화 (연장 1.5 = 3/2, 야간 0.5 = 1/2),
+  명부는 batch.by_rules 로 규칙별 묶음마다 계산
+- diff_roster(): 같은 명부를 부동소수(batch.py)와 정수 모드로 계산해 다른 행을 모두 반환
+
+    python -m exact roster.csv            # 월급 계산 비교
+    python -m exact roster.csv --reverse  # 시급 역산 비교
+"""
+import argparse
+from datetime import time
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from batch import (REVERSE_REQUIRED_COLUMNS, _calendar_keys, _flag, _hm, _pay_kwargs, by_rules,
+                   calc_roster, load_roster, prepare_roster, reverse_roster, search_wage_arr)
+from monthcal import month_weeks
+from payroll import SHIFT_CACHE_SIZE, PayResult
+from rules import DEFAULT_RULES, RuleSet, RuleTable
+from windows import night_minutes, night_minutes_scalar
+
+DAYS_DEN = 100                       # days_wk 0.01일 단위
+MONEY_COLUMNS = ["normal_wage", "base_pay", "holi_pay", "overtime_pay", "night_pay", "total"]
+
+
+def ceil_div(a: int, b: int) -> int:
+    """정수 올림 나눗셈 (b > 0)."""
+    return -(-a // b)
+
+def ceil_ones(n: int) -> int:
+    """10원 단위 올림 (정수)."""
+    return ceil_div(n, 10) * 10
+
+class ExactRules(NamedTuple):
+    """RuleSet 의 정수 분수판. 월 환산 주 수 = wpm_num / wpm_den, 가산계수 = 분자 / 분모."""
+    wpm_num: int
+    wpm_den: int
+    week_cap: int       # 주 상한(시간) 분수의 분자, 분모는 cap_den
+    cap_den: int
+    holiday_cap: Fraction
+    ot_num: int
+    ot_den: int
+    night_num: int
+    night_den: int
+
+    @property
+    def hour_units(self) -> int:
+        """월 시간 분모 = dd × hour_units (분 → 시, 주 → 월, 주휴 ÷5)."""
+        return 60 * self.wpm_den * 5 * self.cap_den
+
+def _fraction(v) -> Fraction:
+    """규칙 값 → Fraction (부동소수 4.345 도 문자열로 거쳐 869/200)."""
+    return Fraction(str(v))
+
+@lru_cache(maxsize=64)
+def exact_rules(rules: RuleSet = DEFAULT_RULES) -> ExactRules:
+    """[RuleSet → 분수] 규칙별로 한 번."""
+    wpm, cap = _fraction(rules.weeks_per_month), _fraction(rules.max_weekly_hours)
+    ot, night = _fraction(rules.ot_factor), _fraction(rules.night_factor)
+    if wpm <= 0 or cap < 0 or ot < 0 or night < 0:
+        raise ValueError(f"정수 모드에서 쓸 수 없는 규칙 값입니다: {rules}")
+    return ExactRules(wpm.numerator, wpm.denominator, cap.numerator, cap.denominator,
+                      _fraction(rules.max_monthly_holiday),
+                      ot.numerator, ot.denominator, night.numerator, night.denominator)
+
+def days_fraction(days_wk: float) -> tuple[int, int]:
+    """주 근로일 → (분자, 100). 0.01일 단위가 아니면 ValueError."""
+    num = round(days_wk * DAYS_DEN)
+    if abs(days_wk * DAYS_DEN - num) > 1e-6:
+        raise ValueError(f"주 근로일은 0.01일 단위여야 합니다: {days_wk}")
+    return max(0, min(7 * DAYS_DEN, num)), DAYS_DEN
+
+def offday_den(rules: RuleSet = DEFAULT_RULES) -> tuple[int, int, int]:
+    """월휴무 주 근로일 분수의 (분모, 7일 분자, 휴무 0.01일당 분자). 기본 규칙: (869, 6083, 2)."""
+    er = exact_rules(rules)
+    g = gcd(100 * er.wpm_num, er.wpm_den)
+    den = 100 * er.wpm_num // g
+    return den, 7 * den, er.wpm_den // g
+
+def offday_fraction(monthly_off: float, rules: RuleSet = DEFAULT_RULES) -> tuple[int, int]:
+    """월 휴무일 → 주 근로일 (분자, 분모) = 7 - 휴무일 / 월 환산 주 수 (기본 (6083 - 2·o) / 869), 0~7일로 클램프."""
+    o = round(monthly_off * 100)
+    if abs(monthly_off * 100 - o) > 1e-6:
+        raise ValueError(f"월 휴무일은 0.01일 단위여야 합니다: {monthly_off}")
+    den, seven, per_off = offday_den(rules)
+    return max(0, min(seven, seven - per_off * o)), den
+
+
+# =========================
+# ⏱️ 월 시간 (정수 분자 / 분모)
+# =========================
+class ExactHours(NamedTuple):
+    """월 시간 = 각 값 / den (시간)."""
+    base: int
+    holiday: int
+    ot: int
+    night: int
+    den: int
+
+    @property
+    def denom(self) -> int:
+        """통상시급 분모 시간(분자) = 기본근로 + 주휴."""
+        return self.base + self.holiday
+
+    def as_float(self) -> tuple[float, float, float, float]:
+        """표시용 (base, holiday, ot, night) 시간."""
+        return (self.base / self.den, self.holiday / self.den,
+                self.ot / self.den, self.night / self.den)
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+@lru_cache(maxsize=SHIFT_CACHE_SIZE)
+def monthly_hours_exact(start_t: time, end_t: time, break_min: int,
+                        days_num: int, days_den: int, ceil_on: bool,
+                        rules: RuleSet = DEFAULT_RULES) -> ExactHours:
+    """
+    [근무 패턴 → 월 시간, 정수]
+    - monthly_hours 와 같은 규칙 (주 상한, 주휴 = 주근로 ÷ 5 × 월 환산 주 수 상한, 야간 22~06)
+    - 주 근로일 = days_num / days_den, 상수는 rules 의 분수 (exact_rules)
+    """
+    er = exact_rules(rules)
+    s, e = _minutes(start_t), _minutes(end_t)
+    if e <= s:
+        e += 24 * 60
+    daily_work = max(0, e - s - break_min) * er.cap_den         # 분/일 × cap_den
+    night = night_minutes_scalar(s, e) * er.cap_den             # 분/일 × cap_den
+
+    den = days_den * er.hour_units
+    weekly_raw = daily_work * days_num                          # 분/주 × days_den × cap_den
+    cap = er.week_cap * 60 * days_den
+    weekly_base = min(weekly_raw, cap)
+
+    wn = er.wpm_num
+    base = weekly_base * wn * 5
+    holiday = min(weekly_base * wn, int(er.holiday_cap * den))
+    ot = max(0, weekly_raw - cap) * wn * 5
+    night_m = night * days_num * wn * 5
+    if ceil_on:
+        base, holiday, ot, night_m = (ceil_div(x, den) * den for x in (base, holiday, ot, night_m))
+    return ExactHours(base, holiday, ot, night_m, den)
+
+def shift_profile_exact(start_t: time, end_t: time, break_min: float,
+                        days_wk: float, ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> ExactHours:
+    """shift_profile 의 정수판 (휴게는 분 단위 정수, 주 근로일은 0.01일 단위)."""
+    if break_min != int(break_min):
+        raise ValueError(f"휴게시간은 분 단위 정수여야 합니다: {break_min}")
+    return monthly_hours_exact(start_t, end_t, int(break_min), *days_fraction(days_wk), bool(ceil_on), rules)
+
+def offday_profile_exact(start_t: time, end_t: time, break_min: float,
+                         monthly_off: float, ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> ExactHours:
+    """월휴무 페이지: 월 휴무일 → 주 근로일(정확한 분수) → 월 시간."""
+    if break_min != int(break_min):
+        raise ValueError(f"휴게시간은 분 단위 정수여야 합니다: {break_min}")
+    return monthly_hours_exact(start_t, end_t, int(break_min), *offday_fraction(monthly_off, rules),
+                               bool(ceil_on), rules)
+
+@lru_cache(maxsize=SHIFT_CACHE_SIZE)
+def calendar_profile_exact(start_t: time, end_t: time, break_min: int, year: int, month: int,
+                           off_days: tuple[int, ...], ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> ExactHours:
+    """
+    [monthcal.calendar_profile 정수판]
+    - 달력 주마다 주 상한을 앞 달 근로일부터 채우고 귀속 월 근로일의 나머지가 기본근로 (calendar_weeks 와 같은 규칙)
+    - 주 시간은 분 × cap_den 정수, 월 시간 분모 = 60 × 5 × cap_den (주휴 = 기본근로 ÷ 5 가 나누어떨어짐)
+    """
+    er = exact_rules(rules)
+    s, e = _minutes(start_t), _minutes(end_t)
+    if e <= s:
+        e += 24 * 60
+    daily_work = max(0, e - s - break_min) * er.cap_den
+    cap = er.week_cap * 60
+    base = ot = days = 0
+    for w in month_weeks(year, month, off_days):
+        work = daily_work * w.days
+        b = min(work, max(0, cap - daily_work * w.before))
+        base += b
+        ot += work - b
+        days += w.days
+
+    den = 60 * 5 * er.cap_den
+    hours = (base * 5, min(base, int(er.holiday_cap * den)), ot * 5,
+             night_minutes_scalar(s, e) * er.cap_den * days * 5)
+    if ceil_on:
+        hours = (ceil_div(x, den) * den for x in hours)
+    return ExactHours(*hours, den)
+
+
+# =========================
+# 💵 금액 (정수)
+# =========================
+def calc_pay_exact(gwage: int, hours: ExactHours, meal: int, car: int, is_5p: bool,
+                   opt_basic: bool = False, opt_holiday: bool = False,
+                   opt_ot: bool = False, opt_night: bool = False,
+                   rules: RuleSet = DEFAULT_RULES) -> PayResult:
+    """calc_pay 정수판 (가산계수는 rules 의 분수, 기본 연장 1.5 = 3/2, 야간 0.5 = 1/2)."""
+    if hours.denom <= 0:
+        raise ValueError("분모 시간(기본근로+주휴)이 0입니다. 입력값을 확인하세요.")
+    den = hours.den
+
+    base_pay = ceil_div(gwage * hours.base, den)
+    holi_pay = ceil_div(gwage * hours.holiday, den)
+    if opt_basic:   base_pay = ceil_ones(base_pay)
+    if opt_holiday: holi_pay = ceil_ones(holi_pay)
+
+    normal_wage = ceil_div((base_pay + holi_pay + meal + car) * den, hours.denom)
+
+    if is_5p:
+        er = exact_rules(rules)
+        overtime_pay = ceil_div(normal_wage * hours.ot * er.ot_num, den * er.ot_den)
+        night_pay    = ceil_div(normal_wage * hours.night * er.night_num, den * er.night_den)
+    else:
+        overtime_pay = ceil_div(normal_wage * hours.ot, den)
+        night_pay    = 0
+    if opt_ot:    overtime_pay = ceil_ones(overtime_pay)
+    if opt_night: night_pay    = ceil_ones(night_pay)
+
+    total = base_pay + holi_pay + overtime_pay + night_pay + meal + car
+    return PayResult(normal_wage, total, base_pay, holi_pay, overtime_pay, night_pay)
+
+def solve_base_wage_exact(salary: int, hours: ExactHours, meal: int, car: int, is_5p: bool,
+                          opt_basic: bool = False, opt_holiday: bool = False,
+                          opt_ot: bool = False, opt_night: bool = False,
+                          rules: RuleSet = DEFAULT_RULES) -> tuple[int, PayResult]:
+    """solve_base_wage 정수판: 총액 ≤ 월급 인 가장 큰 기준시급 (초기 추정 + 지수 탐색 + 이분 탐색)."""
+    if hours.denom <= 0:
+        raise ValueError("분모 시간(기본근로+주휴)이 0입니다. 입력값을 확인하세요.")
+
+    def total(g: int) -> PayResult:
+        return calc_pay_exact(g, hours, meal, car, is_5p, opt_basic, opt_holiday, opt_ot, opt_night, rules)
+
+    init_base_wage = max(0, ceil_div((salary - meal - car) * hours.den, hours.denom))
+    res = total(init_base_wage)
+
+    step = 1
+    if res.total <= salary:
+        lo, lo_res = init_base_wage, res
+        hi = lo + step
+        while True:
+            r = total(hi)
+            if r.total > salary:
+                break
+            lo, lo_res = hi, r
+            step *= 2
+            hi = lo + step
+    else:
+        hi = init_base_wage
+        while True:
+            lo = max(0, hi - step)
+            lo_res = total(lo)
+            if lo_res.total <= salary:
+                break
+            if lo == 0:
+                return 0, lo_res
+            hi = lo
+            step *= 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        r = total(mid)
+        if r.total <= salary:
+            lo, lo_res = mid, r
+        else:
+            hi = mid
+    return lo, lo_res
+
+
+# =========================
+# 📦 명부 일괄 (NumPy int64)
+# =========================
+def ceil_div_arr(a: np.ndarray, b) -> np.ndarray:
+    """정수 올림 나눗셈 배열판 (a ≥ 0, b > 0)."""
+    return (a + (b - 1)) // b
+
+def ceil_ones_arr(n: np.ndarray) -> np.ndarray:
+    """10원 단위 올림 배열판 (n ≥ 0)."""
+    return (n + 9) // 10 * 10
+
+def _days_arr(df: pd.DataFrame, rules: RuleSet = DEFAULT_RULES,
+              calendar: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    행별 주 근로일 (분자, 분모). monthly_off 가 있는 행은 월휴무 분수.
+    calendar 가 True 인 행(달력 기준 월휴무)은 근로일을 쓰지 않으므로 (0, 100).
+    """
+    calendar = np.zeros(len(df), dtype=bool) if calendar is None else calendar
+    days = np.where(calendar, 0.0, df["days_wk"].to_numpy(float))
+    has_off = np.zeros(len(df), dtype=bool)
+    if "monthly_off" in df.columns:
+        off = df["monthly_off"].to_numpy(float)
+        has_off = ~np.isnan(off) & ~calendar
+        days = np.where(has_off, 0.0, days)  # prepare_roster 가 채운 부동소수 근로일 대신 아래 분수 사용
+
+    num = np.round(days * DAYS_DEN)
+    if (np.abs(days * DAYS_DEN - num) > 1e-6).any():
+        raise ValueError("주 근로일은 0.01일 단위여야 합니다.")
+    num = np.clip(num, 0, 7 * DAYS_DEN).astype(np.int64)
+    den = np.full(len(df), DAYS_DEN, dtype=np.int64)
+    if has_off.any():
+        o_raw = np.where(has_off, off, 0.0) * 100
+        o = np.round(o_raw)
+        if (np.abs(o_raw - o) > 1e-6).any():
+            raise ValueError("월 휴무일은 0.01일 단위여야 합니다.")
+        off_den, seven, per_off = offday_den(rules)
+        off_num = np.clip(seven - per_off * o.astype(np.int64), 0, seven)
+        num = np.where(has_off, off_num, num)
+        den = np.where(has_off, off_den, den)
+    return num, den
+
+def monthly_hours_exact_arr(sh, sm, eh, em, break_min, days_num, days_den, ceil_on,
+                            rules: RuleSet = DEFAULT_RULES):
+    """monthly_hours_exact 배열판 → (base, holiday, ot, night, den) int64. 정수 연산이라 스칼라와 항상 같음."""
+    er = exact_rules(rules)
+    s = sh * 60 + sm
+    e = eh * 60 + em
+    e = np.where(e <= s, e + 24 * 60, e)
+    daily_work = np.maximum(0, e - s - break_min) * er.cap_den
+    night = night_minutes(s, e) * er.cap_den
+
+    den = days_den * er.hour_units
+    weekly_raw = daily_work * days_num
+    cap = er.week_cap * 60 * days_den
+    weekly_base = np.minimum(weekly_raw, cap)
+    holiday_cap = den * er.holiday_cap.numerator // er.holiday_cap.denominator
+
+    wn = er.wpm_num
+    hours = [weekly_base * (wn * 5),
+             np.minimum(weekly_base * wn, holiday_cap),
+             np.maximum(0, weekly_raw - cap) * (wn * 5),
+             night * days_num * (wn * 5)]
+    hours = [np.where(ceil_on, ceil_div_arr(x, den) * den, x) for x in hours]
+    return (*hours, den)
+
+def _roster_hours_exact(df: pd.DataFrame, rules: RuleSet = DEFAULT_RULES):
+    """
+    정리된 명부 → (base, holiday, ot, night, den) int64 배열. 분모 0 행이 있으면 ValueError.
+    - 정수 연산이라 행 단위로 바로 벡터화 (근무 패턴별 스칼라 호출 없음)
+    - off_days 가 있는 행은 (근무 패턴, 귀속 월, 휴무 요일)별로 calendar_profile_exact 를 한 번씩 호출해 덮어씀
+    """
+    brk = df["break_min"].to_numpy(float)
+    if (brk != np.round(brk)).any():
+        raise ValueError("휴게시간은 분 단위 정수여야 합니다.")
+    brk = brk.astype(np.int64)
+    sh, sm = _hm(df["start"])
+    eh, em = _hm(df["end"])
+    ceil = _flag(df["ceil_on"])
+    ym, off = _calendar_keys(df)
+    cal = ym >= 0
+    dn, dd = _days_arr(df, rules, cal)
+    hours = monthly_hours_exact_arr(sh, sm, eh, em, brk, dn, dd, ceil, rules)
+
+    if cal.any():
+        keys = pd.MultiIndex.from_arrays([a[cal] for a in (sh, sm, eh, em, brk, ceil, ym, off)])
+        inverse, uniq = keys.factorize()
+        profiles = np.array([
+            calendar_profile_exact(time(int(a), int(b)), time(int(c), int(d)), int(k), int(m) // 12,
+                                   int(m) % 12 + 1, tuple(int(x) for x in o), bool(ceil_on), rules)
+            for a, b, c, d, k, ceil_on, m, o in uniq
+        ], dtype=np.int64).reshape(len(uniq), 5)[inverse]
+        hours = [np.asarray(h, dtype=np.int64).copy() for h in np.broadcast_arrays(*hours)]
+        for h, p in zip(hours, profiles.T):
+            h[cal] = p
+    base, holiday, ot, night, den = hours
+
+    bad = (base + holiday) <= 0
+    if bad.any():
+        rows = df.index[bad].tolist()[:10]
+        raise ValueError(f"분모 시간(기본근로+주휴)이 0인 행이 있습니다: {rows}")
+    return base, holiday, ot, night, den
+
+def calc_pay_exact_arr(gwage, base, holiday, ot, night, den, meal, car, is_5p,
+                       opt_basic, opt_holiday, opt_ot, opt_night, rules: RuleSet = DEFAULT_RULES) -> dict:
+    """
+    calc_pay_exact 배열판 → 항목별 int64 배열 dict.
+    연장·야간은 가산계수를 분자에 곱해(기본 5인 이상 3/2·1/2, 미만 2/2·0/2) 나눗셈 한 번으로.
+    """
+    er = exact_rules(rules)
+    base_pay = ceil_div_arr(gwage * base, den)
+    holi_pay = ceil_div_arr(gwage * holiday, den)
+    base_pay = np.where(opt_basic,   ceil_ones_arr(base_pay), base_pay)
+    holi_pay = np.where(opt_holiday, ceil_ones_arr(holi_pay), holi_pay)
+
+    denom = base + holiday
+    normal_wage = ceil_div_arr((base_pay + holi_pay + meal + car) * den, denom)
+
+    overtime_pay = ceil_div_arr(normal_wage * ot * np.where(is_5p, er.ot_num, er.ot_den), den * er.ot_den)
+    night_pay    = ceil_div_arr(normal_wage * night * np.where(is_5p, er.night_num, 0), den * er.night_den)
+    overtime_pay = np.where(opt_ot,    ceil_ones_arr(overtime_pay), overtime_pay)
+    night_pay    = np.where(opt_night, ceil_ones_arr(night_pay),    night_pay)
+
+    total = base_pay + holi_pay + overtime_pay + night_pay + meal + car
+    return {
+        "denom_hours": denom / den,
+        "normal_wage": normal_wage,
+        "base_pay": base_pay,
+        "holi_pay": holi_pay,
+        "overtime_pay": overtime_pay,
+        "night_pay": night_pay,
+        "total": total,
+    }
+
+def _check_int64(gwage, hours, meal, car, rules: RuleSet = DEFAULT_RULES):
+    """중간 곱(금액 × 시간 분자 × 가산계수 분자)이 int64 범위 안인지 부동소수로 어림해 확인."""
+    er = exact_rules(rules)
+    base, holiday, ot, night, den = (np.asarray(h, dtype=float) for h in hours)
+    g = np.asarray(gwage, dtype=float)
+    money = g * (base + holiday) / den + meal + car
+    nw = money * den / (base + holiday) + 1
+    peak = max(np.max(g * np.maximum(base, holiday), initial=0), np.max(money * den, initial=0),
+               np.max(nw * np.maximum(ot * max(er.ot_num, er.ot_den), night * er.night_num), initial=0))
+    if peak >= 2.0 ** 62:
+        raise ValueError("금액이 너무 커서 정수 계산 범위(int64)를 넘습니다.")
+
+def _attach_exact(df: pd.DataFrame, hours, pay: dict) -> pd.DataFrame:
+    base, holiday, ot, night, den = hours
+    df["monthly_base"], df["monthly_holiday"] = base / den, holiday / den
+    df["monthly_ot"], df["monthly_night"] = ot / den, night / den
+    for c, v in pay.items():
+        df[c] = v
+    return df
+
+def _calc_group_exact(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    df = prepare_roster(df, rules=rules)
+    hours = _roster_hours_exact(df, rules)
+    gwage, kw = df["gwage"].to_numpy(np.int64), _pay_kwargs(df)
+    _check_int64(gwage, hours, kw["meal"], kw["car"], rules)
+    pay = calc_pay_exact_arr(gwage, *hours, **kw, rules=rules)
+    return _attach_exact(df, hours, pay)
+
+def calc_roster_exact(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """calc_roster 정수판 (입력·출력 컬럼 동일, monthly_off 행은 정확한 분수로, off_days 행은 달력 기준, pay_month 별 규칙)."""
+    return by_rules(load_roster(roster), _calc_group_exact, rules)
+
+def _reverse_group_exact(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    df = prepare_roster(df, REVERSE_REQUIRED_COLUMNS, rules)
+    salary = df["salary"].to_numpy(np.int64)
+    kw = _pay_kwargs(df)
+    bad = (kw["meal"] + kw["car"]) > salary
+    if bad.any():
+        rows = df.index[bad].tolist()[:10]
+        raise ValueError(f"고정수당(식대+차량)이 월급여보다 큰 행이 있습니다: {rows}")
+
+    hours = _roster_hours_exact(df, rules)
+    base, holiday, _, _, den = hours
+
+    def totals(g):
+        return calc_pay_exact_arr(g, *hours, **kw, rules=rules)["total"]
+
+    def check(g):
+        _check_int64(g, hours, kw["meal"], kw["car"], rules)
+
+    hi = salary * den // (base + holiday) + 2
+    check(hi * 2)
+    lo = search_wage_arr(salary, hi, totals, on_grow=check)
+    df["gwage"] = lo
+    return _attach_exact(df, hours, calc_pay_exact_arr(lo, *hours, **kw, rules=rules))
+
+def reverse_roster_exact(roster, rules: RuleTable | None = None) -> pd.DataFrame:
+    """reverse_roster 정수판 (batch.search_wage_arr 에 정수 금액 함수로 행별 동시 탐색, pay_month 별 규칙)."""
+    return by_rules(load_roster(roster), _reverse_group_exact, rules)
+
+
+# =========================
+# 🔬 차이 검사 (부동소수 vs 정수)
+# =========================
+def diff_roster(roster, reverse: bool = False, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [부동소수 / 정수 모드 비교]
+    - 같은 명부를 batch.calc_roster(reverse_roster) 와 calc_roster_exact(reverse_roster_exact) 로 계산
+    - rules: 양쪽에 같은 규칙표 (없으면 rules.RULES)
+    - 반환: 금액 컬럼이 하나라도 다른 행 (입력 컬럼 + <항목>_float / <항목>_exact / 차이 항목 목록)
+    """
+    df = load_roster(roster)
+    f = (reverse_roster if reverse else calc_roster)(df, rules)
+    e = (reverse_roster_exact if reverse else calc_roster_exact)(df, rules)
+    cols = (["gwage"] if reverse else []) + MONEY_COLUMNS
+    neq = f[cols].to_numpy() != e[cols].to_numpy()
+    rows = neq.any(axis=1)
+    out = df.loc[rows].copy()
+    for c in cols:
+        out[f"{c}_float"] = f.loc[rows, c]
+        out[f"{c}_exact"] = e.loc[rows, c]
+    out["differs"] = [", ".join(c for c, d in zip(cols, r) if d) for r in neq[rows]]
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m exact", description="부동소수 / 정수 계산 차이 검사")
+    parser.add_argument("roster", help="명부 CSV / Parquet")
+    parser.add_argument("--reverse", action="store_true", help="시급 역산 비교 (salary 컬럼)")
+    parser.add_argument("--output", help="차이 행 CSV")
+    args = parser.parse_args(argv)
+    out = diff_roster(args.roster, args.reverse)
+    print(f"차이 {len(out)}행")
+    if args.output:
+        out.to_csv(args.output, index=False)
+    elif len(out):
+        print(out.head(50).to_string())
+    if len(out):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+연차 원장 (직원별 부여·세그먼트 저장, WSH 변경분만 재계산)
+
+    python -m ledger init   employees.csv --changes changes.csv --db accrual_ledger.sqlite
+    python -m ledger change --db accrual_ledger.sqlite --employee 17 --eff 2025-03-01 --wsh 2.4
+    python -m ledger apply  new_changes.csv --db accrual_ledger.sqlite --output delta.csv
+
+- init: accrual_workforce 와 같은 계산으로 전 직원 원장 생성 (SQLite, 직원·날짜 키로 행 단위 갱신)
+- change / apply: 새 (효력일, WSH) 가 들어오면 영향 구간만 다시 계산하고 변경분(delta) 반환
+    영향 구간 = [효력일, 다음 효력일 - 1일]  (그 뒤는 다음 변경이 덮어씀)
+    1년 미만: 참조 구간이 영향 구간과 겹치는 부여 행만 다시 계산 (부여일 자체는 WSH 와 무관)
+    1년 이상: 영향 구간과 겹치는 세그먼트만 지우고 그 범위를 다시 분할·배분
+    재계산에 쓰는 WSH 는 해당 범위의 변경점만 조회 → 변경 이력 길이와 무관하게 O(영향 구간)
+- 결과는 변경표 전체로 accrual_workforce 를 다시 돌린 것과 같음
+"""
+import argparse
+import json
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+
+from accrual import (
+    WshTimeline, _changes_by_employee, _to_dates, award_row, days_between_inclusive,
+    employee_rows, segment_row,
+)
+
+DEFAULT_DB = "accrual_ledger.sqlite"
+AWARD_COLUMNS = ["award_date", "ref_start", "ref_end", "ref_window", "month_days",
+                 "avg_wsh", "accrual_days", "accrual_hours", "splits"]
+SEGMENT_COLUMNS = ["start", "end", "seg_days", "seg_ratio", "alloc_days", "wsh", "alloc_hours"]
+DELTA_COLUMNS = ["employee_id", "kind", "start", "end", "wsh_before", "wsh_after",
+                 "hours_before", "hours_after", "delta_hours"]
+_DATE_COLUMNS = ("award_date", "ref_start", "ref_end", "start", "end")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id PRIMARY KEY, join_dt TEXT, default_wsh REAL, end_limit TEXT,
+    target_anniv TEXT, prev_anniv TEXT, service_years INTEGER, n_days INTEGER);
+CREATE TABLE IF NOT EXISTS changes (
+    employee_id, eff_date TEXT, wsh REAL, PRIMARY KEY (employee_id, eff_date));
+CREATE TABLE IF NOT EXISTS awards (
+    employee_id, award_date TEXT, ref_start TEXT, ref_end TEXT, ref_window TEXT, month_days INTEGER,
+    avg_wsh REAL, accrual_days REAL, accrual_hours REAL, splits TEXT, PRIMARY KEY (employee_id, award_date));
+CREATE TABLE IF NOT EXISTS segments (
+    employee_id, seg_start TEXT, seg_end TEXT, seg_days INTEGER, seg_ratio REAL, alloc_days REAL,
+    wsh REAL, alloc_hours REAL, PRIMARY KEY (employee_id, seg_start));
+"""
+
+
+def _iso(d: date | None) -> str | None:
+    return None if d is None else d.isoformat()
+
+def _date(s: str | None) -> date | None:
+    return None if s is None else date.fromisoformat(s)
+
+def _py(v):
+    """numpy 스칼라 → 파이썬 값 (SQLite 바인딩용)."""
+    return v.item() if hasattr(v, "item") else v
+
+
+class AccrualLedger:
+    """
+    [연차 원장]
+    - employees: 직원별 입력 (입사일, 기본 WSH, 1년 미만 종료일, 정산 기념일) + 연차년도 정보
+    - changes:   (직원, 효력일) 키의 WSH 변경 이력
+    - awards:    1년 미만 부여 행 (accrual_under_1y_monthly 행과 같은 값)
+    - segments:  1년 이상 세그먼트 행 (accrual_over_1y 행과 같은 값)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------------------
+    # 전체 생성
+    # ---------------------------
+    def init(self, employees: pd.DataFrame, changes: pd.DataFrame | None = None) -> int:
+        """
+        [원장 생성] 전달한 직원의 기존 원장을 지우고 employee_rows 로 전체 계산해 저장.
+        - 입력 형식은 accrual_workforce 와 같음. 반환: 직원 수
+        """
+        by_emp = _changes_by_employee(changes)
+        n = len(employees)
+        emp_ids = [_py(v) for v in employees["employee_id"].tolist()]
+        joins = _to_dates(employees["join_dt"])
+        default_wshs = employees["default_wsh"].astype(float).tolist()
+        end_limits = _to_dates(employees["end_limit"]) if "end_limit" in employees else [None] * n
+        annivs = _to_dates(employees["target_anniv"]) if "target_anniv" in employees else [None] * n
+
+        with self.conn:
+            for emp, join_dt, dw, end_limit, target in zip(emp_ids, joins, default_wshs, end_limits, annivs):
+                for table in ("employees", "changes", "awards", "segments"):
+                    self.conn.execute(f"DELETE FROM {table} WHERE employee_id = ?", (emp,))
+                emp_changes = by_emp.get(emp, [])
+                awards, seg_key, segs = employee_rows(join_dt, dw, end_limit, target, emp_changes)
+                service_years, N, prev_anniv, _ = seg_key or (None, None, None, None)
+                self.conn.execute("INSERT INTO employees VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (emp, _iso(join_dt), dw, _iso(end_limit), _iso(target), _iso(prev_anniv),
+                                   service_years, N))
+                self.conn.executemany("INSERT OR REPLACE INTO changes VALUES (?, ?, ?)",
+                                      [(emp, _iso(d), float(w)) for d, w in emp_changes])
+                self._insert_awards(emp, awards)
+                self._insert_segments(emp, segs)
+        return n
+
+    def _insert_awards(self, emp, rows: list[dict]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO awards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(emp, *[_iso(r[c]) if c in _DATE_COLUMNS else r[c] for c in AWARD_COLUMNS]) for r in rows])
+
+    def _insert_segments(self, emp, rows: list[dict]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(emp, *[_iso(r[c]) if c in _DATE_COLUMNS else r[c] for c in SEGMENT_COLUMNS]) for r in rows])
+
+    # ---------------------------
+    # 증분 갱신
+    # ---------------------------
+    def _segments(self, emp, default_wsh: float, start: date, end: date) -> list[tuple[date, date, float]]:
+        """
+        [start, end] 의 WSH 세그먼트 (해당 범위의 변경점만 조회)
+        - start 시점 WSH = start 이전 마지막 변경 (없으면 기본 WSH), 이후 (start, end] 안의 변경점
+        """
+        row = self.conn.execute(
+            "SELECT wsh FROM changes WHERE employee_id = ? AND eff_date <= ? ORDER BY eff_date DESC LIMIT 1",
+            (emp, _iso(start))).fetchone()
+        inside = self.conn.execute(
+            "SELECT eff_date, wsh FROM changes WHERE employee_id = ? AND eff_date > ? AND eff_date <= ? "
+            "ORDER BY eff_date", (emp, _iso(start), _iso(end))).fetchall()
+        points = [(start, row[0] if row else default_wsh)] + [(_date(d), w) for d, w in inside]
+        return WshTimeline(points).segments(start, end)
+
+    def _apply(self, emp, eff: date, wsh: float) -> list[tuple]:
+        """변경 1건 반영 (커밋 없음) → 변경분 행 목록."""
+        meta = self.conn.execute(
+            "SELECT default_wsh, prev_anniv, target_anniv, n_days FROM employees WHERE employee_id = ?",
+            (emp,)).fetchone()
+        if meta is None:
+            raise ValueError(f"원장에 없는 직원입니다: {emp}")
+        default_wsh, prev_anniv, target, N = meta
+        nxt = self.conn.execute("SELECT MIN(eff_date) FROM changes WHERE employee_id = ? AND eff_date > ?",
+                                (emp, _iso(eff))).fetchone()[0]
+        hi = _date(nxt) - timedelta(days=1) if nxt else date.max
+        self.conn.execute("INSERT OR REPLACE INTO changes VALUES (?, ?, ?)", (emp, _iso(eff), float(wsh)))
+
+        delta = []
+        # 1년 미만: 참조 구간이 영향 구간과 겹치는 부여 행
+        cols = ", ".join(AWARD_COLUMNS)
+        for old in self.conn.execute(
+                f"SELECT {cols} FROM awards WHERE employee_id = ? AND ref_end >= ? AND ref_start <= ?",
+                (emp, _iso(eff), _iso(hi))).fetchall():
+            old = dict(zip(AWARD_COLUMNS, old))
+            ref_start, ref_end = _date(old["ref_start"]), _date(old["ref_end"])
+            new = award_row(_date(old["award_date"]), ref_start, ref_end,
+                            self._segments(emp, default_wsh, ref_start, ref_end))
+            self._insert_awards(emp, [new])
+            if new["accrual_hours"] != old["accrual_hours"] or new["splits"] != old["splits"]:
+                delta.append((emp, "award", ref_start, ref_end, old["avg_wsh"], new["avg_wsh"],
+                              old["accrual_hours"], new["accrual_hours"]))
+
+        # 1년 이상: 영향 구간과 겹치는 세그먼트를 지우고 그 범위만 다시 분할
+        if target is not None:
+            olds = self.conn.execute(
+                "SELECT seg_start, seg_end, wsh, alloc_hours FROM segments "
+                "WHERE employee_id = ? AND seg_end >= ? AND seg_start <= ? ORDER BY seg_start",
+                (emp, _iso(eff), _iso(hi))).fetchall()
+            if olds:
+                lo, up = _date(olds[0][0]), _date(olds[-1][1])
+                total_days = days_between_inclusive(_date(prev_anniv), _date(target) - timedelta(days=1))
+                news = [segment_row(s, e, w, N, total_days)
+                        for s, e, w in self._segments(emp, default_wsh, lo, up)]
+                self.conn.execute("DELETE FROM segments WHERE employee_id = ? AND seg_start >= ? AND seg_start <= ?",
+                                  (emp, _iso(lo), _iso(up)))
+                self._insert_segments(emp, news)
+                before = {(_date(s), _date(e)): (w, h) for s, e, w, h in olds}
+                after = {(r["start"], r["end"]): (r["wsh"], r["alloc_hours"]) for r in news}
+                for key in sorted(before.keys() | after.keys()):
+                    wb, hb = before.get(key, (None, 0.0))
+                    wa, ha = after.get(key, (None, 0.0))
+                    if (wb, hb) != (wa, ha):
+                        delta.append((emp, "segment", *key, wb, wa, hb, ha))
+        return delta
+
+    @staticmethod
+    def _delta_frame(rows: list[tuple]) -> pd.DataFrame:
+        out = pd.DataFrame(rows, columns=DELTA_COLUMNS[:-1])
+        out["delta_hours"] = out["hours_after"] - out["hours_before"]
+        return out
+
+    def add_change(self, employee_id, eff_date, wsh: float) -> pd.DataFrame:
+        """
+        [WSH 변경 1건 반영] 같은 효력일이 이미 있으면 덮어씀.
+        - 반환: 변경분 DataFrame (DELTA_COLUMNS). kind = award / segment,
+          세그먼트가 나뉘면 없어진 행(after=0)과 새 행(before=0)으로 표시
+        """
+        try:
+            rows = self._apply(_py(employee_id), pd.Timestamp(eff_date).date(), wsh)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return self._delta_frame(rows)
+
+    def apply_changes(self, changes: pd.DataFrame) -> pd.DataFrame:
+        """
+        [변경표 일괄 반영] (employee_id, eff_date, wsh) 행 순서대로 add_change, 커밋은 한 번.
+        - 반환: 변경분을 이어 붙인 DataFrame
+        """
+        effs = _to_dates(changes["eff_date"])
+        rows = []
+        try:
+            for emp, eff, w in zip(changes["employee_id"].tolist(), effs, changes["wsh"].tolist()):
+                rows.extend(self._apply(emp, eff, w))
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return self._delta_frame(rows)
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    def _frame(self, sql: str, columns: list[str], employee_id=None) -> pd.DataFrame:
+        where, args = ("WHERE employee_id = ?", (_py(employee_id),)) if employee_id is not None else ("", ())
+        rows = self.conn.execute(sql.format(where=where), args).fetchall()
+        df = pd.DataFrame(rows, columns=["employee_id", *columns])
+        for c in _DATE_COLUMNS:
+            if c in df.columns:
+                df[c] = [_date(v) for v in df[c]]
+        return df
+
+    def awards(self, employee_id=None) -> pd.DataFrame:
+        """1년 미만 부여 행 (employee_id + accrual_under_1y_monthly 컬럼)."""
+        return self._frame(f"SELECT employee_id, {', '.join(AWARD_COLUMNS)} FROM awards {{where}} "
+                           "ORDER BY employee_id, award_date", AWARD_COLUMNS, employee_id)
+
+    def segments(self, employee_id=None) -> pd.DataFrame:
+        """1년 이상 세그먼트 행 (employee_id + accrual_over_1y 컬럼)."""
+        cols = ", ".join(["seg_start", "seg_end", *SEGMENT_COLUMNS[2:]])
+        return self._frame(f"SELECT employee_id, {cols} FROM segments {{where}} ORDER BY employee_id, seg_start",
+                           SEGMENT_COLUMNS, employee_id)
+
+    def totals(self) -> pd.DataFrame:
+        """직원별 합계: 1년 미만 부여 일수·시간, 1년 이상 배분 시간."""
+        rows = self.conn.execute("""
+            SELECT e.employee_id,
+                   (SELECT COUNT(*) FROM awards a WHERE a.employee_id = e.employee_id),
+                   (SELECT COALESCE(SUM(accrual_hours), 0) FROM awards a WHERE a.employee_id = e.employee_id),
+                   e.n_days,
+                   (SELECT COALESCE(SUM(alloc_hours), 0) FROM segments s WHERE s.employee_id = e.employee_id)
+            FROM employees e ORDER BY e.employee_id""").fetchall()
+        return pd.DataFrame(rows, columns=["employee_id", "under_days", "under_hours", "over_days", "over_hours"])
+
+
+# =========================
+# 🖥️ CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ledger", description="연차 원장 (WSH 변경분만 재계산)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("init", help="직원 CSV + 변경표로 원장 생성")
+    p.add_argument("employees", help="employee_id, join_dt, default_wsh, end_limit, target_anniv")
+    p.add_argument("--changes", help="employee_id, eff_date, wsh")
+    p = sub.add_parser("change", help="변경 1건 반영")
+    p.add_argument("--employee", required=True)
+    p.add_argument("--eff", required=True, help="효력일 YYYY-MM-DD")
+    p.add_argument("--wsh", type=float, required=True)
+    p = sub.add_parser("apply", help="변경표 CSV 반영")
+    p.add_argument("changes")
+    p.add_argument("--output", help="변경분 CSV")
+    sub.add_parser("totals", help="직원별 합계")
+    for p in sub.choices.values():
+        p.add_argument("--db", default=DEFAULT_DB, help="원장 SQLite 파일")
+    args = parser.parse_args(argv)
+
+    ledger = AccrualLedger(args.db)
+    if args.cmd == "init":
+        changes = pd.read_csv(args.changes) if args.changes else None
+        print(json.dumps({"employees": ledger.init(pd.read_csv(args.employees), changes)}))
+    elif args.cmd == "change":
+        emp = int(args.employee) if args.employee.isdigit() else args.employee
+        delta = ledger.add_change(emp, args.eff, args.wsh)
+        print(delta.to_csv(index=False), end="")
+    elif args.cmd == "apply":
+        delta = ledger.apply_changes(pd.read_csv(args.changes))
+        if args.output:
+            delta.to_csv(args.output, index=False)
+        print(json.dumps({"changed_rows": len(delta), "delta_hours": float(delta["delta_hours"].sum())}))
+    else:
+        print(ledger.totals().to_csv(index=False), end="")
+    ledger.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+HTTP 계산 서비스 부하 발생기 (server.py 용)
+
+    python -m server --port 8080 &
+    python -m loadgen --port 8080 --endpoint pay --connections 64 --requests 20000
+
+- keep-alive 연결 여러 개를 열어 각 연결이 요청을 연속으로 보냄 (표준 라이브러리 asyncio)
+- 요청 본문은 시드 고정 난수 명부(출퇴근·휴게·근로일·옵션 조합)
+- 끝나면 처리량(req/s), 클라이언트 측 p50 / p99, 서버 /stats 를 JSON 으로 출력
+"""
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter
+
+from server import percentile
+
+
+def sample_bodies(endpoint: str, n: int, seed: int = 0) -> list[bytes]:
+    """엔드포인트별 요청 본문 n 개 (JSON bytes)."""
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(n):
+        if endpoint == "leave":
+            y = rng.randint(2018, 2024)
+            item = {"mode": rng.choice(["under", "over"]), "join_dt": f"{y}-{rng.randint(1, 12):02d}-15",
+                    "default_wsh": rng.choice([2.0, 3.0, 4.0, 8.0]),
+                    "changes": [[f"{y + 1}-{rng.randint(1, 12):02d}-01", rng.choice([2.4, 4.0, 6.0])]],
+                    "target_anniv": f"{y + 2}-06-15"}
+        else:
+            sh = rng.randint(6, 14)
+            item = {"start": f"{sh:02d}:{rng.choice([0, 30]):02d}", "end": f"{(sh + rng.randint(6, 13)) % 24:02d}:00",
+                    "break_min": rng.choice([30, 60]), "days_wk": rng.choice([3, 4, 5, 6]),
+                    "meal": rng.choice([0, 100_000, 200_000]), "car": rng.choice([0, 200_000]),
+                    "is_5p": rng.random() < 0.8, "opt_basic": rng.random() < 0.3}
+            if endpoint == "reverse":
+                item["salary"] = rng.randrange(2_500_000, 8_000_000, 10_000)
+            else:
+                item["gwage"] = rng.randrange(10_030, 20_000, 10)
+            if endpoint == "offday":
+                item["monthly_off"] = rng.choice([4, 6, 8, 8.5, 10])
+                del item["days_wk"]
+        bodies.append(json.dumps(item).encode("utf-8"))
+    return bodies
+
+
+def _request(method: str, host: str, path: str, body: bytes = b"") -> bytes:
+    return (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    status = int((await reader.readline()).split(b" ", 2)[1])
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.partition(b":")
+        if k.strip().lower() == b"content-length":
+            length = int(v)
+    return status, await reader.readexactly(length)
+
+async def _worker(host: str, port: int, path: str, bodies: list[bytes], counter: list,
+                  total: int, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            i = counter[0]
+            counter[0] += 1
+            t0 = perf_counter()
+            writer.write(_request("POST", host, path, bodies[i % len(bodies)]))
+            status, _ = await _read_response(reader)
+            latencies.append(perf_counter() - t0)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def fetch_json(host: str, port: int, path: str):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_request("GET", host, path))
+    _, body = await _read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+async def run_load(host: str, port: int, endpoint: str, connections: int, requests: int,
+                   seed: int = 0) -> dict:
+    """
+    [부하 실행]
+    - connections 개 연결이 요청을 나눠 총 requests 건 전송
+    - 반환: 처리량, 클라이언트 측 지연시간 p50 / p99, 서버 /stats
+    """
+    bodies = sample_bodies(endpoint, min(requests, 5_000), seed)
+    counter, latencies, errors = [0], [], []
+    t0 = perf_counter()
+    await asyncio.gather(*[_worker(host, port, f"/{endpoint}", bodies, counter, requests, latencies, errors)
+                           for _ in range(connections)])
+    elapsed = perf_counter() - t0
+    xs = sorted(latencies)
+    return {
+        "endpoint": endpoint, "requests": len(xs), "errors": len(errors),
+        "connections": connections, "seconds": elapsed, "rps": len(xs) / elapsed if elapsed else 0.0,
+        "client_p50_ms": percentile(xs, 50) * 1000, "client_p99_ms": percentile(xs, 99) * 1000,
+        "server": await fetch_json(host, port, "/stats"),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadgen", description="계산 서비스 부하 발생기")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--endpoint", choices=["pay", "reverse", "offday", "leave"], default="pay")
+    parser.add_argument("--connections", type=int, default=64, help="동시 연결 수")
+    parser.add_argument("--requests", type=int, default=20_000, help="총 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    result = asyncio.run(run_load(args.host, args.port, args.endpoint,
+                                  args.connections, args.requests, args.seed))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
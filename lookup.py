@@ -0,0 +1,257 @@
+"""
+시급 역산 사전 계산표 (메모리 맵)
+
+    python -m lookup build --out reverse_table --templates templates.csv --allowances 0 100000 200000 300000
+    python -m lookup check --table reverse_table --sample 2000
+
+- 키: (근무 패턴의 월 시간, 고정수당 합계(식대+차량), 사업장 규모·10원 올림 옵션, 월급)
+- 값: (기준시급, 통상시급, 총액, 기본급, 주휴수당, 연장수당, 야간수당)
+- 월급 격자(기본 2,000,000 ~ 10,000,000원, 10,000원 간격)에 있으면 배열 인덱스로 바로 조회,
+  격자 밖 월급이나 표에 없는 패턴은 solve_base_wage 로 계산
+- 저장: <디렉터리>/table.npy (int32, np.load mmap_mode="r") + meta.json → 시작 시 파일만 매핑
+- 계산식은 고정수당을 식대+차량 합계로만 쓰므로 키도 합계 하나 (식대 10만+차량 20만 = 식대 30만)
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import time
+
+import numpy as np
+
+from payroll import MonthlyHours, PayResult, shift_profile, solve_base_wage
+from rules import DEFAULT_RULES, RuleSet
+
+SALARY_MIN = 2_000_000
+SALARY_MAX = 10_000_000
+SALARY_STEP = 10_000
+
+TABLE_FILE = "table.npy"
+META_FILE = "meta.json"
+VALUE_COLUMNS = ["gwage", "normal_wage", "total", "base_pay", "holi_pay", "overtime_pay", "night_pay"]
+N_FLAGS = 32  # is_5p × opt_basic × opt_holiday × opt_ot × opt_night
+
+# 자주 쓰는 근무 패턴 (start, end, break_min, days_wk, ceil_on)
+DEFAULT_TEMPLATES = [
+    ("09:00", "18:00", 60, 5, True),
+    ("10:00", "19:00", 60, 5, True),
+    ("10:00", "22:00", 60, 5, True),
+    ("10:00", "23:00", 60, 5, True),
+    ("09:00", "18:00", 60, 6, True),
+    ("22:00", "07:00", 60, 5, True),
+]
+DEFAULT_ALLOWANCES = [0, 100_000, 200_000, 300_000]
+
+
+def flag_index(is_5p: bool, opt_basic: bool, opt_holiday: bool, opt_ot: bool, opt_night: bool) -> int:
+    """옵션 5개 → 0~31."""
+    return (is_5p << 4) | (opt_basic << 3) | (opt_holiday << 2) | (opt_ot << 1) | int(opt_night)
+
+def _constants() -> dict:
+    """
+    표를 만든 시점의 계산 상수 (바뀌면 표를 다시 만들어야 함)
+    - store.constants() 와 같은 키 (규칙표 RULES.records() 포함) + 표 계산에 쓴 DEFAULT_RULES 전체 (가산계수 포함)
+    """
+    from store import constants
+
+    return {**constants(), "DEFAULT_RULES": DEFAULT_RULES._asdict()}
+
+def _hm(text: str) -> time:
+    h, m = text.split(":")
+    return time(int(h), int(m))
+
+
+# =========================
+# 🏗️ 생성
+# =========================
+def _build_block(hours: tuple, allowance: int, salaries: np.ndarray) -> np.ndarray:
+    """(월 시간, 고정수당) 한 블록 → (N_FLAGS, 월급 수, 7) int32. 옵션 × 월급 전체를 배열 역산 한 번으로."""
+    from batch import solve_base_wage_arr
+
+    n = len(salaries)
+    flags = np.repeat(np.arange(N_FLAGS), n)
+    salary = np.tile(salaries, N_FLAGS)
+    size = len(salary)
+    base, holiday, ot, night = (np.full(size, h, dtype=float) for h in hours)
+    bw, pay = solve_base_wage_arr(
+        salary, base, holiday, ot, night,
+        meal=np.full(size, allowance, dtype=np.int64), car=np.zeros(size, dtype=np.int64),
+        is_5p=(flags >> 4 & 1).astype(bool), opt_basic=(flags >> 3 & 1).astype(bool),
+        opt_holiday=(flags >> 2 & 1).astype(bool), opt_ot=(flags >> 1 & 1).astype(bool),
+        opt_night=(flags & 1).astype(bool),
+    )
+    cols = [bw] + [pay[c] for c in VALUE_COLUMNS[1:]]
+    return np.stack(cols, axis=-1).astype(np.int32).reshape(N_FLAGS, n, len(VALUE_COLUMNS))
+
+def build_table(out_dir: str, templates=DEFAULT_TEMPLATES, allowances=DEFAULT_ALLOWANCES,
+                salary_min: int = SALARY_MIN, salary_max: int = SALARY_MAX, salary_step: int = SALARY_STEP,
+                workers: int | None = None) -> dict:
+    """
+    [계산표 생성]
+    - templates: (start "HH:MM", end "HH:MM", break_min, days_wk, ceil_on) 목록
+      월 시간이 같은 패턴은 한 행으로 합침
+    - (월 시간, 고정수당) 블록을 워커 프로세스에 나눠 계산하고, 끝나는 대로 table.npy 메모리 맵에 기록
+    - 반환: meta dict (meta.json 내용)
+    """
+    profiles = []
+    for start, end, break_min, days_wk, ceil_on in templates:
+        hrs = tuple(shift_profile(_hm(start), _hm(end), float(break_min), float(days_wk), bool(ceil_on)))
+        if sum(hrs[:2]) <= 0:
+            raise ValueError(f"분모 시간(기본근로+주휴)이 0인 근무 패턴입니다: {start}~{end}")
+        if hrs not in profiles:
+            profiles.append(hrs)
+    allowances = sorted({int(a) for a in allowances})
+    salaries = np.arange(salary_min, salary_max + 1, salary_step, dtype=np.int64)
+
+    os.makedirs(out_dir, exist_ok=True)
+    shape = (len(profiles), len(allowances), N_FLAGS, len(salaries), len(VALUE_COLUMNS))
+    table = np.lib.format.open_memmap(os.path.join(out_dir, TABLE_FILE), mode="w+", dtype=np.int32, shape=shape)
+
+    jobs = [(i, j) for i in range(len(profiles)) for j in range(len(allowances))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for i, j in jobs:
+            table[i, j] = _build_block(profiles[i], allowances[j], salaries)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {pool.submit(_build_block, profiles[i], allowances[j], salaries): (i, j) for i, j in jobs}
+            for fut in as_completed(futures):
+                i, j = futures[fut]
+                table[i, j] = fut.result()
+    table.flush()
+    del table
+
+    meta = {"profiles": [list(p) for p in profiles], "allowances": allowances,
+            "salary_min": salary_min, "salary_max": int(salaries[-1]), "salary_step": salary_step,
+            "columns": VALUE_COLUMNS, "constants": _constants()}
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+# =========================
+# 🔎 조회
+# =========================
+class ReverseTable:
+    """
+    [역산 계산표]
+    - load() 는 meta.json 을 읽고 table.npy 를 메모리 맵으로 열기만 함 (데이터는 조회 시 페이지 단위로 읽힘)
+    - solve() 는 solve_base_wage 와 같은 (기준시급, PayResult) 반환
+    """
+
+    def __init__(self, table: np.ndarray, meta: dict):
+        self.table = table
+        self.meta = meta
+        self.profile_index = {tuple(p): i for i, p in enumerate(meta["profiles"])}
+        self.allowance_index = {a: i for i, a in enumerate(meta["allowances"])}
+        self.salary_min = meta["salary_min"]
+        self.salary_max = meta["salary_max"]
+        self.salary_step = meta["salary_step"]
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str) -> "ReverseTable":
+        """계산표 열기. 계산 상수가 바뀐 뒤 만든 표가 아니면 ValueError."""
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["constants"] != _constants():
+            raise ValueError(f"계산 상수가 바뀌었습니다. 계산표를 다시 생성하세요: {path}")
+        return cls(np.load(os.path.join(path, TABLE_FILE), mmap_mode="r"), meta)
+
+    def lookup(self, salary: int, hours: MonthlyHours, meal: int, car: int, is_5p: bool,
+               opt_basic: bool = False, opt_holiday: bool = False,
+               opt_ot: bool = False, opt_night: bool = False) -> tuple[int, PayResult] | None:
+        """표에 있으면 (기준시급, PayResult), 없으면 None."""
+        i = self.profile_index.get(tuple(hours))
+        j = self.allowance_index.get(meal + car)
+        off = salary - self.salary_min
+        if (i is None or j is None or off < 0 or salary > self.salary_max
+                or off % self.salary_step):
+            return None
+        k = flag_index(is_5p, opt_basic, opt_holiday, opt_ot, opt_night)
+        row = self.table[i, j, k, off // self.salary_step].tolist()
+        return row[0], PayResult(*row[1:])
+
+    def solve(self, salary: int, hours: MonthlyHours, meal: int, car: int, is_5p: bool,
+              opt_basic: bool = False, opt_holiday: bool = False,
+              opt_ot: bool = False, opt_night: bool = False,
+              rules: RuleSet = DEFAULT_RULES) -> tuple[int, PayResult]:
+        """solve_base_wage 대체: 표 조회, 없으면 직접 계산. 표는 기본 규칙 전용 (다른 규칙은 직접 계산)."""
+        args = (salary, hours, meal, car, is_5p, opt_basic, opt_holiday, opt_ot, opt_night)
+        if rules != DEFAULT_RULES:
+            self.misses += 1
+            return solve_base_wage(*args, rules)
+        hit = self.lookup(*args)
+        if hit is not None:
+            self.hits += 1
+            return hit
+        self.misses += 1
+        return solve_base_wage(*args)
+
+
+def check_table(table: ReverseTable, sample: int = 1_000, seed: int = 0) -> list[dict]:
+    """표에서 무작위 sample 칸을 골라 solve_base_wage 와 비교 → 불일치 목록."""
+    rng = np.random.default_rng(seed)
+    meta = table.meta
+    n_sal = table.table.shape[3]
+    bad = []
+    for _ in range(sample):
+        i = int(rng.integers(len(meta["profiles"])))
+        j = int(rng.integers(len(meta["allowances"])))
+        k = int(rng.integers(N_FLAGS))
+        salary = meta["salary_min"] + int(rng.integers(n_sal)) * meta["salary_step"]
+        hours = MonthlyHours(*meta["profiles"][i])
+        opts = dict(is_5p=bool(k >> 4 & 1), opt_basic=bool(k >> 3 & 1), opt_holiday=bool(k >> 2 & 1),
+                    opt_ot=bool(k >> 1 & 1), opt_night=bool(k & 1))
+        expected = solve_base_wage(salary, hours, meta["allowances"][j], 0, **opts)
+        got = table.lookup(salary, hours, meta["allowances"][j], 0, **opts)
+        if got != expected:
+            bad.append({"hours": hours, "allowance": meta["allowances"][j], "salary": salary, **opts,
+                        "expected": expected, "table": got})
+    return bad
+
+
+# =========================
+# 🧭 실행
+# =========================
+def _read_templates(path: str) -> list[tuple]:
+    """CSV(start, end, break_min, days_wk, ceil_on) → 패턴 목록."""
+    import pandas as pd
+    from batch import _flag, prepare_roster
+
+    df = prepare_roster(pd.read_csv(path), required=("start", "end"))
+    ceil = _flag(df["ceil_on"])
+    return [(str(r.start), str(r.end), float(r.break_min), float(r.days_wk), bool(c))
+            for r, c in zip(df.itertuples(index=False), ceil)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lookup", description="시급 역산 사전 계산표")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("build", help="계산표 생성")
+    p.add_argument("--out", default="reverse_table", help="출력 디렉터리")
+    p.add_argument("--templates", help="근무 패턴 CSV (start, end, break_min, days_wk, ceil_on)")
+    p.add_argument("--allowances", nargs="*", type=int, default=DEFAULT_ALLOWANCES, help="고정수당 합계 목록")
+    p.add_argument("--salary-min", type=int, default=SALARY_MIN)
+    p.add_argument("--salary-max", type=int, default=SALARY_MAX)
+    p.add_argument("--salary-step", type=int, default=SALARY_STEP)
+    p.add_argument("--workers", type=int, default=None)
+    p = sub.add_parser("check", help="무작위 칸을 solve_base_wage 와 비교")
+    p.add_argument("--table", default="reverse_table")
+    p.add_argument("--sample", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        templates = _read_templates(args.templates) if args.templates else DEFAULT_TEMPLATES
+        meta = build_table(args.out, templates, args.allowances, args.salary_min, args.salary_max,
+                           args.salary_step, args.workers)
+        print(json.dumps({"profiles": len(meta["profiles"]), "allowances": len(meta["allowances"]),
+                          "salaries": (meta["salary_max"] - meta["salary_min"]) // meta["salary_step"] + 1}))
+    else:
+        bad = check_table(ReverseTable.load(args.table), args.sample)
+        print(json.dumps({"checked": args.sample, "mismatches": len(bad)}))
+        if bad:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+계산 단계 계측 (선택 사항)
+- 단계별 호출 수 / 누적·최대 소요시간, 시급 역산 탐색 반복 수를 집계 (Collector)
+- 꺼져 있으면(기본) 계산 코드는 ENABLED 한 번 확인하고 지나감 → 오버헤드 거의 없음
+- 켜기
+    프로세스 전역: metrics.enable() / 환경변수 PAYROLL_METRICS=1 → 전역 집계
+    범위 한정: with metrics.collect(collector): ... → 그 블록(같은 스레드 / 컨텍스트)의 계산만 collector 에
+      (contextvars 로 묶음 → Streamlit 세션 스레드가 섞여도 서로의 집계 · 켜짐 상태를 건드리지 않음)
+- 내보내기: snapshot() → dict, to_prometheus() → Prometheus 텍스트, app.py 사이드바 디버그 패널
+
+단계 이름
+- hours            monthly_hours (근무 패턴 → 월 시간)
+- ceil_if          월 시간 올림
+- search           solve_base_wage (simulate_total 탐색 전체)
+- search_arr       solve_base_wage_arr (명부 일괄 역산)
+- accrual_segments WshTimeline.segments (WSH 구간 분할)
+"""
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 탐색 반복 수 히스토그램 구간 (Prometheus le 버킷)
+ITERATION_BUCKETS = (2, 4, 8, 16, 24, 32, 48, 64)
+
+
+def _empty_search() -> dict:
+    return {"solves": 0, "iterations": 0, "gallop": 0, "bisect": 0, "max_iterations": 0,
+            "init_distance_total": 0, "init_distance_max": 0,
+            "buckets": [0] * (len(ITERATION_BUCKETS) + 1)}
+
+
+class Collector:
+    """집계 하나 (단계별 기록 + 역산 탐색 기록). 여러 스레드에서 기록해도 안전."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: dict[str, list] = {}  # 단계 → [호출 수, 누적 초, 최대 초, 처리 행 수]
+        self._search = _empty_search()
+
+    def reset(self):
+        """집계 초기화."""
+        with self._lock:
+            self._stages.clear()
+            self._search = _empty_search()
+
+    def observe(self, stage: str, seconds: float, rows: int = 1):
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None:
+                self._stages[stage] = [1, seconds, seconds, rows]
+            else:
+                s[0] += 1
+                s[1] += seconds
+                s[3] += rows
+                if seconds > s[2]:
+                    s[2] = seconds
+
+    def record_search(self, gallop: int, bisect: int, init_distance: int):
+        n = gallop + bisect
+        with self._lock:
+            s = self._search
+            s["solves"] += 1
+            s["iterations"] += n
+            s["gallop"] += gallop
+            s["bisect"] += bisect
+            s["max_iterations"] = max(s["max_iterations"], n)
+            s["init_distance_total"] += init_distance
+            s["init_distance_max"] = max(s["init_distance_max"], init_distance)
+            for i, le in enumerate(ITERATION_BUCKETS):
+                if n <= le:
+                    s["buckets"][i] += 1
+                    break
+            else:
+                s["buckets"][-1] += 1
+
+    def copy(self) -> tuple[dict, dict]:
+        """(단계 기록, 탐색 기록) 복사본."""
+        with self._lock:
+            return ({k: list(v) for k, v in self._stages.items()},
+                    {**self._search, "buckets": list(self._search["buckets"])})
+
+
+_GLOBAL = Collector()                                   # enable() / PAYROLL_METRICS 전역 집계
+_current: ContextVar[Collector | None] = ContextVar("metrics_collector", default=None)
+_state_lock = threading.Lock()
+_global_on = os.environ.get("PAYROLL_METRICS", "").lower() in ("1", "true", "yes")
+_scopes = 0                                             # 열려 있는 collect() 블록 수 (전 스레드)
+
+# 계산 코드가 확인하는 빠른 경로 플래그: 전역 집계가 켜져 있거나 어딘가에 collect() 블록이 열려 있음
+# (기록 대상은 observe / record_search 가 현재 컨텍스트에서 다시 고름)
+ENABLED = _global_on
+
+
+def _refresh():
+    global ENABLED
+    ENABLED = _global_on or _scopes > 0
+
+def _target() -> Collector | None:
+    """지금 컨텍스트의 기록 대상: collect() 블록의 Collector, 없으면 전역(켜져 있을 때만)."""
+    c = _current.get()
+    if c is not None:
+        return c
+    return _GLOBAL if _global_on else None
+
+def enable():
+    global _global_on
+    with _state_lock:
+        _global_on = True
+        _refresh()
+
+def disable():
+    global _global_on
+    with _state_lock:
+        _global_on = False
+        _refresh()
+
+def reset(collector: Collector | None = None):
+    """집계 초기화 (collector 없으면 전역)."""
+    (collector or _GLOBAL).reset()
+
+@contextmanager
+def collect(collector: Collector | None = None):
+    """
+    [범위 한정 계측] 블록 안(같은 컨텍스트)의 계산만 collector 에 기록 → yield collector
+    - collector 없으면 새 Collector, 있으면 이어서 누적 (예: 세션별 Collector 를 rerun 마다 넘김)
+    - 다른 스레드 · 전역 집계에는 기록하지 않음
+    """
+    global _scopes
+    collector = collector if collector is not None else Collector()
+    with _state_lock:
+        _scopes += 1
+        _refresh()
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+        with _state_lock:
+            _scopes -= 1
+            _refresh()
+
+
+# =========================
+# 📝 기록 (호출 측에서 ENABLED 확인 후 호출)
+# =========================
+def observe(stage: str, seconds: float, rows: int = 1):
+    """단계 1회 실행 기록."""
+    c = _target()
+    if c is not None:
+        c.observe(stage, seconds, rows)
+
+def record_search(gallop: int, bisect: int, init_distance: int):
+    """
+    역산 1건의 탐색 기록.
+    - gallop: 구간 잡기(지수 탐색) 평가 수, bisect: 이분 탐색 평가 수 (초기 추정 1회는 gallop 에 포함)
+    - init_distance: |결과 기준시급 - 초기 추정치| (원)
+    """
+    c = _target()
+    if c is not None:
+        c.record_search(gallop, bisect, init_distance)
+
+
+# =========================
+# 📤 내보내기
+# =========================
+def snapshot(collector: Collector | None = None) -> dict:
+    """집계(collector 없으면 전역) → dict (JSON 직렬화 가능)."""
+    c = collector or _GLOBAL
+    raw_stages, s = c.copy()
+    stages = {
+        name: {"calls": n, "rows": rows, "seconds": sec, "max_seconds": mx,
+               "mean_us": sec / n * 1e6 if n else 0.0}
+        for name, (n, sec, mx, rows) in sorted(raw_stages.items())
+    }
+    solves = s["solves"]
+    search = {
+        "solves": solves, "iterations": s["iterations"], "gallop": s["gallop"], "bisect": s["bisect"],
+        "mean_iterations": s["iterations"] / solves if solves else 0.0,
+        "max_iterations": s["max_iterations"],
+        "mean_init_distance": s["init_distance_total"] / solves if solves else 0.0,
+        "max_init_distance": s["init_distance_max"],
+        "iterations_hist": {**{f"<={le}": n for le, n in zip(ITERATION_BUCKETS, s["buckets"])},
+                            f">{ITERATION_BUCKETS[-1]}": s["buckets"][-1]},
+    }
+    enabled = _global_on if collector is None else _current.get() is collector
+    return {"enabled": enabled, "stages": stages, "search": search}
+
+def to_prometheus(prefix: str = "payroll", collector: Collector | None = None) -> str:
+    """집계(collector 없으면 전역) → Prometheus text exposition format."""
+    snap = snapshot(collector)
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{prefix}_{name}{labels} {value}")
+
+    stages = snap["stages"]
+    metric("stage_calls_total", "counter", "Calls per calculation stage.",
+           [(f'{{stage="{k}"}}', v["calls"]) for k, v in stages.items()])
+    metric("stage_rows_total", "counter", "Rows processed per calculation stage.",
+           [(f'{{stage="{k}"}}', v["rows"]) for k, v in stages.items()])
+    metric("stage_seconds_total", "counter", "Wall time per calculation stage.",
+           [(f'{{stage="{k}"}}', repr(v["seconds"])) for k, v in stages.items()])
+    metric("stage_max_seconds", "gauge", "Slowest single call per calculation stage.",
+           [(f'{{stage="{k}"}}', repr(v["max_seconds"])) for k, v in stages.items()])
+
+    s = snap["search"]
+    buckets = [s["iterations_hist"][f"<={le}"] for le in ITERATION_BUCKETS]
+    cum, samples = 0, []
+    for le, n in zip(ITERATION_BUCKETS, buckets):
+        cum += n
+        samples.append((f'_bucket{{le="{le}"}}', cum))
+    samples += [('_bucket{le="+Inf"}', s["solves"]), ("_sum", s["iterations"]), ("_count", s["solves"])]
+    metric("search_iterations", "histogram", "simulate_total evaluations per reverse wage solve.", samples)
+    metric("search_phase_iterations_total", "counter", "simulate_total evaluations by search phase.",
+           [('{phase="gallop"}', s["gallop"]), ('{phase="bisect"}', s["bisect"])])
+    metric("search_init_distance_max", "gauge", "Largest distance (KRW) between initial guess and solution.",
+           [("", s["max_init_distance"])])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,181 @@
+"""
+달력 기준 월휴무 (귀속 월의 실제 요일로 월 시간 계산)
+
+    python -m monthcal --month 2026-03 --off 토일 --start 10:00 --end 23:00   # 주별 내역
+
+- 기존 월휴무: 월 휴무일 ÷ 4.345 → 주 근로일 → 주 시간 × 4.345 (28일 달 / 31일 달, 요일 배치 무시)
+- 달력 기준: 귀속 월(연, 월) + 휴무 요일 패턴(예: 토·일)으로 그 달의 실제 근로일을 달력 주(월~일)별로 세고
+    주 40h 경계: 주 안에서 날짜순으로 누적해 상한을 넘는 날부터 연장 (월을 걸친 주는 앞 달 날짜까지 누적)
+    기본근로 · 연장 · 야간은 귀속 월 안의 날짜분만, 주휴는 주마다 (귀속 월 기본근로 ÷ 5)
+    월 주휴 상한 · 올림은 기존과 같음 (rules.py)
+- (연, 월, 휴무 요일) → 달력 주 목록은 month_weeks 로 한 번만 만들고 캐시,
+  근무 패턴까지 붙인 월 시간은 calendar_profile 캐시 → 일괄 계산은 (패턴 × 월 × 휴무 요일) 고유값만 계산
+- 명부: off_days 컬럼(휴무 요일, "토일" / "5,6" / "없음")이 있는 행은 pay_month(없으면 이번 달) 기준 달력 계산
+"""
+import argparse
+import json
+from calendar import monthrange
+from datetime import date, time, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+from accrual import eom
+from payroll import SHIFT_CACHE_SIZE, MonthlyHours, ceil_if, hours_between, night_hours_simple
+from rules import DEFAULT_RULES, RuleSet, month_index, rules_for
+
+WEEKDAY_NAMES = "월화수목금토일"  # date.weekday() 순서
+NO_OFF_DAYS = {"", "-", "없음", "none"}
+MONTH_CACHE_SIZE = 1024   # (연, 월, 휴무 요일) 달력 캐시 크기
+
+
+# =========================
+# 📅 휴무 요일 / 달력
+# =========================
+def parse_off_days(v) -> tuple[int, ...]:
+    """
+    [휴무 요일 패턴] → 정렬된 요일 번호 튜플 (0=월 ~ 6=일)
+    - "토일", "토,일", "5,6", [5, 6], "없음" / "-" (휴무 요일 없음)
+    """
+    if isinstance(v, str):
+        text = v.strip().lower()
+        if text in NO_OFF_DAYS:
+            return ()
+        days = []
+        for ch in text.replace(",", "").replace(" ", "").replace("/", ""):
+            if ch in WEEKDAY_NAMES:
+                days.append(WEEKDAY_NAMES.index(ch))
+            elif ch.isdigit() and int(ch) < 7:
+                days.append(int(ch))
+            else:
+                raise ValueError(f"휴무 요일을 해석할 수 없습니다: {v!r} (예: 토일, 5,6, 없음)")
+    else:
+        days = [int(d) for d in v]
+        if any(not 0 <= d < 7 for d in days):
+            raise ValueError(f"휴무 요일 번호는 0(월)~6(일)이어야 합니다: {v!r}")
+    if len(set(days)) == 7:
+        raise ValueError(f"모든 요일이 휴무입니다: {v!r}")
+    return tuple(sorted(set(days)))
+
+def off_days_label(off_days: tuple[int, ...]) -> str:
+    """요일 번호 튜플 → "토일" (없으면 "없음")."""
+    return "".join(WEEKDAY_NAMES[d] for d in off_days) or "없음"
+
+class WeekDays(NamedTuple):
+    """
+    달력 주 하나 (월~일)
+    - before: 귀속 월 이전 날짜의 근로일 수 (1일이 속한 주만), days: 귀속 월 안의 근로일 수
+    - 귀속 월 근로일은 주 안에서 항상 연속 (첫 주는 뒤쪽, 마지막 주는 앞쪽) → 두 수로 주 40h 경계 계산
+    """
+    start: date
+    end: date
+    before: int
+    days: int
+
+@lru_cache(maxsize=MONTH_CACHE_SIZE)
+def month_weeks(year: int, month: int, off_days: tuple[int, ...]) -> tuple[WeekDays, ...]:
+    """
+    [귀속 월 달력 주 목록] (연, 월, 휴무 요일) 키로 캐시
+    - 1일이 속한 주의 월요일 ~ 말일(eom)이 속한 주의 일요일
+    """
+    first = date(year, month, 1)
+    last = eom(first)
+    monday = first - timedelta(days=first.weekday())
+    weeks = []
+    while monday <= last:
+        work = [d for d in (monday + timedelta(days=i) for i in range(7)) if d.weekday() not in off_days]
+        weeks.append(WeekDays(monday, monday + timedelta(days=6),
+                              sum(d < first for d in work), sum(first <= d <= last for d in work)))
+        monday += timedelta(days=7)
+    return tuple(weeks)
+
+def month_days(year: int, month: int, off_days: tuple[int, ...]) -> tuple[int, int]:
+    """귀속 월의 (근로일 수, 휴무일 수)."""
+    work = sum(w.days for w in month_weeks(year, month, off_days))
+    return work, monthrange(year, month)[1] - work
+
+
+# =========================
+# ⏱ 월 시간
+# =========================
+class WeekHours(NamedTuple):
+    """달력 주별 시간 (귀속 월 안의 날짜분)."""
+    start: date
+    end: date
+    workdays: int
+    base: float
+    holiday: float
+    ot: float
+    night: float
+
+@lru_cache(maxsize=SHIFT_CACHE_SIZE)
+def calendar_weeks(start_t: time, end_t: time, break_min: float, year: int, month: int,
+                   off_days: tuple[int, ...], rules: RuleSet = DEFAULT_RULES) -> tuple[WeekHours, ...]:
+    """
+    [달력 주별 시간]
+    - 주 상한(rules.max_weekly_hours)은 앞 달 근로일부터 채우고, 귀속 월 근로일의 나머지가 기본근로 · 넘는 부분은 연장
+    - 귀속 월 밖의 날짜는 상한 차감에만 쓰고 합계에서 제외
+    """
+    cap = rules.max_weekly_hours
+    daily_work = max(0.0, hours_between(start_t, end_t) - break_min / 60)
+    daily_night = night_hours_simple(start_t, end_t)
+    out = []
+    for w in month_weeks(year, month, off_days):
+        work = daily_work * w.days
+        base = min(work, max(0.0, cap - daily_work * w.before))
+        out.append(WeekHours(w.start, w.end, w.days, base, base / 5.0, work - base, daily_night * w.days))
+    return tuple(out)
+
+@lru_cache(maxsize=SHIFT_CACHE_SIZE)
+def calendar_profile(start_t: time, end_t: time, break_min: float, year: int, month: int,
+                     off_days: tuple[int, ...], ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> MonthlyHours:
+    """
+    [달력 기준 월 시간] calendar_weeks 합계 → MonthlyHours (shift_profile 과 같은 형태)
+    - 주휴는 월 상한(rules.max_monthly_holiday), ceil_on 이면 각 월 시간 올림
+    - 주휴는 기본근로 합계 ÷ 5 (주별 ÷5 를 더하면 24.000…04 처럼 오차가 쌓여 올림 시 1시간 더 붙음)
+    """
+    weeks = calendar_weeks(start_t, end_t, break_min, year, month, off_days, rules)
+    base = sum(w.base for w in weeks)
+    holiday = min(base / 5.0, rules.max_monthly_holiday)
+    return MonthlyHours(
+        ceil_if(base,                        ceil_on),
+        ceil_if(holiday,                     ceil_on),
+        ceil_if(sum(w.ot for w in weeks),    ceil_on),
+        ceil_if(sum(w.night for w in weeks), ceil_on),
+    )
+
+def year_month(pay_month=None) -> tuple[int, int]:
+    """귀속 월(날짜 / "YYYY-MM", None 이면 이번 달) → (연, 월)."""
+    y, m = divmod(month_index(pay_month or date.today()), 12)
+    return y, m + 1
+
+
+# =========================
+# 🖥️ CLI
+# =========================
+def _hm(text: str) -> time:
+    h, m = text.split(":")
+    return time(int(h), int(m))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m monthcal", description="달력 기준 월휴무 월 시간 (주별 내역)")
+    parser.add_argument("--month", help="귀속 월 YYYY-MM (기본: 이번 달)")
+    parser.add_argument("--off", default="토일", help="휴무 요일 (예: 토일, 5,6, 없음)")
+    parser.add_argument("--start", default="10:00", help="출근 HH:MM")
+    parser.add_argument("--end", default="23:00", help="퇴근 HH:MM")
+    parser.add_argument("--break-min", type=float, default=60, help="휴게시간(분)")
+    parser.add_argument("--no-ceil", action="store_true", help="월 시간 올림 미적용")
+    args = parser.parse_args(argv)
+
+    y, m = year_month(args.month)
+    off = parse_off_days(args.off)
+    rules = rules_for(f"{y}-{m:02d}")
+    args_t = (_hm(args.start), _hm(args.end), args.break_min, y, m, off)
+    hrs = calendar_profile(*args_t, not args.no_ceil, rules)
+    work, rest = month_days(y, m, off)
+    print(json.dumps({"month": f"{y}-{m:02d}", "off_days": off_days_label(off), "workdays": work,
+                      "monthly_off": rest, **hrs._asdict(),
+                      "weeks": [w._asdict() for w in calendar_weeks(*args_t, rules)]},
+                     ensure_ascii=False, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+병렬 일괄 실행 (ProcessPoolExecutor)
+- 명부를 chunk_size 행씩 나눠 워커 프로세스에 분배하고, 입력 순서대로 병합
+- 청크마다 같은 함수(calc_roster / reverse_roster / accrual_workforce)를 호출하므로 직렬 결과와 동일
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import NamedTuple
+
+import pandas as pd
+
+from accrual import accrual_workforce
+from batch import calc_roster, load_roster, reverse_roster
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class ChunkTiming(NamedTuple):
+    """청크별 실행 기록."""
+    index: int
+    rows: int
+    seconds: float
+    pid: int
+
+
+def _run_chunk(func, index: int, args: tuple):
+    """워커에서 실행: (청크 번호, 결과, 소요시간, pid)."""
+    t0 = perf_counter()
+    out = func(*args)
+    return index, out, perf_counter() - t0, os.getpid()
+
+def _chunks(df: pd.DataFrame, chunk_size: int) -> list[pd.DataFrame]:
+    """행 순서를 유지한 chunk_size 행 단위 분할."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size 는 1 이상이어야 합니다.")
+    return [df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size)]
+
+def _fan_out(func, jobs: list[tuple], workers: int | None):
+    """
+    jobs(인자 튜플 목록)를 워커에 분배 → (청크 순서대로 정렬된 결과 목록, 청크 타이밍 목록).
+    workers == 1 또는 청크 1개면 현재 프로세스에서 직렬 실행.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        done = [_run_chunk(func, i, args) for i, args in enumerate(jobs)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [pool.submit(_run_chunk, func, i, args) for i, args in enumerate(jobs)]
+            done = [f.result() for f in futures]
+    done.sort(key=lambda x: x[0])
+    results = [out for _, out, _, _ in done]
+    timings = [ChunkTiming(i, len(jobs[i][0]), sec, pid) for i, _, sec, pid in done]
+    return results, timings
+
+def _concat(frames: list[pd.DataFrame], ignore_index: bool = False) -> pd.DataFrame:
+    """빈 청크 결과를 뺀 뒤 이어 붙임 (빈 DataFrame 이 dtype 을 흔들지 않도록)."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=ignore_index)
+
+
+# =========================
+# 📦 급여 / 역산
+# =========================
+def run_parallel(func, roster, workers: int | None = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[pd.DataFrame, list[ChunkTiming]]:
+    """
+    [명부 병렬 실행]
+    - func: 명부 DataFrame → 결과 DataFrame (모듈 최상위 함수여야 함: calc_roster, reverse_roster 등)
+    - 반환: (입력 순서·인덱스 그대로 병합한 결과, 청크별 타이밍)
+    """
+    df = load_roster(roster)
+    results, timings = _fan_out(func, [(c,) for c in _chunks(df, chunk_size)], workers)
+    return _concat(results), timings
+
+def calc_roster_parallel(roster, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """calc_roster 병렬판."""
+    return run_parallel(calc_roster, roster, workers, chunk_size)
+
+def reverse_roster_parallel(roster, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """reverse_roster 병렬판."""
+    return run_parallel(reverse_roster, roster, workers, chunk_size)
+
+
+# =========================
+# 🏢 연차
+# =========================
+def accrual_workforce_parallel(employees: pd.DataFrame, changes: pd.DataFrame | None = None,
+                               workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    [accrual_workforce 병렬판]
+    - 직원 표를 청크로 나누고, 각 청크에는 해당 직원의 변경표만 전달
+    - 반환: (awards, segments, 청크별 타이밍)
+    """
+    jobs = []
+    for chunk in _chunks(employees, chunk_size):
+        sub = None
+        if changes is not None:
+            sub = changes[changes["employee_id"].isin(chunk["employee_id"])]
+        jobs.append((chunk, sub))
+    results, timings = _fan_out(accrual_workforce, jobs, workers)
+    awards = _concat([a for a, _ in results], ignore_index=True)
+    segments = _concat([s for _, s in results], ignore_index=True)
+    return awards, segments, timings
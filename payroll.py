@@ -0,0 +1,246 @@
+"""
+급여 계산 코어 (Streamlit 비의존)
+- 시급 역산 / 월급 계산 / 월휴무 월급 계산 페이지가 공유하는 시간·금액 계산
+- app.py 및 일괄 계산(batch.py)에서 import 해서 사용
+"""
+import math
+from datetime import time
+from functools import lru_cache
+from time import perf_counter
+from typing import NamedTuple
+
+import metrics
+from rules import DEFAULT_RULES, RuleSet
+from windows import night_minutes_scalar
+
+# ---------------------------
+# 상수 (기본 규칙. 기간별 값은 rules.py 규칙표)
+# ---------------------------
+WEEKS_PER_MONTH = DEFAULT_RULES.weeks_per_month
+MAX_WEEKLY_HOURS = DEFAULT_RULES.max_weekly_hours
+MAX_MONTHLY_HOLIDAY = DEFAULT_RULES.max_monthly_holiday  # 월 주휴시간 상한
+SHIFT_CACHE_SIZE = 4096   # 근무 패턴(shift profile) 캐시 크기
+
+# ---------------------------
+# 유틸
+# ---------------------------
+def hours_between(start: time, end: time) -> float:
+    """출근~퇴근 구간 길이를 시간(float)로 반환. 자정 넘기면 +24h."""
+    s = start.hour + start.minute / 60
+    e = end.hour + end.minute / 60
+    if e <= s:  # 자정 넘김
+        e += 24
+    return max(0.0, e - s)
+
+def night_hours_simple(start: time, end: time) -> float:
+    """야간(22~06)과 근무구간의 겹침(시간). 자정 넘기면 다음 날 퇴근 (windows.py 누적 함수)."""
+    s = start.hour * 60 + start.minute
+    e = end.hour * 60 + end.minute
+    if e <= s:
+        e += 24 * 60
+    return night_minutes_scalar(s, e) / 60
+
+def ceil_if(x: float, flag: bool) -> float:
+    """올림 옵션 적용(월 시간 단위)."""
+    if metrics.ENABLED:
+        t0 = perf_counter()
+        out = math.ceil(x) if flag else x
+        metrics.observe("ceil_if", perf_counter() - t0)
+        return out
+    return math.ceil(x) if flag else x
+
+def won_ceil(x: float) -> int:
+    """원단위 올림."""
+    return int(math.ceil(x - 1e-12))
+
+def ceil_ones(n: int) -> int:
+    """10원 단위 올림."""
+    return int(math.ceil(n / 10.0) * 10)
+
+
+# ---------------------------
+# 월 시간 산출
+# ---------------------------
+class MonthlyHours(NamedTuple):
+    """월 환산 시간 (기본근로 / 주휴 / 연장 / 야간)."""
+    base: float
+    holiday: float
+    ot: float
+    night: float
+
+    @property
+    def denom(self) -> float:
+        """통상시급 분모 시간 = 기본근로 + 주휴."""
+        return self.base + self.holiday
+
+def monthly_hours(start_t: time, end_t: time, break_min: float,
+                  days_wk: float, ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> MonthlyHours:
+    """
+    [근무 패턴 → 월 시간]
+    - 주 40h 초과분은 연장, 주휴시간은 (주근로시간 ÷ 5) 월 환산 후 35h 상한
+    - ceil_on 이면 각 월 시간을 올림
+    - rules: 월 환산 주 수 / 주 상한 / 주휴 상한 (귀속 월의 규칙, rules.rules_for)
+    """
+    t0 = perf_counter() if metrics.ENABLED else 0.0
+    wpm, week_cap = rules.weeks_per_month, rules.max_weekly_hours
+    break_h = break_min / 60
+    daily_span = hours_between(start_t, end_t)             # 체류시간
+    daily_work = max(0.0, daily_span - break_h)            # 휴게 차감 실근로
+    weekly_raw  = daily_work * days_wk
+    weekly_base = min(weekly_raw, week_cap)                # 주 40h 제한
+
+    monthly_base    = weekly_base * wpm
+    # ✅ 주휴시간: 무조건 (주근로시간 ÷ 5) → 월 환산, 상한 35h
+    monthly_holiday = min((weekly_base / 5.0) * wpm, rules.max_monthly_holiday)
+    monthly_ot      = max(0.0, weekly_raw - week_cap) * wpm
+    monthly_night   = night_hours_simple(start_t, end_t) * days_wk * wpm
+
+    hours = MonthlyHours(
+        ceil_if(monthly_base,    ceil_on),
+        ceil_if(monthly_holiday, ceil_on),
+        ceil_if(monthly_ot,      ceil_on),
+        ceil_if(monthly_night,   ceil_on),
+    )
+    if t0:
+        metrics.observe("hours", perf_counter() - t0)
+    return hours
+
+@lru_cache(maxsize=SHIFT_CACHE_SIZE)
+def shift_profile(start_t: time, end_t: time, break_min: float,
+                  days_wk: float, ceil_on: bool, rules: RuleSet = DEFAULT_RULES) -> MonthlyHours:
+    """
+    [근무 패턴 캐시]
+    - (출근, 퇴근, 휴게분, 주 근로일, 올림, 규칙) 키별 monthly_hours 결과를 LRU 로 보관
+    - 같은 패턴은 한 번만 계산. 적중/미적중은 shift_profile.cache_info() 로 확인
+    """
+    return monthly_hours(start_t, end_t, break_min, days_wk, ceil_on, rules)
+
+def offday_days_wk(monthly_off: float, rules: RuleSet = DEFAULT_RULES) -> tuple[float, float]:
+    """월 휴무일 → (주 휴일, 주 근로일). 주 근로일은 0~7로 클램프."""
+    weekly_holidays = monthly_off / rules.weeks_per_month    # 주 휴일(일/주)
+    days_wk_raw     = 7.0 - weekly_holidays                  # 주 근로일(일/주)
+    days_wk         = max(0.0, min(7.0, days_wk_raw))        # 안전 클램프
+    return weekly_holidays, days_wk
+
+
+# ---------------------------
+# 금액 산출
+# ---------------------------
+class PayResult(NamedTuple):
+    """월 급여 항목 (모든 금액: 원단위 올림)."""
+    normal_wage: int
+    total: int
+    base_pay: int
+    holi_pay: int
+    overtime_pay: int
+    night_pay: int
+
+def calc_pay(gwage: int, hours: MonthlyHours, meal: int, car: int, is_5p: bool,
+             opt_basic: bool = False, opt_holiday: bool = False,
+             opt_ot: bool = False, opt_night: bool = False, rules: RuleSet = DEFAULT_RULES) -> PayResult:
+    """
+    [기준시급 → 월 급여]
+    - 통상시급 = (기본급 + 주휴수당 + 고정수당) ÷ (기본근로 + 주휴), 원단위 올림
+    - 연장/야간수당은 통상시급 기준 (5인 이상: rules.ot_factor / night_factor, 기본 1.5배 / 0.5배)
+    - opt_* : 항목별 10원 단위 올림
+    """
+    denom_hours = hours.denom
+    if denom_hours <= 0:
+        raise ValueError("분모 시간(기본근로+주휴)이 0입니다. 입력값을 확인하세요.")
+
+    # 가산계수
+    ot_factor    = rules.ot_factor if is_5p else 1.0
+    night_factor = rules.night_factor if is_5p else 0.0
+
+    # 기본급/주휴수당
+    base_pay = won_ceil(gwage * hours.base)
+    holi_pay = won_ceil(gwage * hours.holiday)
+    if opt_basic:   base_pay = ceil_ones(base_pay)
+    if opt_holiday: holi_pay = ceil_ones(holi_pay)
+
+    # ✅ 통상시급 (원단위 올림, 주휴 포함)
+    normal_wage = won_ceil((base_pay + holi_pay + meal + car) / denom_hours)
+
+    # 연장/야간
+    overtime_pay = won_ceil(normal_wage * hours.ot * ot_factor)
+    night_pay    = won_ceil(normal_wage * hours.night * night_factor)
+    if opt_ot:    overtime_pay = ceil_ones(overtime_pay)
+    if opt_night: night_pay    = ceil_ones(night_pay)
+
+    total = base_pay + holi_pay + overtime_pay + night_pay + meal + car
+    return PayResult(normal_wage, total, base_pay, holi_pay, overtime_pay, night_pay)
+
+
+# ---------------------------
+# 기준시급 역산
+# ---------------------------
+def solve_base_wage(salary: int, hours: MonthlyHours, meal: int, car: int, is_5p: bool,
+                    opt_basic: bool = False, opt_holiday: bool = False,
+                    opt_ot: bool = False, opt_night: bool = False,
+                    rules: RuleSet = DEFAULT_RULES) -> tuple[int, PayResult]:
+    """
+    [월급 → 기준시급 역산]
+    - 총액 ≤ 월급 을 만족하는 가장 큰 기준시급(원)과 그때의 급여 항목을 반환
+    - 총액은 기준시급에 대해 단조 비감소 → 초기 추정치에서 지수 탐색으로 구간을 잡고 이분 탐색
+      (±1원 선형 탐색과 결과 동일, 평가 횟수 O(log 월급))
+    - 기준시급 0원으로도 월급을 넘으면 (0, 0원 결과) 반환
+    - 계측(metrics.ENABLED) 시 구간 잡기 / 이분 탐색 평가 수와 초기 추정치와의 거리를 기록
+    """
+    denom_hours = hours.denom
+    if denom_hours <= 0:
+        raise ValueError("분모 시간(기본근로+주휴)이 0입니다. 입력값을 확인하세요.")
+    t0 = perf_counter() if metrics.ENABLED else 0.0
+    evals = 0
+
+    def simulate_total(gwage: int) -> PayResult:
+        nonlocal evals
+        evals += 1
+        return calc_pay(gwage, hours, meal, car, is_5p,
+                        opt_basic, opt_holiday, opt_ot, opt_night, rules)
+
+    # 초기 기준시급 추정 (올림)
+    init_base_wage = max(0, won_ceil((salary - meal - car) / denom_hours))
+    res = simulate_total(init_base_wage)
+
+    # 1) 구간 잡기: lo 는 월급 이하, hi 는 월급 초과
+    step = 1
+    if res.total <= salary:
+        lo, lo_res = init_base_wage, res
+        hi = lo + step
+        while True:
+            r = simulate_total(hi)
+            if r.total > salary:
+                break
+            lo, lo_res = hi, r
+            step *= 2
+            hi = lo + step
+    else:
+        hi = init_base_wage
+        while True:
+            lo = max(0, hi - step)
+            lo_res = simulate_total(lo)
+            if lo_res.total <= salary:
+                break
+            if lo == 0:
+                if t0:
+                    _record_search(t0, evals, evals, init_base_wage, 0)
+                return 0, lo_res
+            hi = lo
+            step *= 2
+
+    # 2) 이분 탐색
+    gallop = evals
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        r = simulate_total(mid)
+        if r.total <= salary:
+            lo, lo_res = mid, r
+        else:
+            hi = mid
+    if t0:
+        _record_search(t0, gallop, evals, init_base_wage, lo)
+    return lo, lo_res
+
+def _record_search(t0: float, gallop: int, evals: int, init_base_wage: int, result: int):
+    metrics.observe("search", perf_counter() - t0)
+    metrics.record_search(gallop, evals - gallop, abs(result - init_base_wage))
@@ -0,0 +1,195 @@
+"""
+소급 재계산 (기준시급 · 최저시급 소급 인상)
+
+    python -m retro history.csv wages.csv --output retro.csv [--summary summary.csv]
+
+- history: 직원-월 행 (employee_id, pay_month "YYYY-MM") + 그 달 급여 입력
+    start, end, gwage + 선택 컬럼(batch.ROSTER_DEFAULTS, monthly_off)
+    또는 월 시간(monthly_base, monthly_holiday, monthly_ot, monthly_night, 타임시트 등) + gwage
+    지급액(base_pay, holi_pay, overtime_pay, night_pay[, total])이 있으면 그 값과 비교,
+    없으면 그 달 gwage 로 월급 계산한 값을 지급액으로 봄
+- wages: 효력일별 인상표 (eff_date + 아래 중 하나)
+    employee_id + gwage   해당 직원의 새 기준시급
+    min_wage (employee_id 비움)   전사 최저시급 → 기준시급이 그보다 낮으면 최저시급으로
+- 효력일이 속한 달부터 적용 (월 중간 효력일도 그 달 전체, 일할 계산 없음)
+  효력일 이후 직원-월만 다시 계산하고, 이전 달은 결과에 넣지 않음
+- 조회(직원·월 → 적용 행)는 정렬 키 searchsorted, 재계산은 계산 규칙(rules.py)별 batch.calc_pay_arr 한 번씩
+  → 전 직원 1년치도 배열 연산
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from batch import (
+    RESULT_COLUMNS, _pay_kwargs, _roster_hours, by_rules, calc_pay_arr, load_roster, prepare_roster,
+)
+from rules import RuleSet, RuleTable
+
+HISTORY_KEYS = ("employee_id", "pay_month")
+HOUR_COLUMNS = RESULT_COLUMNS[:4]
+PAY_ITEMS = ("base_pay", "holi_pay", "overtime_pay", "night_pay", "total")
+DELTA_COLUMNS = [*HISTORY_KEYS, "gwage_before", "gwage_after", "min_wage",
+                 *[f"{c}_{k}" for c in PAY_ITEMS for k in ("paid", "retro", "delta")]]
+
+
+# ---------------------------
+# 인상표 조회
+# ---------------------------
+def _month_index(col: pd.Series) -> np.ndarray:
+    """날짜 / "YYYY-MM" 컬럼 → 연×12 + 월 (정수). 해석 불가면 ValueError."""
+    ts = pd.to_datetime(col, errors="coerce")
+    bad = ts.isna().to_numpy()
+    if bad.any():
+        raise ValueError(f"날짜를 해석할 수 없는 행이 있습니다: {col.index[bad].tolist()[:10]}")
+    return (ts.dt.year * 12 + ts.dt.month - 1).to_numpy(np.int64)
+
+def _asof(table_keys: np.ndarray, values: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    정렬 키 기준 '키 이하 마지막 행' 조회 → (값, 찾은 행의 키). 없으면 (NaN, -1)
+    - 같은 키가 여러 번이면 입력 순서상 마지막 값 (안정 정렬)
+    """
+    if len(table_keys) == 0:
+        return np.full(len(keys), np.nan), np.full(len(keys), -1)
+    order = np.argsort(table_keys, kind="stable")
+    tk, tv = table_keys[order], values[order]
+    pos = np.searchsorted(tk, keys, side="right") - 1
+    found = pos >= 0
+    j = np.maximum(pos, 0)
+    return np.where(found, tv[j], np.nan), np.where(found, tk[j], -1)
+
+def wage_lookup(history: pd.DataFrame, wages: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    [직원-월별 적용 인상]
+    - 반환: (새 기준시급, 최저시급) float 배열, 해당 없음은 NaN
+    """
+    if "eff_date" not in wages.columns:
+        raise ValueError("인상표에 필수 컬럼이 없습니다: ['eff_date']")
+    n = len(history)
+    month = _month_index(history["pay_month"])
+    eff = _month_index(wages["eff_date"])
+    emp_col = wages["employee_id"] if "employee_id" in wages.columns else pd.Series(np.nan, index=wages.index)
+    has_emp = emp_col.notna().to_numpy()
+    gw = wages["gwage"].to_numpy(float) if "gwage" in wages.columns else np.full(len(wages), np.nan)
+    mw = wages["min_wage"].to_numpy(float) if "min_wage" in wages.columns else np.full(len(wages), np.nan)
+    bad = (~np.isnan(gw) & ~has_emp) | (~np.isnan(mw) & has_emp) | (np.isnan(gw) == np.isnan(mw))
+    if bad.any():
+        raise ValueError("인상표 행은 employee_id + gwage (직원별) 또는 min_wage (전사, employee_id 비움) "
+                         f"중 하나여야 합니다: {wages.index[bad].tolist()[:10]}")
+
+    new_gwage = np.full(n, np.nan)
+    g_rows = has_emp & ~np.isnan(gw)
+    if g_rows.any():
+        # 직원 코드 × 월 복합 키. 인상표 employee_id 는 이력 dtype 으로 (CSV 빈칸 때문에 float 로 읽히는 경우)
+        ids = pd.Index(pd.unique(history["employee_id"]))
+        t_ids = emp_col[g_rows]
+        if ids.dtype.kind in "iu":
+            t_ids = t_ids.astype(ids.dtype)
+        t_codes = ids.get_indexer(t_ids)
+        known = t_codes >= 0  # 이력에 없는 직원의 인상 행은 무시
+        codes = ids.get_indexer(history["employee_id"])
+        span = int(max(month.max(), eff.max())) + 1
+        vals, key = _asof(t_codes[known] * span + eff[g_rows][known], gw[g_rows][known], codes * span + month)
+        new_gwage = np.where(key >= codes * span, vals, np.nan)  # 앞 직원의 행을 집은 경우 제외
+
+    min_wage = np.full(n, np.nan)
+    m_rows = ~has_emp & ~np.isnan(mw)
+    if m_rows.any():
+        min_wage, _ = _asof(eff[m_rows], mw[m_rows], month)
+    return new_gwage, min_wage
+
+
+# ---------------------------
+# 소급 계산
+# ---------------------------
+def _hours(df: pd.DataFrame, rules: RuleSet):
+    """월 시간: 컬럼이 있으면 그대로, 없으면 근무 패턴으로 계산 (batch._roster_hours)."""
+    if all(c in df.columns for c in HOUR_COLUMNS):
+        hours = tuple(df[c].to_numpy(float) for c in HOUR_COLUMNS)
+        bad = (hours[0] + hours[1]) <= 0
+        if bad.any():
+            raise ValueError(f"분모 시간(기본근로+주휴)이 0인 행이 있습니다: {df.index[bad].tolist()[:10]}")
+        return hours
+    return _roster_hours(df, rules)
+
+def _retro_group(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    """같은 계산 규칙(귀속 월)의 직원-월 묶음 → 차액 행."""
+    has_hours = all(c in df.columns for c in HOUR_COLUMNS)
+    df = prepare_roster(df, ("gwage",) if has_hours else ("start", "end", "gwage"), rules)
+    hours = _hours(df, rules)
+    kw = _pay_kwargs(df)
+    before = df["gwage"].to_numpy(np.int64)
+    after = df["_gwage_after"].to_numpy(np.int64)
+
+    retro = calc_pay_arr(after, *hours, **kw, rules=rules)
+    if all(c in df.columns for c in PAY_ITEMS[:4]):
+        paid = {c: df[c].to_numpy(np.int64) for c in PAY_ITEMS[:4]}
+        paid["total"] = (df["total"].to_numpy(np.int64) if "total" in df.columns
+                         else sum(paid.values()) + kw["meal"] + kw["car"])
+    else:
+        paid = calc_pay_arr(before, *hours, **kw, rules=rules)
+
+    out = {"employee_id": df["employee_id"].to_numpy(), "pay_month": df["pay_month"].to_numpy(),
+           "gwage_before": before, "gwage_after": after, "min_wage": df["_min_wage"].to_numpy()}
+    for c in PAY_ITEMS:
+        out[f"{c}_paid"] = paid[c]
+        out[f"{c}_retro"] = retro[c]
+        out[f"{c}_delta"] = retro[c] - paid[c]
+    return pd.DataFrame(out, index=df.index)
+
+def retro_deltas(history, wages, rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [소급 차액]
+    - history / wages: 모듈 설명 참고 (DataFrame / .csv / .parquet)
+    - rules: 계산 규칙표 (없으면 rules.RULES). 직원-월은 귀속 월의 규칙으로 묶어 계산
+    - 반환: 인상이 적용되는 직원-월만
+        employee_id, pay_month, gwage_before, gwage_after, min_wage,
+        + 항목별 <항목>_paid, <항목>_retro, <항목>_delta (base_pay, holi_pay, overtime_pay, night_pay, total)
+    """
+    hist = load_roster(history)
+    missing = [c for c in (*HISTORY_KEYS, "gwage") if c not in hist.columns]
+    if missing:
+        raise ValueError(f"급여 이력에 필수 컬럼이 없습니다: {missing}")
+    new_gwage, min_wage = wage_lookup(hist, load_roster(wages))
+    hit = ~np.isnan(new_gwage) | ~np.isnan(min_wage)
+    if not hit.any():
+        return pd.DataFrame(columns=DELTA_COLUMNS)
+
+    df = hist.loc[hit]
+    before = df["gwage"].to_numpy(np.int64)
+    after = np.where(np.isnan(new_gwage[hit]), before, np.round(new_gwage[hit])).astype(np.int64)
+    after = np.where(np.isnan(min_wage[hit]), after, np.maximum(after, min_wage[hit])).astype(np.int64)
+    df = df.assign(_gwage_after=after, _min_wage=min_wage[hit])
+    return by_rules(df, _retro_group, rules)
+
+def retro_summary(deltas: pd.DataFrame) -> pd.DataFrame:
+    """직원별 소급 합계: months, 항목별 차액 합."""
+    cols = [f"{c}_delta" for c in PAY_ITEMS]
+    return (deltas.groupby("employee_id", sort=False)
+            .agg(months=("pay_month", "size"), **{c: (c, "sum") for c in cols})
+            .reset_index())
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m retro", description="소급 재계산 (항목별 차액)")
+    parser.add_argument("history", help="직원-월 급여 이력 CSV / Parquet (employee_id, pay_month, ...)")
+    parser.add_argument("wages", help="인상표 CSV / Parquet (eff_date, employee_id + gwage 또는 min_wage)")
+    parser.add_argument("--output", help="직원-월 차액 CSV")
+    parser.add_argument("--summary", help="직원별 합계 CSV")
+    args = parser.parse_args(argv)
+
+    deltas = retro_deltas(args.history, args.wages)
+    if args.output:
+        deltas.to_csv(args.output, index=False)
+    summary = retro_summary(deltas)
+    if args.summary:
+        summary.to_csv(args.summary, index=False)
+    print(json.dumps({"employee_months": len(deltas), "employees": len(summary),
+                      "total_delta": int(deltas["total_delta"].sum())}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+계산 규칙표 (효력일별 상수)
+
+    PAYROLL_RULES=rules.csv streamlit run app.py     # 시작 시 한 번 로드
+    python -m rules --rules rules.csv --month 2026-03  # 해당 귀속 월에 적용되는 규칙 확인
+
+- 월 환산 주 수, 주 기본근로 상한, 월 주휴 상한, 5인 이상 연장·야간 가산계수, 최저시급을 RuleSet 하나로 묶음
+- 규칙표 파일(CSV / JSON): eff_date + RuleSet 필드. 빈 칸은 직전 효력일의 값 (첫 행은 DEFAULT_RULES)
+    eff_date,weeks_per_month,max_weekly_hours,max_monthly_holiday,ot_factor,night_factor,min_wage
+    2025-01-01,4.345,40,35,1.5,0.5,10030
+    2026-01-01,,,,,,10320
+- 효력일이 속한 달부터 적용 (retro.py 와 같은 월 단위)
+- 귀속 월 → RuleSet: 효력 월 배열 bisect (O(log n)), 배열은 searchsorted 한 번
+- 일괄 계산은 groups() 로 행을 규칙별로 묶어 묶음마다 배열 연산
+- 환경 변수 PAYROLL_RULES 가 없으면 DEFAULT_RULES 한 줄 (기존 상수와 같음)
+- numpy 는 배열 조회(index_of / groups)에서만 import (스칼라 경로 cli 의 시작 시간 단축)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+RULES_ENV = "PAYROLL_RULES"
+
+
+class RuleSet(NamedTuple):
+    """한 기간의 계산 상수."""
+    weeks_per_month: float = 4.345
+    max_weekly_hours: int = 40
+    max_monthly_holiday: int = 35  # 월 주휴시간 상한
+    ot_factor: float = 1.5         # 5인 이상 연장 가산 (미만은 1.0)
+    night_factor: float = 0.5      # 5인 이상 야간 가산 (미만은 0)
+    min_wage: int = 10_030
+
+
+DEFAULT_RULES = RuleSet()
+_INT_FIELDS = {"max_weekly_hours", "max_monthly_holiday", "min_wage"}
+
+
+def month_index(v) -> int:
+    """날짜 / datetime / "YYYY-MM[-DD]" → 연×12 + 월 - 1."""
+    if isinstance(v, str):
+        y, m = v.split("-")[:2]
+        return int(y) * 12 + int(m) - 1
+    return v.year * 12 + v.month - 1
+
+def month_array(months) -> np.ndarray:
+    """귀속 월 컬럼 / 배열 → 월 번호 배열 (고유값만 해석)."""
+    import numpy as np
+    values = np.asarray(months, dtype=object)
+    uniq, inverse = np.unique(values.astype(str), return_inverse=True)
+    try:
+        idx = np.array([month_index(date.fromisoformat(u[:10]) if len(u) > 7 else u) for u in uniq], dtype=np.int64)
+    except ValueError:
+        raise ValueError(f"귀속 월을 해석할 수 없습니다: {list(uniq[:10])} (YYYY-MM 또는 YYYY-MM-DD)")
+    return idx[inverse]
+
+
+class RuleTable:
+    """
+    [효력일별 규칙표]
+    - 효력 월 오름차순 배열 + RuleSet 목록 (같은 달이 여러 번이면 마지막 행)
+    - for_month: 스칼라 조회, index_of / groups: 배열 조회
+    """
+
+    def __init__(self, entries: list[tuple[date, RuleSet]]):
+        if not entries:
+            raise ValueError("규칙표가 비어 있습니다.")
+        self.months: list[int] = []
+        self.rules: list[RuleSet] = []
+        self.dates: list[date] = []
+        for d, rs in sorted(entries, key=lambda e: month_index(e[0])):
+            m = month_index(d)
+            if self.months and self.months[-1] == m:
+                self.rules[-1], self.dates[-1] = rs, d
+            else:
+                self.months.append(m)
+                self.rules.append(rs)
+                self.dates.append(d)
+
+    def _index(self, m: int) -> int:
+        i = bisect_right(self.months, m) - 1
+        if i < 0:
+            raise ValueError(f"규칙표 첫 효력일({self.dates[0]}) 이전 귀속 월입니다: {m // 12}-{m % 12 + 1:02d}")
+        return i
+
+    def for_month(self, pay_month=None) -> RuleSet:
+        """귀속 월(날짜 / "YYYY-MM", None 이면 이번 달)의 RuleSet."""
+        return self.rules[self._index(month_index(pay_month or date.today()))]
+
+    def index_of(self, months) -> np.ndarray:
+        """귀속 월 배열 → 행별 규칙 위치."""
+        import numpy as np
+        m = month_array(months)
+        i = np.searchsorted(np.array(self.months, dtype=np.int64), m, side="right") - 1
+        if (i < 0).any():
+            raise ValueError(f"규칙표 첫 효력일({self.dates[0]}) 이전 귀속 월이 있습니다: "
+                             f"{np.asarray(months, dtype=object)[i < 0][:10].tolist()}")
+        return i
+
+    def groups(self, months=None, n: int = 0) -> list[tuple[RuleSet, np.ndarray]]:
+        """
+        [규칙별 행 묶음] → [(RuleSet, 행 위치 배열), ...]
+        - months 가 None 이면 n 행 전체를 이번 달 규칙 하나로
+        """
+        import numpy as np
+        if months is None:
+            return [(self.for_month(), np.arange(n))]
+        idx = self.index_of(months)
+        uniq = np.unique(idx)
+        if len(uniq) == 1:
+            return [(self.rules[uniq[0]], np.arange(len(idx)))]
+        return [(self.rules[u], np.flatnonzero(idx == u)) for u in uniq]
+
+    def records(self) -> list[dict]:
+        """효력일 + 필드 dict 목록 (저장소 상수 / 화면 표시용)."""
+        return [{"eff_date": d.isoformat(), **rs._asdict()} for d, rs in zip(self.dates, self.rules)]
+
+
+# =========================
+# 📂 로드
+# =========================
+def _parse(field: str, v):
+    return int(float(v)) if field in _INT_FIELDS else float(v)
+
+def load_rules(src) -> RuleTable:
+    """
+    [규칙표 로드] CSV / JSON 경로, dict 목록, DataFrame
+    - 빈 값(또는 없는 필드)은 직전 효력일 값을 이어받음
+    """
+    if isinstance(src, str):
+        with open(src, encoding="utf-8") as f:
+            rows = json.load(f) if src.lower().endswith(".json") else list(csv.DictReader(f))
+    elif hasattr(src, "to_dict"):
+        rows = src.to_dict("records")
+    else:
+        rows = list(src)
+    entries, prev = [], DEFAULT_RULES
+    for row in sorted(rows, key=lambda r: str(r.get("eff_date"))):
+        eff = row.get("eff_date")
+        if eff is None or str(eff).strip() == "":
+            raise ValueError(f"규칙표에 효력일(eff_date)이 없는 행이 있습니다: {row}")
+        if isinstance(eff, datetime):
+            eff = eff.date()
+        elif not isinstance(eff, date):
+            eff = date.fromisoformat(str(eff)[:10])
+        vals = {}
+        for field in RuleSet._fields:
+            v = row.get(field)
+            if v is None or (isinstance(v, str) and v.strip() == "") or (isinstance(v, float) and v != v):
+                continue
+            try:
+                vals[field] = _parse(field, v)
+            except ValueError:
+                raise ValueError(f"규칙표 {eff} 행의 {field} 값을 해석할 수 없습니다: {v!r}")
+        prev = prev._replace(**vals)
+        entries.append((eff, prev))
+    return RuleTable(entries)
+
+def default_table() -> RuleTable:
+    """PAYROLL_RULES 경로가 있으면 그 규칙표, 없으면 DEFAULT_RULES 한 줄."""
+    path = os.environ.get(RULES_ENV)
+    if path:
+        return load_rules(path)
+    return RuleTable([(date(1, 1, 1), DEFAULT_RULES)])
+
+
+RULES = default_table()  # 시작 시 한 번
+
+def rules_for(pay_month=None) -> RuleSet:
+    """기본 규칙표에서 귀속 월(None 이면 이번 달)의 RuleSet."""
+    return RULES.for_month(pay_month)
+
+
+# =========================
+# 🖥️ CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m rules", description="계산 규칙표 확인")
+    parser.add_argument("--rules", help=f"규칙표 CSV / JSON (기본: 환경 변수 {RULES_ENV})")
+    parser.add_argument("--month", help="귀속 월 YYYY-MM (주면 그 달의 규칙만)")
+    args = parser.parse_args(argv)
+
+    table = load_rules(args.rules) if args.rules else RULES
+    if args.month:
+        print(json.dumps({"month": args.month, **table.for_month(args.month)._asdict()}))
+    else:
+        print(json.dumps(table.records()))
+
+if __name__ == "__main__":
+    main()
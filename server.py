@@ -0,0 +1,357 @@
+"""
+로컬 HTTP 계산 서비스 (asyncio, 표준 라이브러리만 사용)
+
+    python -m server --port 8080 --workers 2
+
+- POST /pay      월급 계산      {"start": "10:00", "end": "23:00", "gwage": 10030, ...}
+- POST /reverse  시급 역산      {"start": "10:00", "end": "23:00", "salary": 5000000, ...}
+- POST /offday   월휴무 월급    {"start": "10:00", "end": "23:00", "gwage": 10030, "monthly_off": 6, ...}
+- POST /leave    연차 시간 환산 {"mode": "under", "join_dt": "2024-07-15", "default_wsh": 3,
+                                 "changes": [["2024-10-01", 2.4]], "end_limit": "2025-07-14"}
+                              {"mode": "over", "join_dt": ..., "target_anniv": "2025-09-12", ...}
+- GET  /stats    엔드포인트별 요청 수, 배치 크기, 지연시간 p50 / p99 (ms)
+- GET  /health
+
+- 요청 본문의 키는 명부 컬럼(batch.ROSTER_DEFAULTS)과 같고, 빠진 키는 기본값
+- 동시에 들어온 요청은 엔드포인트별로 모아(micro-batch) calc_roster / reverse_roster 한 번으로 계산
+- 계산은 프로세스 풀에서 실행 → 이벤트 루프는 요청 수신만 담당
+  배치는 완료를 기다리지 않고 풀에 넘기고(엔드포인트 무관 동시 실행 수 = 워커 수), 풀이 다 차 있는 동안 들어온 요청은 다음 배치로
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from time import perf_counter
+
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 10_000  # 백분위 계산에 쓰는 최근 요청 수
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+_MAX_BODY = 1 << 20
+
+
+# =========================
+# 🧮 워커에서 실행되는 배치 계산
+# =========================
+def _records(df, columns: list[str]) -> list[dict]:
+    return df[columns].to_dict("records")
+
+def _roster_batch(kind: str, items: list[dict]) -> list[dict]:
+    """pay / reverse / offday 요청 묶음 → 요청별 결과 (DataFrame 한 번으로 계산)."""
+    import pandas as pd
+    from batch import RESULT_COLUMNS, calc_roster, reverse_roster
+
+    if kind == "offday" and any("monthly_off" not in it for it in items):
+        raise ValueError("monthly_off 가 필요합니다.")
+    df = pd.DataFrame(items)
+    if kind == "reverse":
+        return _records(reverse_roster(df), ["gwage", *RESULT_COLUMNS])
+    columns = ["days_wk", *RESULT_COLUMNS] if kind == "offday" else RESULT_COLUMNS
+    return _records(calc_roster(df), columns)
+
+def _leave_one(item: dict) -> dict:
+    """연차 요청 1건 (cli.py 연차와 같은 계산)."""
+    from datetime import timedelta
+    from accrual import (WshTimeline, add_months, full_years, over_1y_rows,
+                         statutory_days, under_1y_rows)
+
+    join_dt = date.fromisoformat(item["join_dt"])
+    default_wsh = float(item.get("default_wsh", 3.0))
+    changes = [(date.fromisoformat(d), float(w)) for d, w in item.get("changes", [])]
+    if item.get("mode", "under") == "under":
+        end_limit = (date.fromisoformat(item["end_limit"]) if item.get("end_limit")
+                     else add_months(join_dt, 12) - timedelta(days=1))
+        rows = under_1y_rows(join_dt, end_limit, WshTimeline.from_changes(join_dt, changes, default_wsh))
+        return {"rows": rows,
+                "days_total": sum(r["accrual_days"] for r in rows),
+                "hours_total": sum(r["accrual_hours"] for r in rows)}
+
+    target = date.fromisoformat(item["target_anniv"])
+    prev_anniv = add_months(target, -12)
+    service_years = full_years(target, join_dt)
+    N = statutory_days(service_years)
+    rows, total_hours = over_1y_rows(prev_anniv, target, N,
+                                     WshTimeline.from_changes(prev_anniv, changes, default_wsh))
+    return {"service_years": service_years, "N": N, "prev_anniv": prev_anniv,
+            "target_anniv": target, "rows": rows,
+            "days_total": float(N), "hours_total": total_hours}
+
+def run_batch(kind: str, items: list[dict]) -> list[tuple[bool, object]]:
+    """
+    [배치 실행] 요청 묶음 → 요청별 (성공 여부, 결과 또는 오류 메시지)
+    - 묶음 계산이 입력 오류로 실패하면 한 건씩 다시 계산해 오류 요청만 실패 처리
+    """
+    if kind == "leave":
+        out = []
+        for it in items:
+            try:
+                out.append((True, _leave_one(it)))
+            except (ValueError, KeyError, TypeError) as e:
+                out.append((False, f"{type(e).__name__}: {e}"))
+        return out
+    try:
+        return [(True, r) for r in _roster_batch(kind, items)]
+    except (ValueError, KeyError, TypeError) as e:
+        if len(items) == 1:
+            return [(False, str(e))]
+    return [run_batch(kind, [it])[0] for it in items]
+
+
+# =========================
+# 📦 마이크로 배치
+# =========================
+class MicroBatcher:
+    """
+    엔드포인트 하나의 요청 대기열.
+    - 첫 요청 후 max_wait_ms 동안(또는 max_batch 개가 찰 때까지) 모아 run_batch 한 번으로 실행
+    - 실행 슬롯(slots, 풀 크기 세마포어 · 엔드포인트끼리 공유)을 얻으면 배치를 풀에 넘기고 바로 다음 배치를 모음
+      → 배치 여러 개가 동시에 실행, 결과는 완료 콜백에서 요청별 future 에 전달
+    - 슬롯이 없는 동안 들어온 요청은 다음 배치에 합침
+    """
+
+    def __init__(self, kind: str, executor, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, slots: asyncio.Semaphore | None = None):
+        self.kind = kind
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.slots = slots if slots is not None else asyncio.Semaphore(1)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batches = 0
+        self.batched_items = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def submit(self, item: dict):
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, fut))
+        return await fut
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self.slots.acquire()
+            while len(pending) < self.max_batch and not self.queue.empty():  # 슬롯 기다리는 동안 쌓인 요청
+                pending.append(self.queue.get_nowait())
+
+            self.batches += 1
+            self.batched_items += len(pending)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            items = [it for it, _ in pending]
+            try:
+                done = asyncio.ensure_future(loop.run_in_executor(self.executor, run_batch, self.kind, items))
+            except Exception as e:  # 풀 종료 등 (넘기지도 못함) → 같은 경로로 실패 처리
+                done = loop.create_future()
+                done.set_exception(e)
+            done.add_done_callback(partial(self._resolve, pending))
+
+    def _resolve(self, pending: list, done: asyncio.Future):
+        """배치 완료 → 슬롯 반납 + 요청별 future 에 결과."""
+        self.slots.release()
+        self.in_flight -= 1
+        if done.cancelled():
+            results = [(False, "CancelledError: 배치가 취소되었습니다.")] * len(pending)
+        elif done.exception() is not None:  # 워커 프로세스 비정상 종료 등
+            e = done.exception()
+            results = [(False, f"{type(e).__name__}: {e}")] * len(pending)
+        else:
+            results = done.result()
+        for (_, fut), res in zip(pending, results):
+            if not fut.done():
+                fut.set_result(res)
+
+
+# =========================
+# ⏱️ 지연시간 통계
+# =========================
+class LatencyStats:
+    """엔드포인트별 최근 LATENCY_WINDOW 건의 지연시간(초)."""
+
+    def __init__(self):
+        self.samples: dict[str, deque] = {}
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, path: str, seconds: float, ok: bool):
+        self.samples.setdefault(path, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+        self.counts[path] = self.counts.get(path, 0) + 1
+        if not ok:
+            self.errors[path] = self.errors.get(path, 0) + 1
+
+    def summary(self) -> dict:
+        out = {}
+        for path, dq in self.samples.items():
+            xs = sorted(dq)
+            out[path] = {"requests": self.counts[path], "errors": self.errors.get(path, 0),
+                         "p50_ms": percentile(xs, 50) * 1000, "p99_ms": percentile(xs, 99) * 1000}
+        return out
+
+def percentile(sorted_xs: list[float], q: float) -> float:
+    """정렬된 목록의 q 백분위 (nearest-rank)."""
+    if not sorted_xs:
+        return 0.0
+    k = max(0, min(len(sorted_xs) - 1, -(-len(sorted_xs) * q // 100) - 1))
+    return sorted_xs[int(k)]
+
+
+# =========================
+# 🌐 HTTP
+# =========================
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+class CalcServer:
+    """엔드포인트 → MicroBatcher 라우팅 + keep-alive HTTP/1.1 처리."""
+
+    ENDPOINTS = ("pay", "reverse", "offday", "leave")
+
+    def __init__(self, workers: int | None = None, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.executor = None
+        self.batchers: dict[str, MicroBatcher] = {}
+        self.stats = LatencyStats()
+        self.started = perf_counter()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        # 워커 미리 띄우고 pandas / numpy import 를 끝내 둠 (첫 요청 지연 방지)
+        loop = asyncio.get_running_loop()
+        warm = {"start": "10:00", "end": "19:00", "gwage": 10_030}
+        await asyncio.gather(*[loop.run_in_executor(self.executor, run_batch, "pay", [warm])
+                               for _ in range(self.workers)])
+        slots = asyncio.Semaphore(self.workers)  # 엔드포인트 합계 동시 배치 수 = 풀 크기
+        for kind in self.ENDPOINTS:
+            b = MicroBatcher(kind, self.executor, self.max_batch, self.max_wait_ms, slots)
+            b.start()
+            self.batchers[kind] = b
+        return await asyncio.start_server(self._handle, host, port, limit=_MAX_BODY)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def stats_payload(self) -> dict:
+        return {
+            "uptime_s": perf_counter() - self.started,
+            "workers": self.workers,
+            "endpoints": self.stats.summary(),
+            "batches": {k: {"batches": b.batches,
+                            "mean_batch": b.batched_items / b.batches if b.batches else 0.0,
+                            "in_flight": b.in_flight, "max_in_flight": b.max_in_flight}
+                        for k, b in self.batchers.items()},
+        }
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple[int, object]:
+        if path == "/health":
+            return 200, {"ok": True}
+        if path == "/stats":
+            return 200, self.stats_payload()
+        kind = path.strip("/")
+        if kind not in self.batchers:
+            return 404, {"error": f"알 수 없는 경로입니다: {path}"}
+        if method != "POST":
+            return 405, {"error": "POST 로 요청하세요."}
+        try:
+            item = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "JSON 본문이 올바르지 않습니다."}
+        if not isinstance(item, dict):
+            return 400, {"error": "JSON 객체로 요청하세요."}
+        ok, result = await self.batchers[kind].submit(item)
+        return (200, result) if ok else (400, {"error": result})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                t0 = perf_counter()
+                method, path, version = line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length", 0))
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and not version.startswith("HTTP/1.0"))
+                if length > _MAX_BODY:
+                    writer.write(_response(413, {"error": "본문이 너무 큽니다."}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                route = path.split("?", 1)[0]
+                status, payload = await self._dispatch(method, route, body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if route.strip("/") in self.batchers:
+                    self.stats.record(route, perf_counter() - t0, status == 200)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+# =========================
+# 🚀 실행
+# =========================
+async def serve(host: str, port: int, workers: int | None, max_batch: int, max_wait_ms: float):
+    app = CalcServer(workers, max_batch, max_wait_ms)
+    server = await app.start(host, port)
+    print(f"listening on http://{host}:{port} (workers={app.workers})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m server", description="급여 / 연차 계산 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="계산 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="배치 최대 요청 수")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="배치를 모으는 최대 대기(ms)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+계산 결과 저장소 (Parquet, 증분 재계산)
+
+    python -m store pay     roster.csv    --store result_store --output pay.csv
+    python -m store reverse roster.csv    --store result_store --output reverse.csv
+    python -m store leave   employees.csv --changes changes.csv --store result_store \\
+                            --output awards.csv --segments segments.csv
+    python -m store info  --store result_store
+    python -m store prune --store result_store
+
+- 직원 행마다 계산 입력(명부 정리 후 값)의 해시를 키로 결과를 저장
+- 다음 실행에서는 저장소에 없는 해시(= 입력이 바뀐 행)만 계산하고 나머지는 디스크에서 읽음
+- 계산 상수(WEEKS_PER_MONTH, MAX_WEEKLY_HOURS, MAX_MONTHLY_HOLIDAY, 10원 올림 단위, 야간 시간대, 규칙표)가 바뀌면 전체 무효화
+  (10원 올림 옵션 opt_* 와 사업장 규모, 적용 규칙 번호(귀속 월 pay_month, 없으면 이번 달)는 행별이라 행 해시에 포함)
+- 실행마다 재사용 / 재계산 행 수를 StoreStats 로 반환
+- 같은 입력의 직원이 여럿이면 한 번만 계산 (결과는 입력에만 의존, employee_id 는 키에 넣지 않음)
+"""
+import argparse
+import json
+import os
+from datetime import date
+from hashlib import blake2b
+from time import perf_counter
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from accrual import _changes_by_employee, _to_dates, employee_rows
+from batch import (
+    FLAG_COLUMNS, RESULT_COLUMNS, REVERSE_REQUIRED_COLUMNS,
+    _calendar_keys, _flag, _hm, calc_roster, load_roster, prepare_roster, reverse_roster,
+)
+from payroll import MAX_MONTHLY_HOLIDAY, MAX_WEEKLY_HOURS, WEEKS_PER_MONTH, ceil_ones
+from rules import RULES
+from windows import NIGHT
+
+STORE_VERSION = 1  # 저장 형식 / 계산 로직이 바뀌면 올림 → 전체 무효화
+DEFAULT_DIR = "result_store"
+META_FILE = "meta.json"
+
+# 종류별 저장 컬럼
+VALUE_COLUMNS = {
+    "pay": RESULT_COLUMNS,
+    "reverse": ["gwage"] + RESULT_COLUMNS,
+    "accrual": ["payload"],
+}
+INT_COLUMNS = {"gwage", "normal_wage", "base_pay", "holi_pay", "overtime_pay", "night_pay", "total"}
+_DATE_KEYS = {"award_date", "ref_start", "ref_end", "start", "end"}
+
+
+class StoreStats(NamedTuple):
+    kind: str
+    rows: int          # 입력 행(직원) 수
+    unique: int        # 고유 입력 수
+    reused: int        # 저장소에서 읽은 행
+    recomputed: int    # 이번에 계산한 행
+    invalidated: bool  # 계산 상수가 바뀌어 저장소를 비웠는지 (저장소를 열 때)
+    seconds: float
+
+
+def constants() -> dict:
+    """저장된 결과가 의존하는 계산 상수 (하나라도 바뀌면 저장소 전체 무효)."""
+    return {"STORE_VERSION": STORE_VERSION, "WEEKS_PER_MONTH": WEEKS_PER_MONTH,
+            "MAX_WEEKLY_HOURS": MAX_WEEKLY_HOURS, "MAX_MONTHLY_HOLIDAY": MAX_MONTHLY_HOLIDAY,
+            "CEIL_UNIT": ceil_ones(1), "NIGHT_WINDOW": [NIGHT.start, NIGHT.end], "RULES": RULES.records()}
+
+# =========================
+# 🔑 입력 해시
+# =========================
+def _digest(data: bytes) -> bytes:
+    return blake2b(data, digest_size=16).digest()
+
+def _row_hashes(columns: list) -> tuple[np.ndarray, list[bytes]]:
+    """
+    입력 컬럼 배열들 → (행별 고유 입력 번호, 고유 입력별 해시)
+    - 행을 고정 폭 little-endian 레코드(int64 / float64 / bool)로 묶어 바이트 그대로 해시
+    - 같은 입력 조합은 해시 값으로 factorize
+    """
+    rec = np.empty(len(columns[0]), dtype=[(f"c{i}", "<f8" if c.dtype.kind == "f" else "?" if c.dtype.kind == "b"
+                                            else "<i8") for i, c in enumerate(columns)])
+    for i, c in enumerate(columns):
+        rec[f"c{i}"] = c
+    raw, w = rec.tobytes(), rec.dtype.itemsize
+    codes, uniq = pd.factorize(np.array([_digest(raw[i:i + w]) for i in range(0, len(raw), w)], dtype=object))
+    return codes, list(uniq)
+
+def _pay_inputs(df: pd.DataFrame, amount: str) -> list:
+    """정리된 명부 → 계산에 쓰는 입력 컬럼 (시각은 시/분 정수, 월휴무는 환산된 days_wk, 달력 기준은 월 + 휴무 요일)."""
+    sh, sm = _hm(df["start"])
+    eh, em = _hm(df["end"])
+    cols = [sh, sm, eh, em, df["break_min"].to_numpy(float), df["days_wk"].to_numpy(float),
+            df[amount].to_numpy(np.int64), df["meal"].to_numpy(np.int64), df["car"].to_numpy(np.int64),
+            *[_flag(df[c]) for c in FLAG_COLUMNS]]
+    # 적용 규칙 번호 (귀속 월이 없으면 이번 달 규칙 → 새 효력일이 되면 다시 계산)
+    months = df["pay_month"] if "pay_month" in df.columns else [date.today().isoformat()] * len(df)
+    cols.append(RULES.index_of(months).astype(np.int64))
+    # 달력 기준 월휴무: 귀속 월 번호 + 휴무 요일 비트 (off_days 없는 행은 -1, 0)
+    ym, off = _calendar_keys(df)
+    codes, uniq = pd.factorize(off)
+    bits = np.array([sum(1 << int(d) for d in o) for o in uniq], dtype=np.int64)
+    cols += [ym, bits[codes]]
+    return cols
+
+def _accrual_inputs(employees: pd.DataFrame, by_emp: dict) -> list:
+    """직원별 (입사일, 기본 WSH, 종료일, 기념일, 변경 이력) → 계산 인자 목록."""
+    n = len(employees)
+    return list(zip(
+        _to_dates(employees["join_dt"]),
+        employees["default_wsh"].astype(float).tolist(),
+        _to_dates(employees["end_limit"]) if "end_limit" in employees else [None] * n,
+        _to_dates(employees["target_anniv"]) if "target_anniv" in employees else [None] * n,
+        [by_emp.get(emp, []) for emp in employees["employee_id"].tolist()],
+    ))
+
+def _json_default(o):
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, np.generic):
+        return o.item()
+    raise TypeError(type(o))
+
+def _decode_row(row: dict) -> dict:
+    for k in _DATE_KEYS.intersection(row):
+        row[k] = date.fromisoformat(row[k])
+    return row
+
+
+# =========================
+# 🗄️ 저장소
+# =========================
+class ResultStore:
+    """
+    [결과 저장소] 디렉터리 하나
+    - <디렉터리>/<종류>.parquet (pay / reverse / accrual): h(입력 해시) + run(마지막으로 쓴 실행 번호) + 결과 컬럼
+    - <디렉터리>/meta.json: 계산 상수, 종류별 마지막 실행 번호
+    - 열 때 저장된 상수와 현재 상수를 비교, 다르면 결과 파일 전체 삭제
+    - 실행마다 종류별 파일을 한 번 읽고(컬럼 단위) 새 결과를 붙여 한 번 다시 씀 (임시 파일 → 교체)
+    - prune(): 종류별 가장 최근 실행에서 쓰지 않은 결과 삭제 (퇴사자·옛 입력 정리)
+    """
+
+    def __init__(self, path: str = DEFAULT_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {}
+        self.invalidated = self._check_constants()
+
+    def _file(self, kind: str) -> str:
+        return os.path.join(self.path, f"{kind}.parquet")
+
+    def _save_meta(self):
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def _check_constants(self) -> bool:
+        """상수가 바뀌었으면 결과 전체 삭제. 반환: 삭제했는지 (빈 새 저장소는 False)."""
+        saved = self.meta.get("constants")
+        if saved == constants():
+            return False
+        self._remove_all()
+        self.meta = {"constants": constants(), "runs": {}}
+        self._save_meta()
+        return saved is not None
+
+    def _remove_all(self):
+        for kind in VALUE_COLUMNS:
+            if os.path.exists(self._file(kind)):
+                os.remove(self._file(kind))
+
+    def clear(self):
+        """저장된 결과 전체 삭제."""
+        self._remove_all()
+
+    def _read(self, kind: str) -> pd.DataFrame:
+        if not os.path.exists(self._file(kind)):
+            return pd.DataFrame({"h": pd.Series(dtype=object), "run": pd.Series(dtype=np.int64),
+                                 **{c: pd.Series(dtype=object) for c in VALUE_COLUMNS[kind]}})
+        return pd.read_parquet(self._file(kind))
+
+    def _write(self, kind: str, table: pd.DataFrame):
+        tmp = self._file(kind) + ".tmp"
+        table.to_parquet(tmp, index=False)
+        os.replace(tmp, self._file(kind))
+
+    def counts(self) -> dict:
+        return {kind: len(self._read(kind)) for kind in VALUE_COLUMNS if os.path.exists(self._file(kind))}
+
+    def prune(self) -> int:
+        """종류별 최근 실행에서 쓰지 않은 결과 삭제. 반환: 삭제 행 수."""
+        removed = 0
+        for kind, run in self.meta["runs"].items():
+            table = self._read(kind)
+            keep = table["run"].to_numpy() >= run
+            if not keep.all():
+                removed += int((~keep).sum())
+                self._write(kind, table[keep])
+        return removed
+
+    # ---------------------------
+    # 증분 계산 공통
+    # ---------------------------
+    def _resolve(self, kind: str, codes: np.ndarray, hashes: list[bytes], compute):
+        """
+        [증분 계산 공통]
+        - codes: 행별 고유 입력 번호, hashes: 고유 입력별 해시
+        - compute(고유 입력 위치 배열) → 결과 DataFrame (VALUE_COLUMNS[kind])
+        - 반환: (고유 입력 순서의 결과 DataFrame, 재사용 행 수)
+        """
+        run = self.meta["runs"].get(kind, 0) + 1
+        stored = self._read(kind)
+        index = pd.Index(np.array(hashes, dtype=object))
+        pos = index.get_indexer(stored["h"])  # 저장된 행 → 이번 고유 입력 위치 (-1: 이번에 안 씀)
+        found = np.zeros(len(hashes), dtype=bool)
+        found[pos[pos >= 0]] = True
+        stored.loc[pos >= 0, "run"] = run
+
+        cols = VALUE_COLUMNS[kind]
+        hit = pos >= 0
+        missing = ~found
+        if missing.any():
+            new = compute(np.flatnonzero(missing))[cols].reset_index(drop=True)
+            new.insert(0, "run", run)
+            new.insert(0, "h", index[missing].to_numpy())
+            stored = pd.concat([stored, new], ignore_index=True) if len(stored) else new
+            hit = np.concatenate([hit, np.ones(len(new), dtype=bool)])
+            pos = np.concatenate([pos, np.flatnonzero(missing)])
+        table = stored.loc[hit, cols].set_axis(pos[hit]).sort_index()
+        self._write(kind, stored)
+        self.meta["runs"][kind] = run
+        self._save_meta()
+        reused = int(found[codes].sum())
+        return table, reused
+
+    # ---------------------------
+    # 명부 일괄 계산 (batch.calc_roster / reverse_roster 와 같은 결과)
+    # ---------------------------
+    def _roster(self, kind: str, roster, required, amount: str, func):
+        t0 = perf_counter()
+        df = prepare_roster(load_roster(roster), required)
+        codes, hashes = _row_hashes(_pay_inputs(df, amount))
+        first = np.unique(codes, return_index=True)[1]
+
+        def compute(pos):
+            return func(df.iloc[first[pos]]).reset_index(drop=True)
+
+        table, reused = self._resolve(kind, codes, hashes, compute)
+        for c in VALUE_COLUMNS[kind]:
+            v = table[c].to_numpy()[codes]
+            df[c] = v.astype(np.int64) if c in INT_COLUMNS else v.astype(float)
+        stats = StoreStats(kind, len(df), len(hashes), reused, len(df) - reused,
+                           self.invalidated, perf_counter() - t0)
+        return df, stats
+
+    def calc_roster(self, roster) -> tuple[pd.DataFrame, StoreStats]:
+        """[명부 일괄 월급 계산] 입력이 바뀐 행만 batch.calc_roster 로 계산."""
+        return self._roster("pay", roster, ("start", "end", "gwage"), "gwage", calc_roster)
+
+    def reverse_roster(self, roster) -> tuple[pd.DataFrame, StoreStats]:
+        """[명부 일괄 시급 역산] 입력이 바뀐 행만 batch.reverse_roster 로 계산."""
+        return self._roster("reverse", roster, REVERSE_REQUIRED_COLUMNS, "salary", reverse_roster)
+
+    # ---------------------------
+    # 전 직원 연차 (accrual.accrual_workforce 와 같은 결과)
+    # ---------------------------
+    def accrual_workforce(self, employees: pd.DataFrame, changes: pd.DataFrame | None = None):
+        """
+        [전 직원 일괄 연차 계산] 입력(입사일·WSH·변경 이력·종료일·기념일)이 바뀐 직원만 계산.
+        - 반환: (awards, segments, StoreStats) — awards / segments 는 accrual_workforce 와 같은 형태
+        """
+        t0 = perf_counter()
+        emp_ids = employees["employee_id"].tolist()
+        inputs = _accrual_inputs(employees, _changes_by_employee(changes))
+        codes, uniq = pd.factorize(np.array([_digest(repr(x).encode()) for x in inputs], dtype=object))
+        hashes = list(uniq)
+        first = np.unique(codes, return_index=True)[1]
+
+        def compute(pos):
+            payloads = []
+            for i in first[pos]:
+                awards, seg_key, segs = employee_rows(*inputs[i])
+                payloads.append(json.dumps({"awards": awards, "seg_key": seg_key, "segments": segs},
+                                           default=_json_default, ensure_ascii=False))
+            return pd.DataFrame({"payload": payloads})
+
+        table, reused = self._resolve("accrual", codes, hashes, compute)
+        decoded = [json.loads(p, object_hook=_decode_row) for p in table["payload"]]
+
+        award_rows, award_emps = [], []
+        seg_rows, seg_keys = [], []
+        for emp, code in zip(emp_ids, codes):
+            d = decoded[code]
+            award_rows.extend(d["awards"])
+            award_emps.extend([emp] * len(d["awards"]))
+            if d["segments"]:
+                sy, N, prev_anniv, target = d["seg_key"]
+                key = (emp, sy, N, date.fromisoformat(prev_anniv), date.fromisoformat(target))
+                seg_rows.extend(d["segments"])
+                seg_keys.extend([key] * len(d["segments"]))
+
+        awards = pd.DataFrame(award_rows)
+        awards.insert(0, "employee_id", award_emps)
+        segments = pd.DataFrame(seg_rows)
+        keys = pd.DataFrame(seg_keys, columns=["employee_id", "service_years", "N", "prev_anniv", "target_anniv"])
+        stats = StoreStats("accrual", len(emp_ids), len(hashes), reused, len(emp_ids) - reused,
+                           self.invalidated, perf_counter() - t0)
+        return awards, pd.concat([keys, segments], axis=1), stats
+
+
+# =========================
+# 🖥️ CLI
+# =========================
+def _write(df: pd.DataFrame, path: str):
+    if str(path).lower().endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m store", description="계산 결과 저장소 (증분 재계산)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("pay", "reverse"):
+        p = sub.add_parser(name, help=f"명부 일괄 {'월급 계산' if name == 'pay' else '시급 역산'}")
+        p.add_argument("roster", help="명부 CSV / Parquet")
+        p.add_argument("--output", help="결과 CSV / Parquet")
+    p = sub.add_parser("leave", help="전 직원 연차")
+    p.add_argument("employees", help="직원 CSV (employee_id, join_dt, default_wsh, end_limit, target_anniv)")
+    p.add_argument("--changes", help="WSH 변경표 CSV (employee_id, eff_date, wsh)")
+    p.add_argument("--output", help="1년 미만 부여 결과 CSV / Parquet")
+    p.add_argument("--segments", help="1년 이상 세그먼트 결과 CSV / Parquet")
+    sub.add_parser("info", help="저장된 결과 수 / 계산 상수")
+    sub.add_parser("prune", help="최근 실행에서 쓰지 않은 결과 삭제")
+    for p in sub.choices.values():
+        p.add_argument("--store", default=DEFAULT_DIR, help="저장소 디렉터리")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.store)
+    if args.cmd == "info":
+        print(json.dumps({"counts": store.counts(), "constants": constants()}))
+        return
+    if args.cmd == "prune":
+        print(json.dumps({"removed": store.prune()}))
+        return
+    if args.cmd == "leave":
+        changes = pd.read_csv(args.changes) if args.changes else None
+        awards, segments, stats = store.accrual_workforce(pd.read_csv(args.employees), changes)
+        if args.output:
+            _write(awards, args.output)
+        if args.segments:
+            _write(segments, args.segments)
+    else:
+        func = store.calc_roster if args.cmd == "pay" else store.reverse_roster
+        out, stats = func(args.roster)
+        if args.output:
+            _write(out, args.output)
+    print(json.dumps(stats._asdict()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+스트리밍 명부 계산 (메모리 상한 고정)
+- 대용량 CSV / JSONL 명부를 chunk_size 행씩 읽어 계산하고, 결과를 바로 CSV / JSONL / Parquet 에 기록
+- CSV 는 pandas 청크 읽기 (따옴표 안 줄바꿈도 한 행), 컬럼 형식은 batch.ROSTER_DTYPES 로 고정 → 청크마다 같은 형식
+- 최대 메모리 사용량은 파일 크기와 무관 (청크 1개 분량)
+- 청크마다 체크포인트(<출력>.ckpt)에 입력 위치(CSV: 읽은 행 수, JSONL: 바이트 위치)를 남겨 중단 시 이어서 실행
+"""
+import json
+import os
+import shutil
+from time import perf_counter
+
+import pandas as pd
+
+from batch import ROSTER_DTYPES, calc_roster
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _fmt(path: str) -> str:
+    """확장자로 형식 판별: csv / jsonl / parquet."""
+    p = str(path).lower().rstrip("/\\")
+    if p.endswith(".csv"):
+        return "csv"
+    if p.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if p.endswith(".parquet"):
+        return "parquet"
+    raise ValueError(f"지원하지 않는 형식입니다 (csv / jsonl / parquet): {path}")
+
+
+# =========================
+# 📥 읽기
+# =========================
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    """있는 컬럼만 ROSTER_DTYPES 형식으로."""
+    return df.astype({c: t for c, t in ROSTER_DTYPES.items() if c in df.columns})
+
+def _csv_chunks(src: str, chunk_size: int, start_offset: int):
+    """
+    CSV 청크: pandas 청크 읽기 (따옴표 안 줄바꿈 포함 레코드 단위), start_offset = 이미 읽은 행 수
+    - 빈 줄도 행으로 세어(skip_blank_lines=False) 이어 읽기 위치가 skiprows 와 어긋나지 않게 하고, 읽은 뒤 제거
+    - skiprows 는 함수로 (range 는 건너뛸 행 번호 집합을 만들어 이어 읽기 위치만큼 메모리가 늘어남)
+    """
+    reader = pd.read_csv(src, chunksize=chunk_size, dtype=ROSTER_DTYPES, skip_blank_lines=False,
+                         skiprows=lambda i: 0 < i <= start_offset)
+    pos = start_offset
+    with reader:
+        for chunk in reader:
+            pos += len(chunk)
+            chunk = chunk.dropna(how="all")
+            if len(chunk):
+                yield chunk.reset_index(drop=True), pos
+
+def _jsonl_chunks(src: str, chunk_size: int, start_offset: int):
+    """JSONL 청크: 한 줄 = 한 직원 레코드, start_offset = 바이트 위치."""
+    with open(src, "rb") as f:
+        if start_offset:
+            f.seek(start_offset)
+        while True:
+            lines = []
+            while len(lines) < chunk_size:
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    lines.append(line)
+            if not lines:
+                return
+            yield _typed(pd.DataFrame([json.loads(line) for line in lines])), f.tell()
+
+def iter_chunks(src: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start_offset: int = 0):
+    """
+    [청크 단위 읽기] chunk_size 행씩, 컬럼 형식은 ROSTER_DTYPES
+    - CSV: 따옴표 안 줄바꿈은 한 행, 위치 = 읽은 행 수 (헤더 제외)
+    - JSONL: 한 줄 = 한 직원 레코드, 위치 = 바이트
+    - yield (청크 DataFrame, 청크 끝 위치)
+    """
+    fmt = _fmt(src)
+    if fmt == "parquet":
+        raise ValueError("스트리밍 입력은 CSV / JSONL 만 지원합니다.")
+    return (_csv_chunks if fmt == "csv" else _jsonl_chunks)(src, chunk_size, start_offset)
+
+
+# =========================
+# 📤 쓰기
+# =========================
+def _write_chunk(dst: str, fmt: str, df: pd.DataFrame, part: int, header: bool) -> int:
+    """결과 청크 기록 → 기록 후 출력 위치 (CSV/JSONL: 바이트, Parquet: 다음 파트 번호)."""
+    if fmt == "parquet":
+        os.makedirs(dst, exist_ok=True)
+        df.to_parquet(os.path.join(dst, f"part-{part:05d}.parquet"), index=False)
+        return part + 1
+    with open(dst, "ab") as f:
+        if fmt == "csv":
+            df.to_csv(f, index=False, header=header)
+        else:
+            text = df.to_json(orient="records", lines=True, force_ascii=False) if len(df) else ""
+            if text:  # 빈 청크(필터 결과 0행)는 빈 줄 없이 건너뜀
+                f.write((text if text.endswith("\n") else text + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+def _reset_output(dst: str, fmt: str, out_offset: int):
+    """출력을 체크포인트 시점으로 되돌림 (중단 중 기록된 꼬리 제거)."""
+    if fmt == "parquet":
+        if os.path.isdir(dst):
+            for name in os.listdir(dst):
+                if name.startswith("part-") and int(name[5:].split(".")[0]) >= out_offset:
+                    os.remove(os.path.join(dst, name))
+        return
+    if os.path.exists(dst):
+        with open(dst, "r+b") as f:
+            f.truncate(out_offset)
+
+
+# =========================
+# 🔖 체크포인트
+# =========================
+def _ckpt_path(dst: str) -> str:
+    return str(dst).rstrip("/\\") + ".ckpt"
+
+def _load_ckpt(dst: str) -> dict | None:
+    path = _ckpt_path(dst)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_ckpt(dst: str, state: dict):
+    """임시 파일에 쓰고 교체 → 중단돼도 체크포인트가 깨지지 않음."""
+    path = _ckpt_path(dst)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+# =========================
+# 🚰 실행
+# =========================
+def stream_roster(src: str, dst: str, func=calc_roster, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  resume: bool = True) -> dict:
+    """
+    [스트리밍 일괄 계산]
+    - src: CSV / JSONL 명부 (월급 계산: gwage, 월휴무: monthly_off 컬럼 포함 시 자동 환산)
+    - dst: 결과 CSV / JSONL / Parquet(파트 파일 디렉터리)
+    - func: 청크 DataFrame → 결과 DataFrame (기본 calc_roster, 역산은 reverse_roster)
+    - resume: 체크포인트가 있으면 마지막으로 기록된 위치부터 이어서 실행
+    - 결과 컬럼은 첫 청크 기준으로 고정(체크포인트에 저장)하고 이후 청크는 그 순서로 맞춤
+      (JSONL 레코드마다 키가 달라도 CSV 헤더 · Parquet 파트 스키마가 어긋나지 않음, 나중 청크에만 있는 컬럼은 제외)
+    - 반환: {"rows", "chunks", "resumed_from"(CSV: 행 수, JSONL: 바이트), "seconds"}
+    """
+    t0 = perf_counter()
+    fmt = _fmt(dst)
+    src_abs = os.path.abspath(src)
+    in_unit = "rows" if _fmt(src) == "csv" else "bytes"
+    state = _load_ckpt(dst) if resume else None
+    if state is not None and state["src"] != src_abs:
+        raise ValueError(f"체크포인트의 입력 파일이 다릅니다: {state['src']}")
+    if state is not None and state.get("in_unit") != in_unit:
+        raise ValueError(f"체크포인트의 입력 위치 단위가 다릅니다 (처음부터 다시 실행하세요): {_ckpt_path(dst)}")
+    if state is None:
+        state = {"src": src_abs, "in_unit": in_unit, "in_offset": 0, "out_offset": 0, "rows": 0, "chunks": 0}
+        if os.path.isdir(dst):
+            shutil.rmtree(dst)
+        elif os.path.exists(dst):
+            os.remove(dst)
+    resumed_from = state["in_offset"]
+    _reset_output(dst, fmt, state["out_offset"])
+
+    for chunk, in_offset in iter_chunks(src, chunk_size, state["in_offset"]):
+        out = func(chunk)
+        if state.get("columns") is None:
+            state["columns"] = [str(c) for c in out.columns]
+        else:
+            out = out.reindex(columns=state["columns"])
+        state["out_offset"] = _write_chunk(dst, fmt, out, state["out_offset"],
+                                           header=state["out_offset"] == 0)
+        state["in_offset"] = in_offset
+        state["rows"] += len(out)
+        state["chunks"] += 1
+        _save_ckpt(dst, state)
+
+    if os.path.exists(_ckpt_path(dst)):
+        os.remove(_ckpt_path(dst))
+    return {"rows": state["rows"], "chunks": state["chunks"],
+            "resumed_from": resumed_from, "seconds": perf_counter() - t0}
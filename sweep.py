@@ -0,0 +1,142 @@
+"""
+민감도 분석 (what-if 격자 계산)
+
+    sweep({"start": "10:00", "end": "23:00", "meal": 100_000},
+          {"gwage": range(10_030, 12_001, 10), "break_min": [30, 60, 90], "is_5p": [True, False]})
+
+- 기준 입력(base) + 바꿔 볼 입력별 값 목록(grid) → 모든 조합의 월급 계산 결과 (tidy DataFrame, 조합당 1행)
+- 시간 단계와 금액 단계를 나눠 계산
+    시간(월 시간): start, end, break_min, days_wk / monthly_off, ceil_on 조합마다 shift_profile 한 번 (LRU 캐시)
+    금액: gwage, meal, car, is_5p, opt_* 는 시간 결과를 다시 계산하지 않고 calc_pay_arr 로 전체 격자를 한 번에
+- 결과는 같은 입력의 월급 계산(calc_pay)과 동일
+"""
+from datetime import time
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from batch import RESULT_COLUMNS, ROSTER_DEFAULTS, calc_pay_arr
+from payroll import offday_days_wk, shift_profile
+from rules import DEFAULT_RULES, RuleSet
+
+HOUR_PARAMS = ("start", "end", "break_min", "days_wk", "monthly_off", "ceil_on")
+PAY_PARAMS = ("gwage", "meal", "car", "is_5p", "opt_basic", "opt_holiday", "opt_ot", "opt_night")
+SWEEP_PARAMS = HOUR_PARAMS + PAY_PARAMS
+MAX_CELLS = 5_000_000
+
+
+def _time(v) -> time:
+    """datetime.time 또는 "HH:MM"."""
+    if isinstance(v, time):
+        return v
+    h, m = str(v).split(":")[:2]
+    return time(int(h), int(m))
+
+def _hours(p: dict, rules: RuleSet = DEFAULT_RULES) -> tuple:
+    """시간 단계 1회: 근무 입력 → (주 근로일, base, holiday, ot, night)."""
+    if p.get("monthly_off") is not None:
+        _, days_wk = offday_days_wk(float(p["monthly_off"]), rules)
+    else:
+        days_wk = float(p["days_wk"])
+    hrs = shift_profile(_time(p["start"]), _time(p["end"]), float(p["break_min"]), days_wk, bool(p["ceil_on"]),
+                        rules)
+    return (days_wk, *hrs)
+
+def sweep(base: dict, grid: dict, rules: RuleSet = DEFAULT_RULES) -> pd.DataFrame:
+    """
+    [민감도 격자 계산]
+    - base: 고정 입력 (start, end 필수, 나머지는 batch.ROSTER_DEFAULTS). monthly_off 를 주면 월휴무 계산
+    - grid: {입력 이름: 값 목록}, 이름은 SWEEP_PARAMS 중에서
+    - rules: 계산 규칙 (rules.rules_for)
+    - 반환: grid 입력 컬럼 + days_wk + RESULT_COLUMNS (조합 순서: grid 키 순서의 데카르트 곱)
+    """
+    unknown = [k for k in grid if k not in SWEEP_PARAMS]
+    if unknown:
+        raise ValueError(f"민감도 분석에 쓸 수 없는 입력입니다: {unknown} (가능: {list(SWEEP_PARAMS)})")
+    if "days_wk" in grid and ("monthly_off" in grid or base.get("monthly_off") is not None):
+        raise ValueError("days_wk 와 monthly_off 는 함께 바꿀 수 없습니다.")
+    params = {**ROSTER_DEFAULTS, **base}
+    if "days_wk" in grid:
+        params.pop("monthly_off", None)
+    missing = [k for k in ("start", "end", "gwage") if k not in params and k not in grid]
+    if missing:
+        raise ValueError(f"기준 입력에 필수 값이 없습니다: {missing}")
+
+    values = {k: list(v) for k, v in grid.items()}
+    empty = [k for k, v in values.items() if not v]
+    if empty:
+        raise ValueError(f"값 목록이 비어 있습니다: {empty}")
+    hour_keys = [k for k in grid if k in HOUR_PARAMS]
+    pay_keys = [k for k in grid if k in PAY_PARAMS]
+    n_hour = int(np.prod([len(values[k]) for k in hour_keys]))
+    n_pay = int(np.prod([len(values[k]) for k in pay_keys]))
+    if n_hour * n_pay > MAX_CELLS:
+        raise ValueError(f"조합이 너무 많습니다: {n_hour * n_pay:,} (최대 {MAX_CELLS:,})")
+
+    # 1) 시간 단계: 시간에 영향을 주는 입력 조합마다 한 번
+    hour_combos = list(product(*[values[k] for k in hour_keys]))
+    hours = np.array([_hours({**params, **dict(zip(hour_keys, c))}, rules) for c in hour_combos],
+                     dtype=float).reshape(n_hour, 5)
+    bad = (hours[:, 1] + hours[:, 2]) <= 0
+    if bad.any():
+        combos = [dict(zip(hour_keys, c)) for c, b in zip(hour_combos, bad) if b][:5]
+        raise ValueError(f"분모 시간(기본근로+주휴)이 0인 조합이 있습니다: {combos}")
+    days_wk, base_h, holiday, ot, night = np.repeat(hours, n_pay, axis=0).T
+
+    # 2) 금액 단계: 금액 입력 격자 × 시간 결과 전체를 배열 한 번으로
+    pay_grid = np.meshgrid(*[np.asarray(values[k]) for k in pay_keys], indexing="ij") if pay_keys else []
+    n = n_hour * n_pay
+    cols = {k: np.tile(g.ravel(), n_hour) for k, g in zip(pay_keys, pay_grid)}
+    for k in PAY_PARAMS:
+        if k not in cols:
+            cols[k] = np.full(n, params[k])
+    pay = calc_pay_arr(
+        cols["gwage"].astype(np.int64), base_h, holiday, ot, night,
+        meal=cols["meal"].astype(np.int64), car=cols["car"].astype(np.int64),
+        is_5p=cols["is_5p"].astype(bool), opt_basic=cols["opt_basic"].astype(bool),
+        opt_holiday=cols["opt_holiday"].astype(bool), opt_ot=cols["opt_ot"].astype(bool),
+        opt_night=cols["opt_night"].astype(bool), rules=rules,
+    )
+
+    out = {}
+    for k in grid:
+        if k in HOUR_PARAMS:
+            i = hour_keys.index(k)
+            out[k] = np.repeat(np.array([c[i] for c in hour_combos], dtype=object), n_pay)
+        else:
+            out[k] = cols[k]
+    df = pd.DataFrame(out)
+    for k in hour_keys:
+        df[k] = df[k].infer_objects()
+    df["days_wk"] = days_wk
+    df["monthly_base"], df["monthly_holiday"], df["monthly_ot"], df["monthly_night"] = base_h, holiday, ot, night
+    for c in RESULT_COLUMNS[4:]:
+        df[c] = pay[c]
+    return df
+
+def frange(start: float, stop: float, step: float) -> list:
+    """start ~ stop (양 끝 포함) step 간격 값 목록. 정수 입력이면 정수."""
+    if step <= 0:
+        raise ValueError("간격은 0보다 커야 합니다.")
+    n = int(round((stop - start) / step)) + 1
+    vals = [start + i * step for i in range(max(0, n)) if start + i * step <= stop + 1e-9]
+    if all(float(x).is_integer() for x in (start, step)):
+        return [int(v) for v in vals]
+    return [round(v, 6) for v in vals]
+
+def parse_values(text: str) -> list:
+    """
+    값 목록 입력 파싱 (Streamlit 화면용)
+    - "10030:12000:10" → 10030 ~ 12000, 10 간격
+    - "30, 60, 90"     → [30, 60, 90]
+    """
+    text = text.strip()
+    try:
+        if ":" in text:
+            start, stop, step = (float(x) for x in text.split(":"))
+            return frange(start, stop, step)
+        vals = [float(x) for x in text.replace(" ", "").split(",") if x]
+    except ValueError:
+        raise ValueError(f"값 목록 형식이 올바르지 않습니다: {text!r} (예: 10030:12000:10 또는 30,60,90)")
+    return [int(v) if v.is_integer() else v for v in vals]
@@ -0,0 +1,5 @@
+"""pytest 공통: 저장소 루트(평면 모듈)를 import 경로에."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
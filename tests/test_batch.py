@@ -0,0 +1,44 @@
+"""batch 일괄 역산 ↔ payroll 스칼라 역산 동등성 (check_reverse_against_scalar)."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import _flag, check_reverse_against_scalar
+from bench import make_reverse_roster
+from rules import DEFAULT_RULES, RuleTable
+
+
+def _calendar_roster(n: int, seed: int) -> pd.DataFrame:
+    """달력 기준(off_days) · 월휴무 · 주 근로일 행이 섞인 역산 명부 (귀속 월 여러 개)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "start": rng.choice(["09:00", "10:00", "13:30", "21:00"], n),
+        "end": rng.choice(["18:00", "23:00", "06:00", "20:30"], n),
+        "break_min": rng.choice([30, 60], n),
+        "salary": rng.integers(2_500_000, 6_000_000, n),
+        "pay_month": rng.choice(["2025-12", "2026-02", "2026-03"], n),
+        "off_days": rng.choice(["토일", "일", "5,6", "", None], n),
+        "monthly_off": rng.choice([4, 6, 8], n),
+    })
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_reverse_matches_scalar(seed):
+    assert check_reverse_against_scalar(make_reverse_roster(300, seed)).empty
+
+
+def test_reverse_matches_scalar_calendar_rows():
+    assert check_reverse_against_scalar(_calendar_roster(300, 3)).empty
+
+
+def test_reverse_matches_scalar_rule_table():
+    table = RuleTable([(date(2020, 1, 1), DEFAULT_RULES),
+                       (date(2026, 2, 1), DEFAULT_RULES._replace(max_weekly_hours=36, ot_factor=2.0))])
+    assert check_reverse_against_scalar(_calendar_roster(300, 4), rules=table).empty
+
+
+def test_flag_blank_uses_column_default():
+    assert _flag(pd.Series([np.nan, 0.0], name="is_5p")).tolist() == [True, False]
+    assert _flag(pd.Series([None, "올림"], name="opt_ot", dtype=object)).tolist() == [False, True]
@@ -0,0 +1,44 @@
+"""부동소수(batch) ↔ 정수(exact) 모드 동등성 (diff_roster)."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from bench import make_offday_roster, make_reverse_roster, make_roster
+from exact import diff_roster
+from rules import DEFAULT_RULES, RuleTable
+
+# 월 시간을 올림(ceil_on)하면 시간이 정수 → 두 모드의 금액이 같아야 함
+# (올림 안 한 분수 시간은 부동소수 반올림으로 몇 원 다를 수 있어 diff_roster 가 보고하는 대상)
+GENERATORS = [(make_roster, False), (make_offday_roster, False), (make_reverse_roster, True)]
+
+
+def _ceiled(df):
+    return df[df["ceil_on"]].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("make, reverse", GENERATORS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_float_matches_exact(make, reverse, seed):
+    assert diff_roster(_ceiled(make(500, seed)), reverse).empty
+
+
+@pytest.mark.parametrize("make, reverse", GENERATORS)
+def test_float_matches_exact_rule_table(make, reverse):
+    table = RuleTable([(date(2020, 1, 1), DEFAULT_RULES),
+                       (date(2026, 2, 1), DEFAULT_RULES._replace(max_weekly_hours=36, ot_factor=2.0))])
+    df = _ceiled(make(500, 2))
+    df["pay_month"] = ["2025-12", "2026-03"] * (len(df) // 2) + ["2026-03"] * (len(df) % 2)
+    assert diff_roster(df, reverse, table).empty
+
+
+@pytest.mark.parametrize("make, reverse", GENERATORS)
+def test_float_matches_exact_calendar(make, reverse):
+    """off_days 행(달력 기준 월휴무)도 정수 모드로 계산 — 빈 값 행은 기존 환산과 섞어서."""
+    df = _ceiled(make(500, 3))
+    rng = np.random.default_rng(3)
+    df["off_days"] = rng.choice(["토일", "일", "월화", "56", "없음", ""], len(df))
+    df["pay_month"] = rng.choice(["2025-06", "2025-12", "2026-02", "2026-03"], len(df))
+    table = RuleTable([(date(2020, 1, 1), DEFAULT_RULES),
+                       (date(2026, 2, 1), DEFAULT_RULES._replace(max_weekly_hours=36, ot_factor=2.0))])
+    assert diff_roster(df, reverse, table).empty
@@ -0,0 +1,50 @@
+"""연차 원장 증분 재계산 ↔ accrual_workforce 전체 재계산 동등성."""
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from accrual import accrual_workforce
+from ledger import AccrualLedger
+
+
+def _workforce(n: int, seed: int):
+    """1년 미만 · 1년 이상 직원이 섞인 (직원, WSH 변경표)."""
+    rng = random.Random(seed)
+    emps, changes = [], []
+    for i in range(n):
+        join = date(2023, 1, 1) + timedelta(days=rng.randint(0, 700))
+        target = date(join.year + rng.randint(1, 2), join.month, min(join.day, 28))
+        emps.append(dict(employee_id=i, join_dt=join, default_wsh=rng.choice([2.0, 3.0, 4.0]),
+                         target_anniv=target, end_limit=join + timedelta(days=364)))
+        for _ in range(rng.randint(0, 3)):
+            changes.append(dict(employee_id=i, eff_date=join + timedelta(days=rng.randint(1, 900)),
+                                wsh=rng.choice([1.5, 2.4, 3.0, 5.0])))
+    return pd.DataFrame(emps), pd.DataFrame(changes).drop_duplicates(["employee_id", "eff_date"])
+
+
+def _same(full: pd.DataFrame, ledger: pd.DataFrame, keys: list[str]) -> None:
+    full = full.sort_values(keys).reset_index(drop=True)[ledger.columns]
+    differs = (full.astype(object).to_numpy() != ledger.astype(object).to_numpy()).any(axis=1)
+    assert not differs.any(), full[differs].head().to_string()
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_incremental_matches_full_recompute(tmp_path, seed):
+    employees, changes = _workforce(120, seed)
+    first = changes.sample(frac=0.5, random_state=seed)
+    rest = changes.drop(first.index).sample(frac=1, random_state=seed + 1)  # 효력일 순서 섞어서 적용
+
+    ledger = AccrualLedger(str(tmp_path / "ledger.sqlite"))
+    try:
+        ledger.init(employees, first)
+        ledger.apply_changes(rest)
+        awards, segments = ledger.awards(), ledger.segments()
+    finally:
+        ledger.close()
+
+    full_awards, full_segments = accrual_workforce(employees, changes)
+    assert len(awards) == len(full_awards) and len(segments) == len(full_segments)
+    _same(full_awards, awards, ["employee_id", "award_date"])
+    _same(full_segments, segments, ["employee_id", "start"])
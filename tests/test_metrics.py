@@ -0,0 +1,38 @@
+"""metrics.collect 범위: 스레드(세션)별 Collector, 전역 상태 복원."""
+import threading
+
+import metrics
+
+
+def test_interleaved_collect_scopes():
+    """A 진입 → B 진입 → A 종료 → B 종료 순서에서도 서로 섞이지 않고, 끝나면 꺼짐."""
+    a_in, b_in, a_out = threading.Event(), threading.Event(), threading.Event()
+    got = {}
+
+    def session_a():
+        with metrics.collect() as c:
+            a_in.set()
+            b_in.wait()
+            metrics.observe("a", 0.001)
+        got["a"] = c
+        a_out.set()
+
+    def session_b():
+        a_in.wait()
+        with metrics.collect() as c:
+            b_in.set()
+            a_out.wait()
+            assert metrics.ENABLED
+            metrics.observe("b", 0.001)
+        got["b"] = c
+
+    threads = [threading.Thread(target=session_a), threading.Thread(target=session_b)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not metrics.ENABLED
+    assert list(metrics.snapshot(got["a"])["stages"]) == ["a"]
+    assert list(metrics.snapshot(got["b"])["stages"]) == ["b"]
+    assert "a" not in metrics.snapshot()["stages"] and "b" not in metrics.snapshot()["stages"]
@@ -0,0 +1,68 @@
+"""달력 기준 월휴무 (monthcal.calendar_weeks / calendar_profile, 명부 off_days)."""
+import json
+from datetime import date, time
+
+import numpy as np
+import pandas as pd
+
+from batch import calc_roster
+from monthcal import calendar_profile, calendar_weeks, month_days, month_weeks
+from rules import DEFAULT_RULES
+from stream import stream_roster
+
+
+def test_leading_zero_off_days_from_csv(tmp_path):
+    """CSV 의 "06"(월·일)은 숫자 6(일)이 아니라 두 요일 — 파일 읽기 · 스트리밍 모두."""
+    roster = pd.DataFrame({"start": ["10:00"] * 2, "end": ["19:00"] * 2, "gwage": [10_030] * 2,
+                           "off_days": ["06", "6"], "pay_month": ["2026-03"] * 2})
+    src = tmp_path / "roster.csv"
+    roster.to_csv(src, index=False)
+
+    from_file = calc_roster(str(src))
+    assert from_file["monthly_base"].tolist() == calc_roster(roster)["monthly_base"].tolist()
+    assert from_file["monthly_base"].iloc[0] < from_file["monthly_base"].iloc[1]
+
+    stream_roster(str(src), str(tmp_path / "out.csv"), resume=False)
+    streamed = pd.read_csv(tmp_path / "out.csv")
+    assert streamed["total"].tolist() == from_file["total"].tolist()
+
+
+def test_holiday_not_bumped_by_weekly_rounding():
+    """2025-06 휴무 없음 4h/일: 주별 기본근로 4+28×4+4 = 120h → 주휴 정확히 24h (주별 ÷5 합이면 올림 후 25h)."""
+    hrs = calendar_profile(time(10), time(14), 0, 2025, 6, (), True)
+    assert (hrs.base, hrs.holiday) == (120, 24)
+
+
+def test_partial_weeks_at_month_edges():
+    """2026-03: 1일이 일요일 → 첫 주는 2월 6일이 상한을 먼저 채움, 마지막 주는 3/30~31 이틀."""
+    weeks = month_weeks(2026, 3, ())
+    assert weeks[0].start == date(2026, 2, 23) and weeks[-1].end == date(2026, 4, 5)
+    assert [(w.before, w.days) for w in weeks] == [(6, 1), (0, 7), (0, 7), (0, 7), (0, 7), (0, 2)]
+    assert month_days(2026, 3, ()) == (31, 0)
+    assert month_days(2026, 2, (5, 6)) == (20, 8)
+
+    # 8h/일: 첫 주는 앞 달 48h 로 상한 초과 → 3/1 은 전부 연장, 가운데 주 40h + 16h, 마지막 주 16h 기본
+    hrs = calendar_weeks(time(10), time(19), 60, 2026, 3, ())
+    assert [(w.base, w.ot) for w in hrs] == [(0, 8), (40, 16), (40, 16), (40, 16), (40, 16), (16, 0)]
+    prof = calendar_profile(time(10), time(19), 60, 2026, 3, (), True)
+    assert (prof.base, prof.ot) == (176, 72)
+    assert prof.holiday == min(np.ceil(176 / 5), DEFAULT_RULES.max_monthly_holiday)
+
+
+def test_blank_off_days_fall_back_to_weekly(tmp_path):
+    """off_days 빈 값(NaN · "" · 공백)은 기존 주 근로일 환산, "없음"은 휴무 요일 없는 달력 계산."""
+    off = [None, "", "  ", "없음", "토일"]
+    roster = pd.DataFrame({"start": ["10:00"] * 5, "end": ["19:00"] * 5, "gwage": [10_030] * 5,
+                           "off_days": off, "pay_month": ["2026-03"] * 5})
+    out = calc_roster(roster)
+    weekly = calc_roster(roster.drop(columns="off_days"))
+    assert out["total"].iloc[:3].tolist() == weekly["total"].iloc[:3].tolist()
+    assert out["monthly_base"].iloc[3] == calendar_profile(time(10), time(19), 60, 2026, 3, (), True).base
+    assert out["monthly_base"].iloc[4] == calendar_profile(time(10), time(19), 60, 2026, 3, (5, 6), True).base
+    assert len(set(out["total"].iloc[2:])) == 3
+
+    # JSONL 은 빈 off_days 가 "" 로 들어옴 (25200a6)
+    src = tmp_path / "roster.jsonl"
+    src.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in roster.to_dict("records")), encoding="utf-8")
+    stream_roster(str(src), str(tmp_path / "out.csv"), resume=False)
+    assert pd.read_csv(tmp_path / "out.csv")["total"].tolist() == out["total"].tolist()
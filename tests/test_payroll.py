@@ -0,0 +1,52 @@
+"""시급 역산 (payroll.solve_base_wage) ↔ 기존 ±1원 선형 탐색."""
+from datetime import time
+
+import numpy as np
+import pytest
+
+from payroll import calc_pay, monthly_hours, solve_base_wage, won_ceil
+from rules import DEFAULT_RULES
+
+RULE_SETS = [DEFAULT_RULES, DEFAULT_RULES._replace(max_weekly_hours=36, ot_factor=2.0)]
+
+
+def _linear_scan(salary, hrs, meal, car, is_5p, opts, rules):
+    """지수 탐색 이전 app.py 의 역산: 초기 추정치에서 1원씩 내리거나 올림."""
+    def simulate_total(gwage):
+        return calc_pay(gwage, hrs, meal, car, is_5p, *opts, rules)
+
+    bw = max(0, won_ceil((salary - meal - car) / hrs.denom))
+    res = simulate_total(bw)
+    if res.total > salary:
+        while bw > 0:
+            bw -= 1
+            res = simulate_total(bw)
+            if res.total <= salary:
+                break
+    else:
+        while simulate_total(bw + 1).total <= salary:
+            bw += 1
+            res = simulate_total(bw)
+    if res.total > salary:
+        bw = 0
+        res = simulate_total(bw)
+    return bw, res
+
+
+@pytest.mark.parametrize("rules", RULE_SETS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_matches_linear_scan(seed, rules):
+    rng = np.random.default_rng(seed)
+    for _ in range(30):
+        start = time(int(rng.integers(0, 24)), int(rng.choice([0, 15, 30, 45])))
+        end = time(int(rng.integers(0, 24)), int(rng.choice([0, 10, 30])))
+        hrs = monthly_hours(start, end, float(rng.choice([0, 30, 60])), float(rng.choice([3, 5, 5.5, 6, 7])),
+                            bool(rng.random() < 0.5), rules)
+        if hrs.denom <= 0:
+            continue
+        meal, car = int(rng.choice([0, 100_000, 500_000])), int(rng.choice([0, 200_000]))
+        salary = int(rng.integers(50, 900)) * 10_000 + int(rng.integers(0, 10_000))  # 고정수당보다 작은 월급도 포함
+        is_5p = bool(rng.random() < 0.7)
+        opts = tuple(bool(x) for x in rng.random(4) < 0.4)
+        assert solve_base_wage(salary, hrs, meal, car, is_5p, *opts, rules) == \
+            _linear_scan(salary, hrs, meal, car, is_5p, opts, rules)
@@ -0,0 +1,47 @@
+"""스트리밍 계산 (stream.py): 청크 · 이어 읽기 결과가 한 번에 계산한 결과와 같은지."""
+import json
+
+import pandas as pd
+import pytest
+
+from batch import calc_roster
+from bench import make_roster
+from stream import stream_roster
+
+
+def test_chunks_and_resume_match_full_run(tmp_path):
+    roster = make_roster(900, 2)
+    roster.insert(0, "name", [f"kim\n{i}" if i % 7 == 0 else f"lee {i}" for i in range(len(roster))])
+    src = tmp_path / "roster.csv"
+    roster.to_csv(src, index=False)
+    expected = calc_roster(roster)
+
+    calls = []
+    def stop_after_two(chunk):
+        calls.append(len(chunk))
+        if len(calls) == 3:
+            raise RuntimeError("중단")
+        return calc_roster(chunk)
+
+    dst = tmp_path / "out.csv"
+    with pytest.raises(RuntimeError):
+        stream_roster(str(src), str(dst), func=stop_after_two, chunk_size=250, resume=False)
+    stats = stream_roster(str(src), str(dst), chunk_size=250)
+    out = pd.read_csv(dst)
+    assert stats["resumed_from"] == 500
+    assert out["name"].tolist() == expected["name"].tolist()  # 따옴표 안 줄바꿈도 한 행
+    assert out["total"].tolist() == expected["total"].tolist()
+
+
+def test_jsonl_varying_keys_keep_first_chunk_columns(tmp_path):
+    base = {"start": "10:00", "end": "19:00", "gwage": 10_030}
+    records = [base] * 2 + [{**base, "employee_id": 7, "meal": 100_000}] * 2 + [{"end": "18:00", **base}] * 2
+    src = tmp_path / "roster.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    dst = tmp_path / "out.csv"
+    stream_roster(str(src), str(dst), chunk_size=2, resume=False)
+    out = pd.read_csv(dst)
+    first = calc_roster(pd.DataFrame(records[:2]))
+    assert out.columns.tolist() == first.columns.tolist()
+    assert out["total"].tolist() == calc_roster(pd.DataFrame(records))["total"].tolist()
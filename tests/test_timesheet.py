@@ -0,0 +1,69 @@
+"""타임시트 (timesheet.punch_hours / calc_timesheet): ISO 주 상한, 자정 넘김, 기록 월 규칙."""
+from datetime import date
+
+import pandas as pd
+
+from payroll import MonthlyHours, calc_pay
+from rules import DEFAULT_RULES, RuleTable
+from timesheet import calc_timesheet, punch_hours
+
+ONE_RULE = RuleTable([(date(2020, 1, 1), DEFAULT_RULES)])
+FEB_RULES = DEFAULT_RULES._replace(max_weekly_hours=36, ot_factor=2.0)
+TABLE = RuleTable([(date(2020, 1, 1), DEFAULT_RULES), (date(2026, 2, 1), FEB_RULES)])
+
+
+def _punches(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["employee_id", "punch_in", "punch_out", "break_min"])
+
+
+def test_iso_week_cap_in_punch_order():
+    """주 40h 는 같은 ISO 주 안에서 출근 순서대로 채움 (입력 순서 · 다른 직원 · 다음 주와 무관)."""
+    days = ["2024-08-05", "2024-08-06", "2024-08-07", "2024-08-08", "2024-08-09", "2024-08-10"]  # 월~토
+    rows = [("A", f"{d} 09:00", f"{d} 18:00", 0) for d in days]
+    rows += [("B", "2024-08-06 08:00", "2024-08-06 18:00", 0), ("A", "2024-08-12 09:00", "2024-08-12 18:00", 0)]
+    df = _punches(rows).iloc[[5, 2, 7, 0, 4, 6, 1, 3]]  # 섞어서 입력
+
+    out = punch_hours(df, rules=ONE_RULE).sort_values(["employee_id", "punch_in"])
+    assert out["iso_week"].tolist() == ["2024-W32"] * 6 + ["2024-W33", "2024-W32"]
+    assert out["base_h"].tolist() == [9, 9, 9, 9, 4, 0, 9, 10]
+    assert out["ot_h"].tolist() == [0, 0, 0, 0, 5, 9, 0, 0]
+    assert punch_hours(df, rules=ONE_RULE).index.tolist() == df.index.tolist()  # 행 순서는 입력 그대로
+
+
+def test_cross_midnight_punches():
+    """자정 · 여러 날 넘김 근무는 출근 시각의 주에 넣고, 야간은 22~06 겹침 전부."""
+    out = punch_hours(_punches([
+        ("A", "2024-08-11 22:00", "2024-08-12 07:00", 60),   # 일 → 월: 출근한 일요일의 주
+        ("B", "2024-08-10 20:00", "2024-08-12 02:00", 60),   # 토 → 월 (30시간)
+        ("C", "2024-12-30 22:00", "2024-12-31 06:00", 0),    # ISO 연도 경계: 2025-W01
+        ("D", "2025-12-28 23:30", "2025-12-29 00:30", 0),    # 일요일 출근: 2025-W52
+    ]), rules=ONE_RULE)
+    assert out["iso_week"].tolist() == ["2024-W32", "2024-W32", "2025-W01", "2025-W52"]
+    assert out["work_h"].tolist() == [8, 29, 8, 1]
+    assert out["night_h"].tolist() == [8, 12, 8, 1]
+    assert out["base_h"].tolist() == [8, 29, 8, 1]
+
+
+def test_record_month_rules():
+    """주 상한은 기록의 출근 월 규칙, 주휴 상한 · 가산계수는 직원의 마지막 기록 월 규칙."""
+    jan = ["2026-01-26", "2026-01-27", "2026-01-28", "2026-01-29"]  # 월~목 (1월 규칙: 40h)
+    rows = [("A", f"{d} 09:00", f"{d} 17:00", 0) for d in jan]
+    rows.append(("A", "2026-02-01 09:00", "2026-02-01 17:00", 0))  # 같은 주 일요일 (2월 규칙: 36h)
+    rows += [("B", f"2026-01-{d} 09:00", f"2026-01-{d} 17:00", 0) for d in range(12, 18)]  # 1월 월~토 48h
+    punches = _punches(rows)
+
+    rec = punch_hours(punches, rules=TABLE)
+    assert rec["pay_month"].tolist() == ["2026-01"] * 4 + ["2026-02"] + ["2026-01"] * 6
+    assert rec.loc[4, ["base_h", "ot_h"]].tolist() == [4, 4]  # 32h 뒤 36h 상한 → 4h 기본, 4h 연장
+
+    out = calc_timesheet(punches, rules=TABLE, gwage=10_030, is_5p=True).set_index("employee_id")
+    assert out["pay_month"].to_dict() == {"A": "2026-02", "B": "2026-01"}
+    for emp, rs in (("A", FEB_RULES), ("B", DEFAULT_RULES)):
+        r = out.loc[emp]
+        hrs = MonthlyHours(r["monthly_base"], r["monthly_holiday"], r["monthly_ot"], r["monthly_night"])
+        assert r["monthly_ot"] > 0
+        expected = calc_pay(10_030, hrs, 0, 0, True, rules=rs)
+        assert (r["normal_wage"], r["total"], r["overtime_pay"]) == \
+            (expected.normal_wage, expected.total, expected.overtime_pay)
+        if emp == "A":  # 1월 가산계수(1.5배)였다면 연장수당이 달라짐
+            assert r["overtime_pay"] != calc_pay(10_030, hrs, 0, 0, True, rules=DEFAULT_RULES).overtime_pay
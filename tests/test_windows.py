@@ -0,0 +1,84 @@
+"""가산 시간대 겹침 (windows.WindowSet / overlap_minutes / night_minutes) ↔ 분 단위 전수 비교."""
+import numpy as np
+import pytest
+
+from windows import (MINUTES_PER_DAY, NIGHT, AbsoluteWindow, DailyWindow, absolute_window, daily_window,
+                     epoch_minutes, holiday_windows, night_minutes, night_minutes_scalar, overlap_minutes,
+                     shift_minutes)
+
+BASE = epoch_minutes("2024-08-13")  # 2024-08-15(목) 공휴일 이틀 전 00:00
+
+
+def _inside(t: np.ndarray, w) -> np.ndarray:
+    """분 배열 t 의 각 분이 시간대 w 안인지."""
+    if isinstance(w, AbsoluteWindow):
+        return (w.start <= t) & (t < w.end)
+    m = t % MINUTES_PER_DAY
+    if w.end > w.start:
+        return (w.start <= m) & (m < w.end)
+    return (m >= w.start) | (m < w.end)  # 자정 넘김
+
+
+def _brute(start, end, windows) -> dict:
+    """근무 [start, end) 의 분을 하나씩 세어 이름별 겹침 (같은 이름은 합집합)."""
+    out = {}
+    for w in windows:
+        out.setdefault(w.name, [])
+    for name in out:
+        ws = [w for w in windows if w.name == name]
+        out[name] = np.array([np.any([_inside(np.arange(s, e), w) for w in ws], axis=0).sum() if e > s else 0
+                              for s, e in zip(start, end)], dtype=np.int64)
+    return out
+
+
+def _random_shifts(rng, n, max_days=3):
+    start = BASE + rng.integers(0, 4 * MINUTES_PER_DAY, n)
+    return start, start + rng.integers(0, max_days * MINUTES_PER_DAY, n)
+
+
+def test_shift_minutes_midnight_wrap():
+    s, e = shift_minutes([22, 9, 23, 0], [0, 0, 30, 0], [6, 18, 23, 0], [0, 0, 30, 0])
+    assert (e - s).tolist() == [480, 540, MINUTES_PER_DAY, MINUTES_PER_DAY]  # 퇴근 ≤ 출근 → 다음 날
+    assert night_minutes(s, e).tolist() == [480, 0, 480, 480]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_night_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    start, end = _random_shifts(rng, 300)
+    expected = _brute(start, end, [NIGHT])["night"]
+    assert night_minutes(start, end).tolist() == expected.tolist()
+    assert [night_minutes_scalar(int(s), int(e)) for s, e in zip(start, end)] == expected.tolist()
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_overlap_matches_brute_force(seed):
+    windows = [
+        NIGHT,
+        daily_window("05:00", "09:00", "early"),
+        daily_window("08:30", "10:00", "early"),           # 같은 이름 겹침 → 합집합
+        daily_window("20:00", "24:00", "late"),
+        daily_window("23:30", "01:15", "late"),            # 자정 넘김이 다른 조각과 겹침
+        *holiday_windows(["2024-08-15", "2024-08-16"]),    # 이어진 공휴일 이틀
+        absolute_window("2024-08-14T18:00", "2024-08-15T03:00", "event"),
+        absolute_window("2024-08-15T01:00", "2024-08-15T05:30", "event"),
+    ]
+    rng = np.random.default_rng(seed)
+    start, end = _random_shifts(rng, 300)
+    got = overlap_minutes(start, end, windows)
+    expected = _brute(start, end, windows)
+    assert got.keys() == expected.keys()
+    for name in expected:
+        assert got[name].tolist() == expected[name].tolist(), name
+
+
+def test_absolute_window_edges():
+    ws = [AbsoluteWindow("holiday", BASE + 100, BASE + 200)]
+    start = np.array([BASE, BASE + 100, BASE + 150, BASE + 200, BASE + 250, BASE + 120])
+    end = np.array([BASE + 100, BASE + 200, BASE + 400, BASE + 300, BASE + 240, BASE + 110])  # 마지막: 끝 < 시작
+    assert overlap_minutes(start, end, ws)["holiday"].tolist() == [0, 100, 50, 0, 0, 0]
+
+
+def test_mixed_kinds_rejected():
+    with pytest.raises(ValueError):
+        overlap_minutes([0], [60], [DailyWindow("x", 0, 60), AbsoluteWindow("x", 0, 60)])
@@ -0,0 +1,237 @@
+"""
+타임시트(실제 출퇴근 기록) 기반 월급 계산
+
+    python -m timesheet punches.csv --roster employees.csv --output pay.csv [--records records.csv]
+
+- 근무 패턴 하나를 days_wk × WEEKS_PER_MONTH 로 늘리는 대신, 출퇴근 기록(행 = 근무 1회)을 그대로 집계
+    punches: employee_id, punch_in, punch_out (날짜+시각) + 선택 break_min(분)
+    분할 근무(하루 여러 행), 자정·여러 날 넘김 근무 모두 행 단위로 처리
+- 기록별: 실근로(체류 - 휴게), 야간(22~06 겹침, windows.py), 주 상한(출근 월 규칙) 기본/연장 배분
+  windows 를 주면 추가 시간대(휴일·사용자 지정)별 겹침도 <이름>_h 컬럼으로
+- 주 단위: ISO 주(월~일), 출근 시각이 속한 주에 포함. 주 안에서 출근 순서대로 주 상한까지 기본, 이후 연장
+- 주휴: 주마다 (주 기본근로 ÷ 5), 기간 합계 월 상한 (monthly_hours 와 같은 규칙)
+- 계산 규칙(rules.py): 기록은 출근 월의 규칙(주 상한), 직원은 마지막 기록의 월(pay_month)의 규칙(주휴 상한, 가산계수)
+- 금액: 직원별 월 시간 → 규칙별 batch.calc_pay_arr (월급 계산과 같은 연산)
+- 전 과정 배열 연산 (직원·주 그룹은 정렬 + 누적합)
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from batch import (
+    FLAG_COLUMNS, RESULT_COLUMNS, ROSTER_DEFAULTS,
+    _flag, by_rules, calc_pay_arr, ceil_if_arr, load_roster,
+)
+from rules import RULES, RuleSet, RuleTable
+from windows import MINUTES_PER_DAY, holiday_windows, night_minutes, overlap_minutes
+
+PUNCH_COLUMNS = ("employee_id", "punch_in", "punch_out")
+PAY_SETTINGS = ("gwage", "meal", "car", *FLAG_COLUMNS)
+
+
+# ---------------------------
+# 배열 유틸
+# ---------------------------
+def _minutes(col: pd.Series) -> np.ndarray:
+    """날짜+시각 컬럼 → 1970-01-01 00:00 기준 분(int64). 비어 있거나 해석 불가면 ValueError."""
+    ts = pd.to_datetime(col, errors="coerce")
+    bad = ts.isna().to_numpy()
+    if bad.any():
+        raise ValueError(f"출퇴근 시각을 해석할 수 없는 행이 있습니다: {col.index[bad].tolist()[:10]}")
+    return ts.to_numpy().astype("datetime64[m]").astype(np.int64)
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """정렬된 키 배열 → 각 행이 속한 그룹의 첫 행 위치."""
+    new = np.ones(len(keys), dtype=bool)
+    new[1:] = keys[1:] != keys[:-1]
+    return np.maximum.accumulate(np.where(new, np.arange(len(keys)), 0))
+
+def _month_labels(t: np.ndarray) -> np.ndarray:
+    """기준점 기준 분 → "YYYY-MM" (귀속 월)."""
+    return t.astype("datetime64[m]").astype("datetime64[M]").astype(str)
+
+def _rule_values(table: RuleTable, months, field: str) -> np.ndarray:
+    """귀속 월 배열 → 행별 규칙 값 (RuleSet 필드)."""
+    return np.array([getattr(r, field) for r in table.rules], dtype=float)[table.index_of(months)]
+
+
+# ---------------------------
+# 기록 단위 계산
+# ---------------------------
+def load_punches(src) -> pd.DataFrame:
+    """출퇴근 기록 로드 (DataFrame / .csv / .parquet) + 필수 컬럼 확인."""
+    df = load_roster(src)
+    missing = [c for c in PUNCH_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"출퇴근 기록에 필수 컬럼이 없습니다: {missing}")
+    return df
+
+def punch_hours(punches, windows=(), rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [기록별 시간]
+    - 반환: 입력 컬럼 + pay_month(출근 월 "YYYY-MM") + iso_week("YYYY-Www")
+      + work_h / base_h / ot_h / night_h (+ 추가 시간대 <이름>_h)
+    - 주 상한은 기록의 출근 월 규칙 (rules: 규칙표, 없으면 rules.RULES)
+    - 행 순서는 입력 그대로 (주 상한 배분만 직원·출근 시각 순으로)
+    """
+    table = rules if rules is not None else RULES
+    df = load_punches(punches)
+    t_in = _minutes(df["punch_in"])
+    t_out = _minutes(df["punch_out"])
+    bad = t_out <= t_in
+    if bad.any():
+        raise ValueError(f"퇴근 시각이 출근 시각보다 빠르거나 같은 행이 있습니다: {df.index[bad].tolist()[:10]}")
+    brk = df["break_min"].fillna(0).to_numpy(float) if "break_min" in df.columns else np.zeros(len(df))
+    work = np.maximum(0.0, (t_out - t_in) - brk)
+    night = night_minutes(t_in, t_out)
+    months = _month_labels(t_in)
+    cap = _rule_values(table, months, "max_weekly_hours") * 60
+
+    # ISO 주: 1970-01-01(목) 기준 → 월요일 시작 주 번호
+    week = (t_in // MINUTES_PER_DAY + 3) // 7
+    emp_codes, _ = pd.factorize(df["employee_id"])
+    order = np.lexsort((t_in, week, emp_codes))
+    w_sorted = work[order]
+    keys = emp_codes[order].astype(np.int64) * (1 << 32) + week[order]
+    cum = np.cumsum(w_sorted)
+    starts = _group_starts(keys)
+    before = cum - w_sorted - (cum[starts] - w_sorted[starts])  # 같은 주 앞선 기록의 실근로 합
+    base = np.empty(len(df))
+    base[order] = np.clip(cap[order] - before, 0.0, w_sorted)
+
+    week_codes, weeks = pd.factorize(week)
+    iso = pd.DatetimeIndex((weeks * 7 - 3).astype("datetime64[D]")).isocalendar()  # 주의 월요일
+    labels = (iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)).to_numpy()
+    out = df.copy()
+    out["pay_month"] = months
+    out["iso_week"] = labels[week_codes]
+    out["work_h"] = work / 60
+    out["base_h"] = base / 60
+    out["ot_h"] = (work - base) / 60
+    out["night_h"] = night / 60
+    for name, m in overlap_minutes(t_in, t_out, windows).items():
+        out[f"{name}_h"] = m / 60
+    return out
+
+
+# ---------------------------
+# 직원 단위 집계 / 급여
+# ---------------------------
+def timesheet_hours(punches, windows=(), rules: RuleTable | None = None) -> pd.DataFrame:
+    """
+    [직원별 기간 시간]
+    - 반환: employee_id, pay_month, weeks, records, monthly_base, monthly_holiday, monthly_ot, monthly_night
+      (시간, 올림 전) + 추가 시간대 합계 <이름>_h
+    - pay_month: 직원의 마지막 기록 출근 월 → 그 달 규칙
+    - monthly_holiday = Σ주 (주 기본근로 ÷ 5), pay_month 규칙의 월 주휴 상한
+    """
+    table = rules if rules is not None else RULES
+    rec = punch_hours(punches, windows, table)
+    emp_codes, emp_ids = pd.factorize(rec["employee_id"])
+    n = len(emp_ids)
+    month_codes, month_uniq = pd.factorize(rec["pay_month"], sort=True)
+    last = np.full(n, -1, dtype=np.int64)
+    np.maximum.at(last, emp_codes, month_codes)
+    pay_month = month_uniq.to_numpy()[last] if n else np.array([], dtype=object)
+    holiday_cap = _rule_values(table, pay_month, "max_monthly_holiday") if n else np.zeros(0)
+    week_codes, _ = pd.MultiIndex.from_arrays([emp_codes, rec["iso_week"].to_numpy()]).factorize()
+    week_emp = np.zeros(week_codes.max() + 1 if len(week_codes) else 0, dtype=np.int64)
+    week_emp[week_codes] = emp_codes
+    week_base = np.bincount(week_codes, rec["base_h"].to_numpy(), minlength=len(week_emp))
+
+    extra = {f"{w.name}_h" for w in windows}
+    return pd.DataFrame({
+        "employee_id": emp_ids,
+        "pay_month": pay_month,
+        "weeks": np.bincount(week_emp, minlength=n),
+        "records": np.bincount(emp_codes, minlength=n),
+        "monthly_base": np.bincount(emp_codes, rec["base_h"].to_numpy(), minlength=n),
+        "monthly_holiday": np.minimum(np.bincount(week_emp, week_base / 5.0, minlength=n), holiday_cap),
+        "monthly_ot": np.bincount(emp_codes, rec["ot_h"].to_numpy(), minlength=n),
+        "monthly_night": np.bincount(emp_codes, rec["night_h"].to_numpy(), minlength=n),
+        **{c: np.bincount(emp_codes, rec[c].to_numpy(), minlength=n) for c in sorted(extra)},
+    })
+
+def _pay_group(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    """같은 규칙(pay_month)의 직원 묶음 → 월 시간 올림 + 급여 항목 컬럼."""
+    ceil_on = _flag(df["ceil_on"])
+    h = [ceil_if_arr(df[c].to_numpy(float), ceil_on) for c in RESULT_COLUMNS[:4]]
+    bad = (h[0] + h[1]) <= 0
+    if bad.any():
+        raise ValueError(f"분모 시간(기본근로+주휴)이 0인 직원이 있습니다: {df.loc[bad, 'employee_id'].tolist()[:10]}")
+    pay = calc_pay_arr(
+        df["gwage"].to_numpy(np.int64), *h,
+        meal=df["meal"].to_numpy(np.int64), car=df["car"].to_numpy(np.int64),
+        **{c: _flag(df[c]) for c in FLAG_COLUMNS if c != "ceil_on"}, rules=rules,
+    )
+    df = df.copy()
+    for c, v in zip(RESULT_COLUMNS[:4], h):
+        df[c] = v
+    for c, v in pay.items():
+        df[c] = v
+    return df
+
+def calc_timesheet(punches, roster=None, windows=(), rules: RuleTable | None = None, **defaults) -> pd.DataFrame:
+    """
+    [타임시트 월급 계산]
+    - roster: employee_id + 급여 설정(gwage, meal, car, is_5p, ceil_on, opt_*). 없으면 전 직원 defaults 로
+      (pay_month 는 기록에서 정하므로 roster 의 pay_month 컬럼은 쓰지 않음)
+    - defaults: roster 에 없는 설정 컬럼의 값 (예: gwage=10_030, meal=100_000), 나머지는 ROSTER_DEFAULTS
+    - 기록은 있는데 roster 에 없는 직원은 ValueError
+    - windows: 추가 시간대 (시간 합계 <이름>_h 만 보고, 금액 계산에는 쓰지 않음)
+    - rules: 규칙표 (없으면 rules.RULES). 직원은 pay_month 규칙으로 계산
+    - 반환: employee_id + 급여 설정 + pay_month, weeks, records (+ <이름>_h) + RESULT_COLUMNS
+      (월 시간은 ceil_on 이면 올림)
+    """
+    hours = timesheet_hours(punches, windows, rules)
+    if roster is None:
+        emp = pd.DataFrame({"employee_id": hours["employee_id"]})
+    else:
+        emp = load_roster(roster).drop(columns="pay_month", errors="ignore")
+        if "employee_id" not in emp.columns:
+            raise ValueError("직원 설정에 필수 컬럼이 없습니다: ['employee_id']")
+    fill = {**ROSTER_DEFAULTS, **defaults}
+    for c in PAY_SETTINGS:
+        if c not in emp.columns and c in fill:
+            emp[c] = fill[c]
+    if "gwage" not in emp.columns:
+        raise ValueError("기준시급(gwage)이 없습니다. 직원 설정에 gwage 컬럼을 넣거나 gwage 를 지정하세요.")
+    emp = emp.drop_duplicates("employee_id", keep="last")
+    df = hours.merge(emp, on="employee_id", how="left", validate="one_to_one")
+    unknown = df["gwage"].isna().to_numpy()
+    if unknown.any():
+        raise ValueError(f"직원 설정에 없는 직원의 기록이 있습니다: {df.loc[unknown, 'employee_id'].tolist()[:10]}")
+
+    df = by_rules(df, _pay_group, rules)
+    settings = [c for c in emp.columns if c != "employee_id"]
+    extra = sorted({f"{w.name}_h" for w in windows})
+    return df[["employee_id", *settings, "pay_month", "weeks", "records", *extra, *RESULT_COLUMNS]]
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m timesheet", description="출퇴근 기록 기반 월급 계산")
+    parser.add_argument("punches", help="출퇴근 기록 CSV / Parquet (employee_id, punch_in, punch_out[, break_min])")
+    parser.add_argument("--roster", help="직원 설정 CSV / Parquet (employee_id, gwage, ...)")
+    parser.add_argument("--gwage", type=int, help="roster 가 없을 때 전 직원 기준시급")
+    parser.add_argument("--holidays", nargs="*", default=[], help="휴일 날짜 (YYYY-MM-DD), 휴일 근로시간 holiday_h 집계")
+    parser.add_argument("--output", help="직원별 결과 CSV")
+    parser.add_argument("--records", help="기록별 시간 CSV")
+    args = parser.parse_args(argv)
+
+    defaults = {"gwage": args.gwage} if args.gwage is not None else {}
+    windows = holiday_windows(args.holidays)
+    out = calc_timesheet(args.punches, args.roster, windows, **defaults)
+    if args.output:
+        out.to_csv(args.output, index=False)
+    if args.records:
+        punch_hours(args.punches, windows).to_csv(args.records, index=False)
+    print(json.dumps({"employees": len(out), "records": int(out["records"].sum()),
+                      "total": int(out["total"].sum())}))
+
+if __name__ == "__main__":
+    main()
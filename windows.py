@@ -0,0 +1,220 @@
+"""
+가산 시간대 겹침 계산 (야간 · 휴일 · 사용자 지정 시간대)
+
+    ws = [NIGHT, daily_window("05:00", "09:00", "early"), *holiday_windows(["2024-08-15"])]
+    overlap_minutes(start, end, ws)  # → {"night": 분 배열, "early": ..., "holiday": ...}
+
+- 근무 구간 [start, end) 와 시간대의 겹침(분)을 근무 여러 건에 대해 배열 연산으로 계산
+- 시간 단위: 분(정수). 기준점 1970-01-01 00:00 (하루 경계 = 1440 의 배수)
+  시각만 있는 근무(출근 HH:MM, 퇴근 HH:MM)는 0일 기준 분 (퇴근 ≤ 출근이면 +1440)
+- 시간대 종류
+    DailyWindow    매일 반복 [start, end) 분. end ≤ start 면 자정 넘김 (야간 22:00~06:00)
+    AbsoluteWindow 특정 일시 [start, end) 분 (공휴일 하루, 행사 기간 등)
+- 이름이 같은 시간대는 합집합으로 합쳐 한 번만 셈 (매일 반복 / 절대 구간은 섞을 수 없음)
+- 누적 함수 F(t) = 기준점 ~ t 사이 시간대 분 수 → 겹침 = F(end) - F(start)
+  출근이 06:00 이전이든, 근무가 24시간을 넘든 구간을 나누지 않고 한 번에 (시간대 k 개에 O(log k))
+- numpy 는 배열 함수 안에서만 import (스칼라 경로 payroll / cli 의 시작 시간 단축)
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MINUTES_PER_DAY = 1440
+EPOCH = datetime(1970, 1, 1)
+
+
+class DailyWindow(NamedTuple):
+    """매일 반복 시간대. start / end: 자정 기준 분 (0~1440), end ≤ start 면 다음 날 end 까지."""
+    name: str
+    start: int
+    end: int
+
+class AbsoluteWindow(NamedTuple):
+    """특정 일시 시간대. start / end: 기준점(1970-01-01 00:00) 기준 분."""
+    name: str
+    start: int
+    end: int
+
+
+NIGHT = DailyWindow("night", 22 * 60, 6 * 60)  # 야간근로 22:00 ~ 06:00
+
+
+# =========================
+# 🔧 시간대 만들기
+# =========================
+def _clock_minutes(v) -> int:
+    """datetime.time / "HH:MM" / 분(int) → 자정 기준 분."""
+    if isinstance(v, time):
+        return v.hour * 60 + v.minute
+    if isinstance(v, str):
+        h, m = v.split(":")[:2]
+        return int(h) * 60 + int(m)
+    return int(v)
+
+def epoch_minutes(v) -> int:
+    """datetime / date / ISO 문자열 → 기준점 기준 분."""
+    if isinstance(v, str):
+        v = datetime.fromisoformat(v)
+    if not isinstance(v, datetime):
+        v = datetime(v.year, v.month, v.day)
+    d = v.replace(tzinfo=None) - EPOCH
+    return d.days * MINUTES_PER_DAY + d.seconds // 60
+
+def daily_window(start, end, name: str = "night") -> DailyWindow:
+    """매일 반복 시간대 (start / end: "HH:MM", time, 분)."""
+    s, e = _clock_minutes(start), _clock_minutes(end)
+    if not (0 <= s < MINUTES_PER_DAY and 0 <= e <= MINUTES_PER_DAY) or s == e:
+        raise ValueError(f"시간대가 올바르지 않습니다: {start} ~ {end} (00:00~24:00, 시작 ≠ 끝)")
+    return DailyWindow(name, s, e)
+
+def absolute_window(start, end, name: str = "holiday") -> AbsoluteWindow:
+    """특정 일시 시간대 (start / end: datetime, date, ISO 문자열)."""
+    s, e = epoch_minutes(start), epoch_minutes(end)
+    if e <= s:
+        raise ValueError(f"시간대 끝이 시작보다 빠르거나 같습니다: {start} ~ {end}")
+    return AbsoluteWindow(name, s, e)
+
+def holiday_windows(days, name: str = "holiday") -> list[AbsoluteWindow]:
+    """날짜 목록 → 하루(00:00 ~ 다음 날 00:00) 단위 시간대 목록."""
+    out = []
+    for d in days:
+        s = epoch_minutes(date.fromisoformat(d) if isinstance(d, str) else d)
+        out.append(AbsoluteWindow(name, s, s + MINUTES_PER_DAY))
+    return out
+
+
+# =========================
+# 🧮 누적 함수
+# =========================
+def _merge(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """[lo, hi) 구간 목록 → 정렬된 서로소 구간 목록 (합집합)."""
+    out = []
+    for lo, hi in sorted(intervals):
+        if out and lo <= out[-1][1]:
+            out[-1] = (out[-1][0], max(out[-1][1], hi))
+        else:
+            out.append((lo, hi))
+    return out
+
+class WindowSet:
+    """
+    [이름 하나의 시간대 묶음]
+    - 매일 반복: 하루 안의 서로소 구간(자정 넘김은 두 조각) + 하루 합계 → F(t) = 일수 × 하루 합계 + 오늘 누적
+    - 절대 구간: 서로소 구간 + 앞 구간들의 누적 길이 → F(t) = prefix[i] + min(t, hi[i]) - lo[i]
+    - 스칼라 조회는 리스트 + bisect, 배열 조회용 numpy 배열은 처음 쓸 때 만듦
+    """
+
+    def __init__(self, name: str, daily: bool, intervals: list[tuple[int, int]]):
+        merged = _merge(intervals)
+        self.name = name
+        self.daily = daily
+        self._lo = [a for a, _ in merged]
+        self._hi = [b for _, b in merged]
+        self._prefix, total = [], 0
+        for a, b in merged:
+            self._prefix.append(total)
+            total += b - a
+        self.per_day = total if daily else 0
+        self._arrays = None
+
+    def _np(self):
+        """(lo, hi, prefix) int64 배열 (지연 생성)."""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = tuple(np.array(v, dtype=np.int64) for v in (self._lo, self._hi, self._prefix))
+        return self._arrays
+
+    def _within(self, t: np.ndarray) -> np.ndarray:
+        import numpy as np
+        lo, hi, prefix = self._np()
+        i = np.searchsorted(lo, t, side="right") - 1
+        j = np.maximum(i, 0)
+        return np.where(i >= 0, prefix[j] + np.minimum(t, hi[j]) - lo[j], 0) if len(lo) else np.zeros_like(t)
+
+    def cumulative(self, t: np.ndarray) -> np.ndarray:
+        """기준점 ~ t (분, int64 배열) 사이 시간대 분 수."""
+        if self.daily:
+            day, m = divmod(t, MINUTES_PER_DAY)
+            return day * self.per_day + self._within(m)
+        return self._within(t)
+
+    def cumulative_scalar(self, t: int) -> int:
+        """cumulative 스칼라판 (numpy 없이 bisect)."""
+        day = 0
+        if self.daily:
+            day, t = divmod(t, MINUTES_PER_DAY)
+        i = bisect_right(self._lo, t) - 1
+        within = self._prefix[i] + min(t, self._hi[i]) - self._lo[i] if i >= 0 else 0
+        return day * self.per_day + within
+
+    def overlap(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """근무 [start, end) 별 겹침(분). end ≤ start 인 행은 0."""
+        import numpy as np
+        return np.maximum(0, self.cumulative(end) - self.cumulative(start))
+
+    def overlap_scalar(self, start: int, end: int) -> int:
+        return max(0, self.cumulative_scalar(end) - self.cumulative_scalar(start))
+
+@lru_cache(maxsize=256)
+def _compile(windows: tuple) -> dict:
+    groups: dict[str, list] = {}
+    for w in windows:
+        groups.setdefault(w.name, []).append(w)
+    out = {}
+    for name, ws in groups.items():
+        kinds = {type(w) for w in ws}
+        if len(kinds) > 1:
+            raise ValueError(f"같은 이름의 시간대에 매일 반복과 절대 구간을 섞을 수 없습니다: {name}")
+        if DailyWindow in kinds:
+            pieces = []
+            for w in ws:
+                if w.end > w.start:
+                    pieces.append((w.start, w.end))
+                else:  # 자정 넘김 → [start, 24:00) + [00:00, end)
+                    pieces += [(w.start, MINUTES_PER_DAY), (0, w.end)]
+            out[name] = WindowSet(name, True, [p for p in pieces if p[1] > p[0]])
+        else:
+            out[name] = WindowSet(name, False, [(w.start, w.end) for w in ws])
+    return out
+
+def compile_windows(windows) -> dict[str, WindowSet]:
+    """시간대 목록 → {이름: WindowSet} (같은 목록은 캐시)."""
+    return _compile(tuple(windows))
+
+
+# =========================
+# 📐 겹침 계산
+# =========================
+def overlap_minutes(start, end, windows) -> dict[str, np.ndarray]:
+    """
+    [근무 구간 × 시간대 겹침]
+    - start / end: 분(int64) 배열 (기준점 기준, 또는 시각만 있으면 0일 기준)
+    - 반환: {시간대 이름: 행별 겹침 분}
+    """
+    import numpy as np
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    return {name: ws.overlap(start, end) for name, ws in compile_windows(windows).items()}
+
+def shift_minutes(sh, sm, eh, em) -> tuple[np.ndarray, np.ndarray]:
+    """시각만 있는 근무 (출근 시/분, 퇴근 시/분) → 0일 기준 [start, end) 분. 퇴근 ≤ 출근이면 다음 날."""
+    import numpy as np
+    s = np.asarray(sh, dtype=np.int64) * 60 + np.asarray(sm, dtype=np.int64)
+    e = np.asarray(eh, dtype=np.int64) * 60 + np.asarray(em, dtype=np.int64)
+    return s, np.where(e <= s, e + MINUTES_PER_DAY, e)
+
+def night_minutes(start, end) -> np.ndarray:
+    """야간(22~06) 겹침 분 (배열)."""
+    import numpy as np
+    return compile_windows((NIGHT,))["night"].overlap(np.asarray(start, dtype=np.int64),
+                                                      np.asarray(end, dtype=np.int64))
+
+def night_minutes_scalar(start: int, end: int) -> int:
+    """야간(22~06) 겹침 분 (스칼라)."""
+    return compile_windows((NIGHT,))["night"].overlap_scalar(start, end)